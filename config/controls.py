@@ -1,16 +1,107 @@
+import json
+import os
 import pygame
 
+# Default key bindings: action name -> key names
+DEFAULT_BINDINGS = {
+    "force_left": ["left"],
+    "force_right": ["right"],
+    "force_forward": ["up"],
+    "force_backward": ["down"],
+    "rotate_left": ["q"],
+    "rotate_right": ["e"],
+    "restart": ["r"],
+    "quit": ["escape"],
+    "save": ["f5"],
+    "load": ["f9"],
+    "zoom_in": ["equals", "kp_plus"],
+    "zoom_out": ["minus", "kp_minus"],
+}
+
+
+def key_code(name):
+    """Return the pygame key code for a key name such as "left" or "q" """
+    return getattr(pygame, "K_" + name, None) or getattr(pygame, "K_" + name.upper(), None)
+
+
 class Controls:
     """Control mappings for the game"""
     
-    def __init__(self):
+    def __init__(self, config_file=None, reload_interval=500):
         """Initialize the default control mappings"""
-        self.STEER_LEFT = pygame.K_LEFT
-        self.STEER_RIGHT = pygame.K_RIGHT
-        self.PAUSE = pygame.K_p
-        self.RESTART = pygame.K_r
+        self.config_file = config_file
+        self.reload_interval = reload_interval  # ms between checks of the bindings file
+        self.bindings = {action: list(keys) for action, keys in DEFAULT_BINDINGS.items()}
+        self.actions = {}  # key code -> action name
+        self._listeners = []
+        self._mtime = None
+        self._last_check = 0
         
+        if config_file:
+            self.load_custom_controls(config_file)
+        else:
+            self._rebuild()
+    
     def load_custom_controls(self, config_file=None):
-        """Load custom control mappings from a file"""
-        # This could be implemented to load custom key bindings
-        pass
+        """Load custom control mappings from a JSON file (action -> key names)"""
+        config_file = config_file or self.config_file
+        bindings = {action: list(keys) for action, keys in DEFAULT_BINDINGS.items()}
+        try:
+            self._mtime = os.path.getmtime(config_file)
+            with open(config_file) as f:
+                custom = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Debug: Could not load controls from {config_file}: {e}. Using defaults.")
+            custom = {}
+        
+        for action, keys in custom.items():
+            if action not in DEFAULT_BINDINGS:
+                print(f"Debug: Unknown control action '{action}' ignored")
+                continue
+            bindings[action] = [keys] if isinstance(keys, str) else list(keys)
+        
+        self.bindings = bindings
+        self._rebuild()
+    
+    def _rebuild(self):
+        """Precompute the key code -> action table and notify listeners"""
+        actions = {}
+        for action, keys in self.bindings.items():
+            for name in keys:
+                code = key_code(name)
+                if code is None:
+                    print(f"Debug: Unknown key '{name}' for action '{action}' ignored")
+                    continue
+                if code in actions:
+                    print(f"Debug: Key '{name}' rebound from '{actions[code]}' to '{action}'")
+                actions[code] = action
+        self.actions = actions
+        for listener in self._listeners:
+            listener(self)
+    
+    def keys_for(self, action):
+        """Return the key codes bound to an action"""
+        return [code for code, bound in self.actions.items() if bound == action]
+    
+    def build_dispatch(self, handlers):
+        """Map key codes straight to handlers given as {action name: callable}"""
+        return {code: handlers[action] for code, action in self.actions.items() if action in handlers}
+    
+    def add_listener(self, callback):
+        """Call callback(controls) whenever the bindings change"""
+        self._listeners.append(callback)
+    
+    def poll_reload(self, now):
+        """Reload the bindings file if it changed (checked at most every reload_interval ms)"""
+        if not self.config_file or now - self._last_check < self.reload_interval:
+            return False
+        self._last_check = now
+        try:
+            mtime = os.path.getmtime(self.config_file)
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        print(f"Debug: Reloading controls from {self.config_file}")
+        self.load_custom_controls()
+        return True
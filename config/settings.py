@@ -1,5 +1,14 @@
-class Settings:
-    """Game settings and configuration parameters"""
+import json
+import os
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    tomllib = None
+
+
+class _Defaults:
+    """Default value of every setting; profiles may only override these names"""
     
     def __init__(self):
         # Screen settings
@@ -8,6 +17,62 @@ class Settings:
         self.SCREEN_TITLE = "Island Navigator"
         self.FPS = 60
         
+        # Render settings
+        self.RENDER_SCALE = 1.0  # Background and features are drawn at this fraction of the window size
+        self.RENDER_SMOOTH = True  # Smooth upscaling (False uses the cheaper nearest-neighbour scale)
+        self.DYNAMIC_RESOLUTION = False  # Lower the render scale automatically when frames run long
+        self.RENDER_SCALE_MIN = 0.5
+        self.RENDER_SCALE_STEP = 0.125
+        self.FRAME_BUDGET_MS = 14.0  # Work time per frame the adaptive controls aim to stay under
+        
+        # Camera settings
+        self.ZOOM_LEVELS = (0.25, 0.35, 0.5, 0.7, 1.0)  # Zoom keys step through these
+        self.ZOOM_START = 1.0
+        self.LOD_FULL_SCALE = 0.75  # Full feature detail at or above this draw scale (render scale x zoom)
+        self.LOD_IMPOSTOR_SCALE = 0.4  # Below this, features come from one pre-rendered world image
+        self.CAMERA_SMOOTHING = 0.0  # Share of the distance to the boat kept per 60 FPS frame (0 = locked on)
+        self.CAMERA_SNAP_DISTANCE = 400  # Jumps further than this are not smoothed
+        self.CAMERA_SHAKE_MAGNITUDE = 12  # Pixels, on returning to the checkpoint
+        self.CAMERA_SHAKE_DURATION = 400  # ms
+        
+        # Quality governor (turns effects down while frames run long)
+        self.QUALITY_GOVERNOR = True
+        self.QUALITY_DEGRADE_MS = 14.0  # Average frame time above which the next effect is turned down
+        self.QUALITY_RESTORE_MS = 9.0  # Average frame time below which the last one is restored
+        self.QUALITY_SAMPLE_FRAMES = 30  # Frames averaged per decision
+        self.QUALITY_DEGRADE_ORDER = ("wake_particles", "island_glow", "arrow_glow",
+                                      "minimap_refresh", "text_antialias")
+        self.QUALITY_LOW_WAKE_PARTICLES = 6
+        self.QUALITY_LOW_MINIMAP_INTERVAL = 10  # Frames between minimap redraws when degraded
+        
+        # Simulation and input settings
+        self.MAX_TICKS_PER_FRAME = 5  # Catch-up limit when a frame runs long
+        self.MAX_EVENTS_PER_TICK = 16  # Input bursts beyond this spill into later ticks
+        self.KERNEL_BACKEND = "auto"  # Batched math: "numba", "numpy", "python" or "auto" (fastest installed)
+        self.INPUT_RECORD_FILE = None  # Record applied input here for replays
+        self.WORLD_SEED = None  # Fixed world seed (None picks a random one)
+        self.KEYBINDINGS_FILE = "config/keybindings.json"  # Edited bindings are picked up while running
+        self.CONTROLS_RELOAD_INTERVAL = 500  # ms between checks of the bindings file
+        self.SETTINGS_RELOAD_INTERVAL = 1000  # ms between checks of the profile file
+        
+        # Metrics (off unless a file or port is set)
+        self.METRICS_FILE = None  # Append a JSON line of runtime metrics here every flush interval
+        self.METRICS_FLUSH_INTERVAL = 10000  # ms
+        self.METRICS_HTTP_PORT = None  # Serve /metrics in Prometheus text format on this port
+        self.METRICS_HTTP_HOST = "127.0.0.1"
+        
+        # Error accounting (0 disables a threshold)
+        self.ERROR_SAFE_MODE_AFTER = 100  # Repeats of one drawing error before falling back to minimal rendering
+        self.ERROR_ABORT_AFTER = 0  # Repeats of any one error before the game exits
+        self.ERROR_REPORT_FILE = None  # Write every distinct error with its first traceback here on exit
+        
+        # Memory profiling (tracemalloc slows allocation; leave off in normal play)
+        self.MEMORY_PROFILE = False
+        self.MEMORY_PROFILE_FILE = "memory_profile.jsonl"
+        self.MEMORY_PROFILE_INTERVAL = 50  # Restarts between reports
+        self.MEMORY_PROFILE_TOP = 10  # Allocation sites and types listed per report
+        self.MEMORY_LEAK_THRESHOLD_KB = 256  # Traced growth per interval that counts towards a leak
+        
         # Color definitions
         self.BLUE = (0, 121, 255)
         self.DARK_BLUE = (0, 0, 139)
@@ -28,6 +93,7 @@ class Settings:
         self.BOAT_BOOST_MULTIPLIER = 1.5
         self.BOAT_WAKE_LIFETIME = 1.0
         self.BOAT_WAKE_SIZE = 5
+        self.FIXED_POINT_PHYSICS = False  # Integer boat physics, bit-identical on every machine (lockstep, replays)
         
         # Current settings
         self.CURRENT_MAGNITUDE = 0.7
@@ -66,8 +132,8 @@ class Settings:
         self.MINIMAP_ISLAND_COLOR = self.GREEN
         self.MINIMAP_SCALE = 0.1  # Scale factor for minimap (world to minimap coordinates)
         
-        # Initialize empty features list
-        self.SEA_FEATURES = []
+        # Number of worlds the background generator keeps ready
+        self.WORLD_QUEUE_SIZE = 2
         
         # Wave/current settings
         self.MIN_WAVE_MAGNITUDE = 0.3
@@ -109,10 +175,328 @@ class Settings:
         self.BACKGROUND_TEXTURE = self.TEXTURE_FOLDER + "water.png"
         self.ARROW_TEXTURE = self.TEXTURE_FOLDER + "arrow.png"
         
+        # Restart settings
+        self.RESTART_KEEP_WORLD_ON_FAIL = True  # R after a failure returns to the checkpoint
+        
+        # Snapshot settings
+        self.SNAPSHOT_FILE = "saves/world.snap"  # F5 saves, F9 loads
+        
+        # Ghost settings (race against earlier successful runs of the same world)
+        self.GHOST_DIRECTORY = "saves/ghosts"
+        self.GHOST_RECORD = True  # Save the trajectory of every successful dock
+        self.GHOST_COUNT = 3  # Fastest earlier runs raced against (0 shows none)
+        self.GHOST_KEEP = 5  # Runs kept per world
+        self.GHOST_MAX_FILES = 200  # Runs kept in total; the oldest go first
+        self.GHOST_ALPHA = 110
+        self.GHOST_COLOR = (170, 210, 255)  # Tint of the ghost boats
+        self.GHOST_ROTATION_STEPS = 72  # Pre-rotated sprite angles (5 degrees apart)
+        self.GHOST_CHUNK_TICKS = 256  # Ticks per keyframed chunk on disk
+        
+        # Leaderboard settings
+        self.LEADERBOARD_FILE = "saves/leaderboard.db"  # SQLite database of finished runs
+        self.LEADERBOARD_TOP = 5  # Best runs listed on the win screen (0 hides the list)
+        
+        # Session traces (off unless a directory is set; analyzed with python -m game.analytics)
+        self.TRACE_DIRECTORY = None  # Write a trace of every run's positions, input and outcome here
+        
+        # Network settings
+        self.NET_SERVER_ADDRESS = None  # "host:port" to join a server, None for single player
+        self.NET_PORT = 5555
+        self.NET_TICK_RATE = 30  # Server simulation ticks per second
+        self.NET_KEYFRAME_INTERVAL = 30  # Ticks between full state broadcasts
+        self.NET_INTERP_DELAY = 100  # Remote boats are drawn this many ms in the past
+        self.NET_MAX_CLIENTS = 512
+        self.NET_MAX_BUFFER = 256 * 1024  # Unsent bytes before a client is dropped
+        self.NET_MAX_INPUTS_PER_TICK = 8  # Steps a client may advance per server tick
+        self.NET_MAX_PENDING_INPUTS = 64  # Queued inputs kept per client on the server
+        self.NET_INPUT_BUFFER = 128  # Unacknowledged inputs kept for replay on the client
+        
+        # Debug settings
+        self.DEBUG_SURFACE_POOL = False  # Print surface pool allocation counters
+        
         # UI settings
         self.UI_OPACITY = 0.8
         self.COMPASS_SIZE = 90
         self.COMPASS_MARGIN = 20
         self.DISTANCE_FONT_SIZE = 30
         self.UI_FONT_SIZE = 24
-        self.INSTRUCTION_FONT_SIZE = 36
\ No newline at end of file
+        self.INSTRUCTION_FONT_SIZE = 36
+
+
+DEFAULTS = vars(_Defaults())
+
+# Settings computed from others unless a profile sets them explicitly
+_DERIVED = {
+    "WORLD_SIZE": lambda v: v["WORLD_BOUNDARY"] * 2,
+    "MINIMAP_BORDER_COLOR": lambda v: v["WHITE"],
+    "MINIMAP_TARGET_COLOR": lambda v: v["GOLD"],
+    "MINIMAP_ISLAND_COLOR": lambda v: v["GREEN"],
+    "SUCCESS_TEXT_COLOR": lambda v: v["GOLD"],
+    "WARNING_TEXT_COLOR": lambda v: v["WHITE"],
+    "NOTIFICATION_TEXT_COLOR": lambda v: v["WHITE"],
+    "BOAT_TEXTURE": lambda v: v["TEXTURE_FOLDER"] + "boat.png",
+    "WAVE_TEXTURE": lambda v: v["TEXTURE_FOLDER"] + "wave.png",
+    "ISLAND_TEXTURE": lambda v: v["TEXTURE_FOLDER"] + "island.png",
+    "BACKGROUND_TEXTURE": lambda v: v["TEXTURE_FOLDER"] + "water.png",
+    "ARROW_TEXTURE": lambda v: v["TEXTURE_FOLDER"] + "arrow.png",
+}
+
+# Settings whose default is None, with the type they take otherwise
+_OPTIONAL = {
+    "INPUT_RECORD_FILE": str,
+    "WORLD_SEED": int,
+    "NET_SERVER_ADDRESS": str,
+    "METRICS_FILE": str,
+    "ERROR_REPORT_FILE": str,
+    "METRICS_HTTP_PORT": int,
+    "TRACE_DIRECTORY": str,
+}
+
+# Inclusive (min, max) bounds; None leaves that side open
+_RANGES = {
+    "SCREEN_WIDTH": (1, None),
+    "SCREEN_HEIGHT": (1, None),
+    "FPS": (1, None),
+    "RENDER_SCALE": (0.1, 1.0),
+    "RENDER_SCALE_MIN": (0.1, 1.0),
+    "RENDER_SCALE_STEP": (0.01, 1.0),
+    "FRAME_BUDGET_MS": (1.0, None),
+    "CAMERA_SMOOTHING": (0.0, 0.99),
+    "CAMERA_SNAP_DISTANCE": (0, None),
+    "CAMERA_SHAKE_MAGNITUDE": (0, None),
+    "CAMERA_SHAKE_DURATION": (0, None),
+    "QUALITY_SAMPLE_FRAMES": (1, None),
+    "QUALITY_LOW_WAKE_PARTICLES": (0, None),
+    "QUALITY_LOW_MINIMAP_INTERVAL": (1, None),
+    "MAX_TICKS_PER_FRAME": (1, None),
+    "METRICS_FLUSH_INTERVAL": (100, None),
+    "METRICS_HTTP_PORT": (0, 65535),
+    "MEMORY_PROFILE_INTERVAL": (1, None),
+    "ERROR_SAFE_MODE_AFTER": (0, None),
+    "ERROR_ABORT_AFTER": (0, None),
+    "MEMORY_PROFILE_TOP": (1, None),
+    "MEMORY_LEAK_THRESHOLD_KB": (0, None),
+    "MAX_EVENTS_PER_TICK": (1, None),
+    "WORLD_BOUNDARY": (1, None),
+    "WORLD_QUEUE_SIZE": (1, None),
+    "WORLD_SEED": (0, 0xFFFFFFFF),  # 32 bits, like the random default and the network HELLO
+    "MINIMAP_OPACITY": (0, 255),
+    "UI_OPACITY": (0, 1),
+    "ISLAND_GLOW_INTENSITY": (0, 1),
+    "NET_TICK_RATE": (1, None),
+    "NET_KEYFRAME_INTERVAL": (1, None),
+    "GHOST_COUNT": (0, None),
+    "GHOST_KEEP": (1, None),
+    "GHOST_MAX_FILES": (1, None),
+    "GHOST_ALPHA": (0, 255),
+    "GHOST_ROTATION_STEPS": (1, 360),
+    "GHOST_CHUNK_TICKS": (2, 65535),
+    "LEADERBOARD_TOP": (0, None),
+}
+
+# (low, high) pairs where low must not exceed high
+_ORDERED = [
+    ("ISLAND_DISTANCE_MIN", "ISLAND_DISTANCE_MAX"),
+    ("TREE_MIN_SIZE", "TREE_MAX_SIZE"),
+    ("MIN_ISLANDS", "MAX_ISLANDS"),
+    ("TREES_PER_ISLAND_MIN", "TREES_PER_ISLAND_MAX"),
+    ("MIN_OTHER_BOATS", "MAX_OTHER_BOATS"),
+    ("MIN_WAVE_MAGNITUDE", "MAX_WAVE_MAGNITUDE"),
+    ("RENDER_SCALE_MIN", "RENDER_SCALE"),
+    ("QUALITY_RESTORE_MS", "QUALITY_DEGRADE_MS"),
+    ("LOD_IMPOSTOR_SCALE", "LOD_FULL_SCALE"),
+]
+
+# Read once at startup; a hot reload that changes these only applies on the next start
+RESTART_REQUIRED = (
+    "SCREEN_WIDTH", "SCREEN_HEIGHT", "SCREEN_TITLE", "BOAT_TEXTURE", "ISLAND_TEXTURE",
+    "BACKGROUND_TEXTURE", "KEYBINDINGS_FILE", "INPUT_RECORD_FILE", "WORLD_SEED",
+    "NET_SERVER_ADDRESS", "NET_INPUT_BUFFER", "METRICS_FILE", "METRICS_HTTP_PORT", "METRICS_HTTP_HOST",
+    "MEMORY_PROFILE", "MEMORY_PROFILE_FILE", "LEADERBOARD_FILE", "QUALITY_GOVERNOR", "DYNAMIC_RESOLUTION",
+    "MAX_EVENTS_PER_TICK", "WORLD_QUEUE_SIZE", "KERNEL_BACKEND",
+    # Server side (the server doesn't reload its profile)
+    "NET_PORT", "NET_TICK_RATE", "NET_KEYFRAME_INTERVAL", "NET_MAX_CLIENTS", "NET_MAX_BUFFER",
+    "NET_MAX_INPUTS_PER_TICK", "NET_MAX_PENDING_INPUTS",
+)
+
+
+class SettingsError(ValueError):
+    """A settings profile has unknown names or invalid values"""
+
+
+def _check_value(name, value):
+    """Return value converted to the setting's type, or raise SettingsError"""
+    default = DEFAULTS[name]
+    if default is None:
+        expected = _OPTIONAL[name]
+        if value is None or (isinstance(value, expected) and not isinstance(value, bool)):
+            return value
+        raise SettingsError(f"{name}: expected {expected.__name__} or null, got {value!r}")
+    if isinstance(default, bool):
+        if isinstance(value, bool):
+            return value
+    elif isinstance(default, int):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    elif isinstance(default, float):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+    elif isinstance(default, str):
+        if isinstance(value, str):
+            return value
+    elif isinstance(default, tuple) and all(isinstance(item, str) for item in default):
+        # Lists of names
+        if isinstance(value, (list, tuple)) and all(isinstance(item, str) for item in value):
+            return tuple(value)
+        raise SettingsError(f"{name}: expected a list of names, got {value!r}")
+    elif isinstance(default, tuple) and any(isinstance(item, float) for item in default):
+        # Lists of numbers
+        if (isinstance(value, (list, tuple)) and value and
+                all(isinstance(item, (int, float)) and not isinstance(item, bool) for item in value)):
+            return tuple(float(item) for item in value)
+        raise SettingsError(f"{name}: expected a list of numbers, got {value!r}")
+    elif isinstance(default, tuple):
+        # Colors: same number of channels, each 0-255
+        if (isinstance(value, (list, tuple)) and len(value) == len(default) and
+                all(isinstance(c, int) and not isinstance(c, bool) and 0 <= c <= 255 for c in value)):
+            return tuple(value)
+        raise SettingsError(f"{name}: expected {len(default)} color channels in 0-255, got {value!r}")
+    raise SettingsError(f"{name}: expected {type(default).__name__}, got {value!r}")
+
+
+class Settings:
+    """Game settings and configuration parameters
+    
+    Validated once on creation and read-only afterwards. Use replace() or
+    load_profile() to get a changed copy; the engine swaps copies in
+    between ticks.
+    """
+    
+    __slots__ = tuple(DEFAULTS) + ("PROFILE_NAME", "PROFILE_PATH", "_overrides")
+    
+    def __init__(self, overrides=None, name="default", path=None):
+        """Build validated settings from the defaults plus overrides"""
+        overrides = dict(overrides or {})
+        errors = []
+        values = dict(DEFAULTS)
+        for key, value in overrides.items():
+            if key not in DEFAULTS:
+                errors.append(f"{key}: unknown setting")
+                continue
+            try:
+                values[key] = _check_value(key, value)
+            except SettingsError as e:
+                errors.append(str(e))
+        
+        for key, derive in _DERIVED.items():
+            if key not in overrides:
+                values[key] = derive(values)
+        
+        for key, (low, high) in _RANGES.items():
+            value = values[key]
+            if value is None:
+                continue  # Unset optional setting
+            if (low is not None and value < low) or (high is not None and value > high):
+                errors.append(f"{key}: {value!r} is outside [{low}, {high}]")
+        for low_key, high_key in _ORDERED:
+            if values[low_key] > values[high_key]:
+                errors.append(f"{low_key} ({values[low_key]}) is greater than {high_key} ({values[high_key]})")
+        if min(values["ZOOM_LEVELS"]) <= 0:
+            errors.append(f"ZOOM_LEVELS: levels must be positive, got {values['ZOOM_LEVELS']}")
+        if values["ZOOM_START"] not in values["ZOOM_LEVELS"]:
+            errors.append(f"ZOOM_START: {values['ZOOM_START']} is not one of ZOOM_LEVELS")
+        if values["KERNEL_BACKEND"] not in ("auto", "numba", "numpy", "python"):
+            errors.append(f"KERNEL_BACKEND: {values['KERNEL_BACKEND']!r} is not auto, numba, numpy or python")
+        if errors:
+            source = path or name
+            raise SettingsError(f"Invalid settings in {source}:\n  " + "\n  ".join(errors))
+        
+        for key, value in values.items():
+            object.__setattr__(self, key, value)
+        object.__setattr__(self, "PROFILE_NAME", name)
+        object.__setattr__(self, "PROFILE_PATH", path)
+        object.__setattr__(self, "_overrides", overrides)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Settings are read-only (tried to set {name}); use replace()")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"Settings are read-only (tried to delete {name})")
+    
+    def __repr__(self):
+        return f"Settings({self.PROFILE_NAME!r}, {len(self._overrides)} overrides)"
+    
+    def replace(self, **changes):
+        """Return a validated copy with some values changed"""
+        return Settings({**self._overrides, **changes}, self.PROFILE_NAME, self.PROFILE_PATH)
+    
+    def as_dict(self):
+        """Return every setting as a plain dict"""
+        return {key: getattr(self, key) for key in DEFAULTS}
+    
+    def diff(self, other):
+        """Return the names of the settings that differ from other"""
+        return [key for key in DEFAULTS if getattr(self, key) != getattr(other, key)]
+
+
+def load_profile(path):
+    """Load and validate a settings profile from a TOML or JSON file
+    
+    The file holds setting names at the top level, e.g. BOAT_SPEED = 2.0,
+    plus an optional lowercase "name" for the profile.
+    """
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise SettingsError(f"Cannot read {path}: TOML profiles need Python 3.11+")
+        with open(path, "rb") as f:
+            try:
+                data = tomllib.load(f)
+            except tomllib.TOMLDecodeError as e:
+                raise SettingsError(f"Cannot parse {path}: {e}") from e
+    else:
+        with open(path) as f:
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise SettingsError(f"Cannot parse {path}: {e}") from e
+    if not isinstance(data, dict):
+        raise SettingsError(f"{path}: expected a table of settings")
+    
+    name = data.pop("name", os.path.splitext(os.path.basename(path))[0])
+    return Settings(data, name, path)
+
+
+class SettingsWatcher:
+    """Reloads a profile file when it changes on disk"""
+    
+    def __init__(self, path, reload_interval=1000):
+        """Initialize the watcher"""
+        self.path = path
+        self.reload_interval = reload_interval  # ms between checks of the file
+        self._last_check = 0
+        try:
+            self._mtime = os.path.getmtime(path)
+        except OSError:
+            self._mtime = None
+    
+    def poll(self, now):
+        """Return newly loaded settings if the file changed, else None
+        
+        An invalid edit is reported and ignored; the current settings stay.
+        """
+        if now - self._last_check < self.reload_interval:
+            return None
+        self._last_check = now
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return None
+        if mtime == self._mtime:
+            return None
+        self._mtime = mtime
+        print(f"Debug: Reloading settings from {self.path}")
+        try:
+            return load_profile(self.path)
+        except (OSError, SettingsError) as e:
+            print(f"Debug: Keeping current settings: {e}")
+            return None
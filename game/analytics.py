@@ -0,0 +1,297 @@
+import argparse
+import csv
+import functools
+import math
+import multiprocessing
+import os
+import sys
+import time
+
+from game.trace import FILE_SUFFIX, TraceReader
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet output is unavailable; CSV still works
+    pyarrow = None
+
+# Output columns, one row per session
+COLUMNS = (
+    "file", "seed", "world", "outcome", "ticks", "seconds",
+    "heading_error_mean",  # Mean angle (degrees) between the boat's course and the bearing to the target
+    "heading_error_p90",  # Whole degrees, rounded down
+    "fighting_current_seconds",  # Time the input force pushed against the current
+    "fighting_current_share",  # Same, as a share of the ticks with any input
+    "near_misses",  # Passes within the near-miss distance of a rock that didn't hit it
+    "min_rock_clearance",  # Closest the boat's edge came to a rock (px)
+)
+
+# Columns averaged per outcome in the summary
+SUMMARY_COLUMNS = ("seconds", "heading_error_mean", "fighting_current_share", "near_misses")
+
+
+def iter_trace_paths(directory):
+    """Yield the trace files under directory (recursively) without listing them all first"""
+    stack = [directory]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError as e:
+            print(f"Debug: Skipping {e.filename}: {e.strerror}", file=sys.stderr)
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(FILE_SUFFIX):
+                    yield entry.path
+
+
+def session_metrics(reader, near_miss=20.0, min_speed=0.5):
+    """Compute the metrics of one trace from its streamed ticks; returns a row dict
+
+    Heading error only counts ticks at min_speed or faster, since a boat
+    that barely moves has no meaningful course.
+    """
+    target_x, target_y = reader.target_pos
+    rocks = [(x, y, radius + reader.boat_radius) for x, y, radius in reader.rocks]
+    near = [False] * len(rocks)
+    min_speed_squared = min_speed * min_speed
+
+    # Heading errors go into whole-degree bins so the percentile needs no tick list
+    error_bins = [0] * 181
+    error_sum = 0.0
+    error_ticks = 0
+    fighting = 0
+    input_ticks = 0
+    near_misses = 0
+    min_clearance = math.inf
+
+    for x, y, vx, vy, cx, cy, left, right, forward, backward, heading in reader.iter_ticks():
+        if vx * vx + vy * vy >= min_speed_squared:
+            # Angle between the course and the bearing to the target, from their cross and dot products
+            dx = target_x - x
+            dy = target_y - y
+            error = math.degrees(abs(math.atan2(vx * dy - vy * dx, vx * dx + vy * dy)))
+            error_sum += error
+            error_ticks += 1
+            error_bins[int(error)] += 1
+
+        # Input force, in the same axes as in game.physics.step_boat
+        force_x = left - right
+        force_y = backward - forward
+        if force_x or force_y:
+            input_ticks += 1
+            if force_x * cx + force_y * cy < 0:
+                fighting += 1
+
+        for index, (rock_x, rock_y, reach) in enumerate(rocks):
+            clearance = math.hypot(x - rock_x, y - rock_y) - reach
+            if clearance < min_clearance:
+                min_clearance = clearance
+            if clearance < near_miss:
+                near[index] = True
+            elif near[index]:
+                # Left the near-miss band again without hitting the rock
+                near[index] = False
+                near_misses += 1
+
+    # Still close to a rock at the end: a near miss unless the run ended on a rock
+    if reader.outcome != "collision":
+        near_misses += sum(near)
+
+    p90 = None
+    if error_ticks:
+        threshold = error_ticks * 0.9
+        seen = 0
+        for degree, count in enumerate(error_bins):
+            seen += count
+            if seen >= threshold:
+                p90 = degree
+                break
+
+    return {
+        "file": reader.path,
+        "seed": reader.seed,
+        "world": f"{reader.world_key:08x}",
+        "outcome": reader.outcome,
+        "ticks": reader.ticks,
+        "seconds": round(reader.ticks / reader.fps, 3),
+        "heading_error_mean": round(error_sum / error_ticks, 3) if error_ticks else None,
+        "heading_error_p90": p90,
+        "fighting_current_seconds": round(fighting / reader.fps, 3),
+        "fighting_current_share": round(fighting / input_ticks, 4) if input_ticks else None,
+        "near_misses": near_misses,
+        "min_rock_clearance": round(min_clearance, 2) if rocks else None,
+    }
+
+
+def analyze_file(path, near_miss=20.0, min_speed=0.5):
+    """Return (row, None) for a trace file, or (None, error message) when it can't be read"""
+    try:
+        with TraceReader(path) as reader:
+            return session_metrics(reader, near_miss, min_speed), None
+    except (OSError, ValueError) as e:
+        return None, f"{path}: {e}"
+
+
+class CsvOutput:
+    """Writes rows to a CSV file as they arrive"""
+
+    def __init__(self, path):
+        """Open the file and write the header"""
+        self._file = open(path, "w", newline="")
+        self._writer = csv.DictWriter(self._file, COLUMNS)
+        self._writer.writeheader()
+
+    def write(self, row):
+        """Write one row"""
+        self._writer.writerow(row)
+
+    def close(self):
+        """Close the file"""
+        self._file.close()
+
+
+class ParquetOutput:
+    """Writes rows to a Parquet file, one row group per batch of rows"""
+
+    def __init__(self, path, batch_rows=10000):
+        """Open the file (requires pyarrow)"""
+        if pyarrow is None:
+            raise RuntimeError("Parquet output needs pyarrow")
+        self.batch_rows = batch_rows
+        schema = pyarrow.schema([
+            ("file", pyarrow.string()), ("seed", pyarrow.int64()), ("world", pyarrow.string()),
+            ("outcome", pyarrow.string()), ("ticks", pyarrow.int64()), ("seconds", pyarrow.float64()),
+            ("heading_error_mean", pyarrow.float64()), ("heading_error_p90", pyarrow.int64()),
+            ("fighting_current_seconds", pyarrow.float64()), ("fighting_current_share", pyarrow.float64()),
+            ("near_misses", pyarrow.int64()), ("min_rock_clearance", pyarrow.float64()),
+        ])
+        self._writer = pyarrow.parquet.ParquetWriter(path, schema)
+        self._columns = {name: [] for name in COLUMNS}
+        self._rows = 0
+
+    def write(self, row):
+        """Add one row, writing a row group once a batch is full"""
+        for name in COLUMNS:
+            self._columns[name].append(row[name])
+        self._rows += 1
+        if self._rows >= self.batch_rows:
+            self._flush()
+
+    def _flush(self):
+        """Write the buffered rows as one row group"""
+        if self._rows:
+            self._writer.write_table(pyarrow.table(self._columns, schema=self._writer.schema))
+            self._columns = {name: [] for name in COLUMNS}
+            self._rows = 0
+
+    def close(self):
+        """Write what is left and close the file"""
+        self._flush()
+        self._writer.close()
+
+
+class Summary:
+    """Running per-outcome totals of the analyzed sessions"""
+
+    def __init__(self):
+        """Initialize empty totals"""
+        self.sessions = 0
+        self.skipped = 0
+        self.outcomes = {}  # outcome -> [sessions, sum per SUMMARY_COLUMNS, rows per SUMMARY_COLUMNS]
+
+    def add(self, row):
+        """Count one session"""
+        self.sessions += 1
+        totals = self.outcomes.get(row["outcome"])
+        if totals is None:
+            totals = self.outcomes[row["outcome"]] = [0, [0.0] * len(SUMMARY_COLUMNS), [0] * len(SUMMARY_COLUMNS)]
+        totals[0] += 1
+        for index, name in enumerate(SUMMARY_COLUMNS):
+            if row[name] is not None:
+                totals[1][index] += row[name]
+                totals[2][index] += 1
+
+    def lines(self):
+        """Return the summary as printable lines, most common outcome first"""
+        lines = [f"sessions: {self.sessions}, skipped: {self.skipped}"]
+        for outcome, (sessions, sums, counts) in sorted(self.outcomes.items(), key=lambda item: -item[1][0]):
+            means = ", ".join(f"{name} {total / count:.2f}" if count else f"{name} -"
+                              for name, total, count in zip(SUMMARY_COLUMNS, sums, counts))
+            lines.append(f"{outcome}: {sessions} sessions, mean {means}")
+        return lines
+
+
+def analyze(paths, output, workers=None, chunksize=64, near_miss=20.0, min_speed=0.5, progress_interval=10, out=None):
+    """Analyze trace files on a process pool, writing rows as they finish; returns the Summary
+
+    paths may be any iterable (such as iter_trace_paths()); it is consumed
+    lazily and rows are written in completion order, so memory stays flat
+    however many files there are.
+    """
+    summary = Summary()
+    analyze_one = functools.partial(analyze_file, near_miss=near_miss, min_speed=min_speed)
+    pool = None
+    if workers == 1:
+        results = map(analyze_one, paths)
+    else:
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap_unordered(analyze_one, paths, chunksize)
+    started = time.perf_counter()
+    next_progress = started + progress_interval
+    try:
+        for row, error in results:
+            if row is None:
+                summary.skipped += 1
+                print(f"Debug: Skipping {error}", file=sys.stderr)
+                continue
+            output.write(row)
+            summary.add(row)
+            if out is not None and time.perf_counter() >= next_progress:
+                next_progress += progress_interval
+                elapsed = time.perf_counter() - started
+                print(f"{summary.sessions} sessions in {elapsed:.0f} s ({summary.sessions / elapsed:.0f}/s)", file=out)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return summary
+
+
+def main():
+    """Analyze a directory of session traces from the command line"""
+    parser = argparse.ArgumentParser(description="Island Navigator trace analytics")
+    parser.add_argument("directory", help="Directory searched (recursively) for trace files")
+    parser.add_argument("--out", default="sessions.csv", help="Output file, one row per session")
+    parser.add_argument("--format", choices=("csv", "parquet"), default=None,
+                        help="Output format (default: from the file extension)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--chunksize", type=int, default=64, help="Files handed to a worker at a time")
+    parser.add_argument("--near-miss", type=float, default=20.0, help="Clearance (px) to a rock that counts as a near miss")
+    parser.add_argument("--min-speed", type=float, default=0.5, help="Slowest speed whose course counts for heading error")
+    parser.add_argument("--progress", type=float, default=10, help="Seconds between progress lines")
+    args = parser.parse_args()
+
+    output_format = args.format or ("parquet" if args.out.endswith(".parquet") else "csv")
+    try:
+        output = ParquetOutput(args.out) if output_format == "parquet" else CsvOutput(args.out)
+    except (OSError, RuntimeError) as e:
+        sys.exit(f"Error: {e}")
+
+    started = time.perf_counter()
+    try:
+        summary = analyze(iter_trace_paths(args.directory), output, args.workers, args.chunksize,
+                          args.near_miss, args.min_speed, args.progress, sys.stdout)
+    finally:
+        output.close()
+    elapsed = time.perf_counter() - started
+
+    for line in summary.lines():
+        print(line)
+    print(f"Wrote {summary.sessions} rows to {args.out} in {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
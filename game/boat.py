@@ -1,16 +1,21 @@
+import os
 import pygame
-import math
+from config.controls import Controls
+from game.physics import MAX_FORCE, step_boat, check_collision
+from game.kernels import sin_deg, cos_deg, length, arrow_head
+from graphics.text import get_font
 
 class Boat:
     """Class to manage the player's boat"""
     
-    def __init__(self, settings, screen_rect):
+    def __init__(self, settings, screen_rect, surface_pool=None, controls=None, errors=None):
         """Initialize the boat and set its starting position"""
         self.settings = settings
         self.screen_rect = screen_rect
+        self.surface_pool = surface_pool  # Optional SurfacePool for per-frame effects
+        self.errors = errors  # Optional ErrorLog that accounts for update errors
         
         # Load the boat image
-        import os
         try:
             if os.path.exists(settings.BOAT_TEXTURE):
                 self.original_image = pygame.image.load(settings.BOAT_TEXTURE).convert_alpha()
@@ -48,7 +53,7 @@ class Boat:
         self.right_force = 0
         self.forward_force = 0
         self.backward_force = 0
-        self.MAX_FORCE = 100
+        self.MAX_FORCE = MAX_FORCE
         self.FORCE_INCREMENT = 1
         
         # Control state
@@ -72,6 +77,11 @@ class Boat:
         # Wake particles
         self.wake_particles = []
         self.MAX_WAKE_PARTICLES = 20
+        self._zoomed = None  # (image, zoom, scaled image) for zoomed-out views
+        
+        # Effect quality (lowered by the engine's quality governor)
+        self.arrow_glow = True
+        self.text_antialias = True
         
         # Force display
         self.show_force = False
@@ -81,59 +91,100 @@ class Boat:
         # Update click regions initially
         self.update_click_regions()
         
+        # Key bindings
+        self.bind_controls(controls or Controls())
+        
+    def bind_controls(self, controls):
+        """Build the key code -> handler tables from the control bindings"""
+        self._keydown_dispatch = controls.build_dispatch({
+            "force_left": self._press_left,
+            "force_right": self._press_right,
+            "force_forward": self._press_forward,
+            "force_backward": self._press_backward,
+            "rotate_left": self._rotate_left,
+            "rotate_right": self._rotate_right,
+        })
+        self._keyup_dispatch = controls.build_dispatch({
+            "force_left": self._release_left,
+            "force_right": self._release_right,
+            "force_forward": self._release_forward,
+            "force_backward": self._release_backward,
+        })
+    
     def handle_keydown(self, event):
         """Handle key press events"""
-        if self.is_docked and event.key != pygame.K_UP:
-            return  # Ignore all controls except UP when docked
-        
-        if event.key == pygame.K_LEFT:
-            if not self.left_active:
-                # If right force exists, reduce it first
-                if self.right_force > 0:
-                    self.right_force = max(0, self.right_force - self.FORCE_INCREMENT)
-                else:
-                    self.left_force = min(self.MAX_FORCE, self.left_force + self.FORCE_INCREMENT)
-            self.left_active = True
-        elif event.key == pygame.K_RIGHT:
-            if not self.right_active:
-                # If left force exists, reduce it first
-                if self.left_force > 0:
-                    self.left_force = max(0, self.left_force - self.FORCE_INCREMENT)
-                else:
-                    self.right_force = min(self.MAX_FORCE, self.right_force + self.FORCE_INCREMENT)
-            self.right_active = True
-        elif event.key == pygame.K_UP:
-            if not self.forward_active:
-                # If backward force exists, reduce it first
-                if self.backward_force > 0:
-                    self.backward_force = max(0, self.backward_force - self.FORCE_INCREMENT)
-                else:
-                    self.forward_force = min(self.MAX_FORCE, self.forward_force + self.FORCE_INCREMENT)
-            self.forward_active = True
-        elif event.key == pygame.K_DOWN:
-            if not self.backward_active:
-                # If forward force exists, reduce it first
-                if self.forward_force > 0:
-                    self.forward_force = max(0, self.forward_force - self.FORCE_INCREMENT)
-                else:
-                    self.backward_force = min(self.MAX_FORCE, self.backward_force + self.FORCE_INCREMENT)
-            self.backward_active = True
-        # Rotation controls
-        elif event.key == pygame.K_q:  # Q to rotate left
-            self.heading = (self.heading + 2) % 360
-        elif event.key == pygame.K_e:  # E to rotate right
-            self.heading = (self.heading - 2) % 360
+        action = self._keydown_dispatch.get(event.key)
+        if action is None:
+            return
+        if self.is_docked and action != self._press_forward:
+            return  # Ignore all controls except forward when docked
+        action()
     
     def handle_keyup(self, key):
         """Handle key release events"""
-        if key == pygame.K_LEFT:
-            self.left_active = False
-        elif key == pygame.K_RIGHT:
-            self.right_active = False
-        elif key == pygame.K_UP:
-            self.forward_active = False
-        elif key == pygame.K_DOWN:
-            self.backward_active = False
+        action = self._keyup_dispatch.get(key)
+        if action is not None:
+            action()
+    
+    def _press_left(self):
+        """Add left force"""
+        if not self.left_active:
+            # If right force exists, reduce it first
+            if self.right_force > 0:
+                self.right_force = max(0, self.right_force - self.FORCE_INCREMENT)
+            else:
+                self.left_force = min(self.MAX_FORCE, self.left_force + self.FORCE_INCREMENT)
+        self.left_active = True
+    
+    def _press_right(self):
+        """Add right force"""
+        if not self.right_active:
+            # If left force exists, reduce it first
+            if self.left_force > 0:
+                self.left_force = max(0, self.left_force - self.FORCE_INCREMENT)
+            else:
+                self.right_force = min(self.MAX_FORCE, self.right_force + self.FORCE_INCREMENT)
+        self.right_active = True
+    
+    def _press_forward(self):
+        """Add forward force"""
+        if not self.forward_active:
+            # If backward force exists, reduce it first
+            if self.backward_force > 0:
+                self.backward_force = max(0, self.backward_force - self.FORCE_INCREMENT)
+            else:
+                self.forward_force = min(self.MAX_FORCE, self.forward_force + self.FORCE_INCREMENT)
+        self.forward_active = True
+    
+    def _press_backward(self):
+        """Add backward force"""
+        if not self.backward_active:
+            # If forward force exists, reduce it first
+            if self.forward_force > 0:
+                self.forward_force = max(0, self.forward_force - self.FORCE_INCREMENT)
+            else:
+                self.backward_force = min(self.MAX_FORCE, self.backward_force + self.FORCE_INCREMENT)
+        self.backward_active = True
+    
+    def _rotate_left(self):
+        """Rotate the boat left"""
+        self.heading = (self.heading + 2) % 360
+    
+    def _rotate_right(self):
+        """Rotate the boat right"""
+        self.heading = (self.heading - 2) % 360
+    
+    def _release_left(self):
+        self.left_active = False
+    
+    def _release_right(self):
+        self.right_active = False
+    
+    def _release_forward(self):
+        self.forward_active = False
+    
+    def _release_backward(self):
+        self.backward_active = False
     
     def handle_mouse_click(self, pos):
         """Handle mouse click events"""
@@ -281,34 +332,9 @@ class Boat:
                 self.momentum = [0, 0]
                 return
             
-            # Calculate directional forces with smoother transitions
-            horizontal_force = (self.left_force - self.right_force) / self.MAX_FORCE
-            vertical_force = (self.backward_force - self.forward_force) / self.MAX_FORCE
-            
-            # Calculate movement vectors with improved precision
-            movement_x = horizontal_force * self.settings.BOAT_SPEED
-            movement_y = vertical_force * self.settings.BOAT_SPEED
-            
-            # Calculate current velocity magnitude
-            current_speed = math.sqrt(self.velocity[0]**2 + self.velocity[1]**2)
-            
-            # Apply appropriate damping based on speed
-            if current_speed > 5.0:
-                damping = 0.90
-            else:
-                damping = 0.98
-            
-            # Update momentum with movement forces and dynamic damping
-            self.momentum[0] = (self.momentum[0] + movement_x) * damping
-            self.momentum[1] = (self.momentum[1] + movement_y) * damping
-            
-            # Add current influence
-            self.velocity[0] = self.momentum[0] + current_vector[0]
-            self.velocity[1] = self.momentum[1] + current_vector[1]
-            
-            # Update position
-            self.x += self.velocity[0]
-            self.y += self.velocity[1]
+            # Apply forces, damping and current (shared with the network server)
+            current_speed = step_boat(self, current_vector, self.settings.BOAT_SPEED,
+                                      self.settings.FIXED_POINT_PHYSICS)
             
             # Update rect position
             self.rect.center = (self.screen_rect.centerx, self.screen_rect.centery)
@@ -325,43 +351,16 @@ class Boat:
             self.update_click_regions()
             
         except Exception as e:
-            print(f"Error updating boat: {e}")
+            if self.errors is not None:
+                self.errors.report("boat update", e)
+            else:
+                print(f"Error updating boat: {e}")
             self._reset_controls()
     
     def check_collision(self, islands):
         """Check for collision with islands"""
         boat_radius = self.rect.width // 2  # Simplified circular collision
-        boat_center = (self.x, self.y)
-        
-        # Calculate current velocity magnitude
-        current_speed = math.sqrt(self.velocity[0]**2 + self.velocity[1]**2)
-        MAX_DOCKING_SPEED = 2.0  # Maximum safe speed for docking
-        MAX_SAFE_SPEED = 8.0  # Maximum safe speed for general navigation
-        
-        # Check for excessive speed first
-        if current_speed > MAX_SAFE_SPEED:
-            return "crash_speed_general"  # New result for general high-speed crash
-        
-        for island in islands:
-            # Calculate distance to island center
-            dx = self.x - island["x"]
-            dy = self.y - island["y"]
-            distance = math.sqrt(dx*dx + dy*dy)
-            
-            # Check collision (using island size for radius)
-            if distance < (island["size"] + boat_radius):
-                # Always check speed first when colliding with any island
-                if current_speed > MAX_DOCKING_SPEED:
-                    return "crash_speed_dock"  # High-speed collision with any island
-                    
-                # Only then check island type
-                if island["type"] == "target_island":
-                    return "dock_success"
-                elif island["type"] == "rock":
-                    return "collision"
-                else:
-                    return "dock_fail"
-        return "no_collision"
+        return check_collision(self.x, self.y, self.velocity, boat_radius, islands)
         
     def apply_force(self, side, force):
         """Apply force to either side of the boat"""
@@ -380,8 +379,8 @@ class Boat:
     def update_wake(self):
         """Update boat wake particles"""
         if len(self.wake_particles) < self.MAX_WAKE_PARTICLES:
-            wake_x = self.rect.centerx + math.sin(math.radians(self.heading)) * self.rect.height/2
-            wake_y = self.rect.centery + math.cos(math.radians(self.heading)) * self.rect.height/2
+            wake_x = self.rect.centerx + sin_deg(self.heading) * self.rect.height/2
+            wake_y = self.rect.centery + cos_deg(self.heading) * self.rect.height/2
             
             self.wake_particles.append({
                 'pos': [wake_x, wake_y],
@@ -395,12 +394,18 @@ class Boat:
             if particle['life'] <= 0:
                 self.wake_particles.remove(particle)
         
-    def draw(self, screen):
-        """Draw the boat and its effects"""
+    def _acquire_surface(self, size):
+        """Return a cleared alpha surface, pooled when a pool is available"""
+        if self.surface_pool is not None:
+            return self.surface_pool.acquire(size, pygame.SRCALPHA)
+        return pygame.Surface(size, pygame.SRCALPHA)
+    
+    def draw(self, screen, zoom=1.0):
+        """Draw the boat and its effects, with the hull scaled to the view zoom"""
         # Draw wake particles
         for particle in self.wake_particles:
             alpha = int(255 * particle['life'])
-            wake_surf = pygame.Surface((int(particle['size']*2), int(particle['size']*2)), pygame.SRCALPHA)
+            wake_surf = self._acquire_surface((int(particle['size']*2), int(particle['size']*2)))
             pygame.draw.circle(wake_surf, (255, 255, 255, alpha), 
                              (int(particle['size']), int(particle['size'])), 
                              int(particle['size']))
@@ -408,7 +413,15 @@ class Boat:
                                   particle['pos'][1] - particle['size']))
         
         # Draw the boat
-        screen.blit(self.image, self.rect)
+        if zoom == 1.0:
+            screen.blit(self.image, self.rect)
+        else:
+            if self._zoomed is None or self._zoomed[0] is not self.image or self._zoomed[1] != zoom:
+                width, height = self.image.get_size()
+                size = (max(1, int(width * zoom)), max(1, int(height * zoom)))
+                self._zoomed = (self.image, zoom, pygame.transform.smoothscale(self.image, size))
+            zoomed = self._zoomed[2]
+            screen.blit(zoomed, zoomed.get_rect(center=self.rect.center))
         
         # Draw force arrows
         self.draw_force_arrows(screen)
@@ -431,21 +444,8 @@ class Boat:
         def draw_arrow(surface, color, start_pos, end_pos, width=3):
             """Draw an arrow from start_pos to end_pos"""
             pygame.draw.line(surface, color, start_pos, end_pos, width)
-            # Calculate arrow head
-            angle = math.atan2(end_pos[1] - start_pos[1], end_pos[0] - start_pos[0])
-            arrow_size = 10
-            angle_left = angle + math.pi/6
-            angle_right = angle - math.pi/6
-            
             # Arrow head points
-            head_left = (
-                end_pos[0] - arrow_size * math.cos(angle_left),
-                end_pos[1] - arrow_size * math.sin(angle_left)
-            )
-            head_right = (
-                end_pos[0] - arrow_size * math.cos(angle_right),
-                end_pos[1] - arrow_size * math.sin(angle_right)
-            )
+            head_left, head_right = arrow_head(start_pos, end_pos, 10)
             
             # Draw arrow head
             pygame.draw.polygon(surface, color, [end_pos, head_left, head_right])
@@ -469,8 +469,8 @@ class Boat:
                 end_pos = (center_pos[0], center_pos[1] + arrow_length)
             
             # Draw glow effect if active
-            if active:
-                glow_surf = pygame.Surface((arrow_length * 3, arrow_length * 3), pygame.SRCALPHA)
+            if active and self.arrow_glow:
+                glow_surf = self._acquire_surface((arrow_length * 3, arrow_length * 3))
                 glow_color = (*color[:3], 50)  # Semi-transparent version of the color
                 draw_arrow(glow_surf, glow_color, 
                           (glow_surf.get_width()//2, glow_surf.get_height()//2),
@@ -490,10 +490,10 @@ class Boat:
         draw_control_arrow((self.rect.centerx, down_y), "down", backward_color, self.backward_active)
         
         # Draw force values with current speed
-        font = pygame.font.SysFont(None, 20)
+        font = get_font(20)
         
         def draw_force_text(force, pos):
-            text = font.render(f"{force:.0f}N", True, (255, 255, 255))
+            text = font.render(f"{force:.0f}N", self.text_antialias, (255, 255, 255))
             text_rect = text.get_rect(center=pos)
             pygame.draw.rect(screen, (0, 0, 0), text_rect.inflate(4, 4))
             screen.blit(text, text_rect)
@@ -505,9 +505,9 @@ class Boat:
         draw_force_text(self.backward_force, (self.rect.centerx, down_y + 20))
         
         # Draw current speed
-        current_speed = math.sqrt(self.velocity[0]**2 + self.velocity[1]**2)
+        current_speed = length(self.velocity[0], self.velocity[1])
         speed_color = (255, 255, 255) if current_speed <= 2.0 else (255, 165, 0) if current_speed <= 8.0 else (255, 0, 0)
-        speed_text = font.render(f"Speed: {current_speed:.1f}", True, speed_color)
+        speed_text = font.render(f"Speed: {current_speed:.1f}", self.text_antialias, speed_color)
         speed_rect = speed_text.get_rect(center=(self.rect.centerx, self.rect.centery - 40))
         pygame.draw.rect(screen, (0, 0, 0), speed_rect.inflate(4, 4))
         screen.blit(speed_text, speed_rect)
@@ -538,6 +538,7 @@ class Boat:
         self.right_active = False
         self.forward_active = False
         self.backward_active = False
+        self.is_docked = True
         
         # Clear wake particles
         self.wake_particles.clear()
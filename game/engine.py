@@ -1,16 +1,53 @@
+import os
 import pygame
 import math
+import random
+import time
+from config.controls import Controls
+from config.settings import SettingsWatcher, RESTART_REQUIRED
 from game.boat import Boat
 from game.wave import WaveGenerator
 from game.player import Player
+from game.snapshot import WorldSnapshot, save_snapshot, load_snapshot
+from game.ghost import GhostRecorder, open_runs, save_run
+from game.leaderboard import Leaderboard, RunStats
+from game.trace import TraceWriter, trace_path
+from game.world import World, generate_world, world_random
+from game.world_worker import WorldPregenerator
+from graphics.camera import Camera
+from graphics.lod import LOD_FULL, LOD_IMPOSTOR, lod_for_scale, draw_simple
+from graphics.quality import QualityGovernor
+from graphics.render_target import RenderTarget, DynamicResolution
+from graphics.surface_pool import SurfacePool
+from graphics.sprites import RotatedSprites
+from graphics.text import GlowTextCache, get_font
+from game.features import (FeatureStore, STARTING_ISLAND, ROCK, ISLAND, TREE,
+                           OTHER_BOAT, TARGET_ISLAND)
+from game.startup import StartupTimer
+from game.metrics import Metrics
+from game.memprofile import MemoryProfiler
+from game.errors import ErrorLog
+from game import kernels
 import sys
 
+# Outline of other boats around their center, in units of their size
+OTHER_BOAT_SHAPE = ((0, -1), (1, 1), (-1, 1))
+
 class GameEngine:
     """Main game engine that coordinates all game elements"""
     
-    def __init__(self, settings):
-        """Initialize the game engine"""
+    def __init__(self, settings, startup_timer=None):
+        """Initialize the game engine
+        
+        The background is loaded by finish_startup(), after the first frame
+        is on screen; the instructions screen stays up until the first world
+        arrives from the background worker.
+        """
         self.settings = settings
+        self.startup_timer = startup_timer or StartupTimer()
+        self.startup_complete = False
+        self.errors = ErrorLog(settings.ERROR_SAFE_MODE_AFTER, settings.ERROR_ABORT_AFTER)
+        print(f"Debug: Math kernels on {kernels.use_backend(settings.KERNEL_BACKEND)}")
         
         # Set up the display
         self.screen = pygame.display.set_mode(
@@ -18,6 +55,32 @@ class GameEngine:
         )
         pygame.display.set_caption(settings.SCREEN_TITLE)
         
+        # The world layer is drawn into a render target (possibly at reduced
+        # resolution) and scaled onto the window; the HUD stays at full resolution
+        self.render_target = RenderTarget(self.screen, settings.RENDER_SCALE, settings.RENDER_SMOOTH)
+        self.resolution = None
+        if settings.DYNAMIC_RESOLUTION:
+            self.resolution = DynamicResolution(settings.FRAME_BUDGET_MS, settings.RENDER_SCALE_MIN,
+                                                settings.RENDER_SCALE, settings.RENDER_SCALE_STEP)
+        
+        # The camera follows the boat over the world layer; its zoom is one of
+        # ZOOM_LEVELS and the feature detail tier follows it
+        self.camera = Camera(self.render_target.surface.get_size(), self.render_target.scale,
+                             settings.ZOOM_START, settings.CAMERA_SMOOTHING, settings.CAMERA_SNAP_DISTANCE)
+        self._last_draw_time = None
+        
+        # Quality governor turns costly effects down on slow machines
+        self.quality = None
+        if settings.QUALITY_GOVERNOR:
+            self.quality = QualityGovernor(settings.QUALITY_DEGRADE_MS, settings.QUALITY_RESTORE_MS,
+                                           settings.QUALITY_DEGRADE_ORDER, settings.QUALITY_SAMPLE_FRAMES)
+        self.island_glow = True
+        self.text_antialias = True
+        self.minimap_interval = 1  # Frames between minimap redraws
+        self._minimap_frame = 0
+        self._minimap_cache = None
+        self.startup_timer.mark("display")
+        
         # Game state variables
         self.show_current_notification = False
         self.is_docked = True  # Start docked
@@ -37,50 +100,81 @@ class GameEngine:
         self.background_offset = [0, 0]
         
         # Check if assets directory exists, if not create it
-        import os
         if not os.path.exists("assets"):
             os.makedirs("assets")
         if not os.path.exists("assets/textures"):
             os.makedirs("assets/textures")
         
-        # Load background
-        try:
-            if os.path.exists(settings.BACKGROUND_TEXTURE):
-                self.background = pygame.image.load(settings.BACKGROUND_TEXTURE)
-                bg_width, bg_height = self.background.get_size()
-                self.background_large = pygame.Surface((bg_width * 5, bg_height * 5))
-                for x in range(0, 5):
-                    for y in range(0, 5):
-                        self.background_large.blit(self.background, (x * bg_width, y * bg_height))
-            else:
-                self.background_large = pygame.Surface((settings.SCREEN_WIDTH * 5, settings.SCREEN_HEIGHT * 5))
-                self.background_large.fill(settings.DARK_BLUE)
-                for y in range(0, settings.SCREEN_HEIGHT * 5, 20):
-                    pygame.draw.line(self.background_large, settings.BLUE, 
-                                   (0, y), (settings.SCREEN_WIDTH * 5, y), 2)
-        except Exception as e:
-            print(f"Background loading error: {e}. Using fallback.")
-            self.background_large = pygame.Surface((settings.SCREEN_WIDTH * 5, settings.SCREEN_HEIGHT * 5))
-            self.background_large.fill(settings.DARK_BLUE)
-            for y in range(0, settings.SCREEN_HEIGHT * 5, grid_spacing):
-                pygame.draw.line(self.background_large, (0, 70, 130), 
-                               (0, y), (settings.SCREEN_WIDTH * 5, y), 1)
+        # Seed of the sequence of worlds (snapshots store the seed and the world's index in it)
+        self.world_seed = settings.WORLD_SEED if settings.WORLD_SEED is not None else random.getrandbits(32)
+        
+        # Simulation tick counter (input is applied per tick)
+        self.tick = 0
+        # Simulated time in ms, advanced per tick; game timers run on it so a replay sees the same timings
+        self.sim_time = 0.0
         
         # Add starting island first
-        self.settings.SEA_FEATURES = [{
-            "type": "starting_island",
-            "x": 0,  # At center
-            "y": 0,
-            "size": 40  # Smaller than regular islands
-        }]
+        self.sea_features = FeatureStore()
+        self.sea_features.add(STARTING_ISLAND, 0, 0, 40)  # At center, smaller than regular islands
+        
+        # Start generating worlds in the background right away; the game can
+        # only start once the first one has been picked up (world_ready)
+        self.world = None
+        self.world_ready = False
+        self.world_pool = WorldPregenerator(settings, self.world_seed, settings.WORLD_QUEUE_SIZE)
+        self.world_pool.start()
+        
+        # Earlier runs of the current world raced against, and the recording of this one
+        self.ghosts = []
+        self.ghost_recorder = None
+        
+        # Finished runs are stored in the leaderboard from a background thread
+        self.leaderboard = Leaderboard(settings.LEADERBOARD_FILE, settings.LEADERBOARD_TOP)
+        self.run_stats = None
+        self._last_win_time = None  # finished_at of the latest win, highlighted on the win screen
+        self.trace = None  # Trace of the current run when TRACE_DIRECTORY is set
         
-        # Generate world features (this will add other islands and rocks)
-        self.generate_world_features()
+        # Join a multiplayer server if configured (the server decides the world)
+        self.net_client = None
+        if settings.NET_SERVER_ADDRESS:
+            self._connect(settings.NET_SERVER_ADDRESS)
+            settings = self.settings  # May have taken the server's physics mode
+        self.startup_timer.mark("world generator")
+        
+        # Pooled allocator for transient overlay surfaces
+        self.surface_pool = SurfacePool(debug=settings.DEBUG_SURFACE_POOL)
+        
+        # Runtime metrics for long-running instances
+        self.metrics = None
+        if settings.METRICS_FILE or settings.METRICS_HTTP_PORT is not None:
+            http_address = None
+            if settings.METRICS_HTTP_PORT is not None:
+                http_address = (settings.METRICS_HTTP_HOST, settings.METRICS_HTTP_PORT)
+            self.metrics = Metrics(settings.METRICS_FILE, settings.METRICS_FLUSH_INTERVAL, http_address)
+        self.memory_profiler = None
+        if settings.MEMORY_PROFILE:
+            self.memory_profiler = MemoryProfiler(settings.MEMORY_PROFILE_FILE, settings.MEMORY_PROFILE_INTERVAL,
+                                                  settings.MEMORY_PROFILE_TOP, settings.MEMORY_LEAK_THRESHOLD_KB)
+        
+        # Key bindings (hot reloaded from KEYBINDINGS_FILE)
+        self.controls = Controls(settings.KEYBINDINGS_FILE, settings.CONTROLS_RELOAD_INTERVAL)
+        
+        # Settings profile (hot reloaded between ticks when loaded from a file)
+        self.settings_watcher = None
+        if settings.PROFILE_PATH:
+            self.settings_watcher = SettingsWatcher(settings.PROFILE_PATH, settings.SETTINGS_RELOAD_INTERVAL)
         
         # Initialize game components
-        self.boat = Boat(settings, self.screen.get_rect())
+        self.boat = Boat(settings, self.screen.get_rect(), self.surface_pool, self.controls, self.errors)
         self.wave_generator = WaveGenerator(settings)
-        self.player = Player(self.boat)
+        self.player = Player(self.boat, self.controls)
+        self.controls.add_listener(self.boat.bind_controls)
+        self.controls.add_listener(self.player.bind_controls)
+        self._full_wake_particles = self.boat.MAX_WAKE_PARTICLES
+        self.ghost_sprites = RotatedSprites(self.boat.original_image, settings.GHOST_ROTATION_STEPS,
+                                            settings.GHOST_COLOR, settings.GHOST_ALPHA)
+        if self.net_client is not None:
+            self.boat.x, self.boat.y = self.net_client.spawn
         
         # Game state
         self.game_state = "instructions"  # Start with instructions
@@ -90,6 +184,8 @@ class GameEngine:
         # Checkpoint system
         self.checkpoint_pos = [0, 0]  # Starting position is first checkpoint
         self.has_checkpoint = True
+        if self.net_client is not None:
+            self.checkpoint_pos = list(self.net_client.spawn)
         
         # Target island
         self.island_pos = [self.settings.ISLAND_DISTANCE_MIN, 0]  # Relative to start position
@@ -112,7 +208,10 @@ class GameEngine:
             self.island_rect = self.island_image.get_rect()
         
         # Font for UI elements
-        self.font = pygame.font.SysFont(None, 30)
+        self.font = get_font(30)
+        self._minimap_labels = None  # Compass labels, rendered on first use
+        self._nav_arrow_surf = None  # Navigation arrow shape, drawn on first use
+        self.glow_text = GlowTextCache()
         
         # Navigation arrow settings
         self.nav_arrow_size = 40
@@ -121,25 +220,98 @@ class GameEngine:
         
         # Make sure game starts in instruction state
         self.game_state = "instructions"  # Ensure we start with instructions
+        self.startup_timer.mark("components")
+    
+    def finish_startup(self):
+        """Load what the instructions screen doesn't need: the background"""
+        if self.startup_complete:
+            return
+        self.startup_complete = True
+        self._load_background()
+        self.startup_timer.mark("background")
+        self.poll_first_world()
+    
+    def poll_first_world(self):
+        """Apply the worker's first world once it is ready, without waiting for it"""
+        if self.world_ready:
+            return
+        world = self.world_pool.poll()
+        if world is not None:
+            self._apply_world(world)
+            print(f"Debug: First world ready {(time.perf_counter() - self.startup_timer.started) * 1000:.1f} ms after start")
+    
+    def _load_background(self):
+        """Build the tiled background surface"""
+        settings = self.settings
+        try:
+            if os.path.exists(settings.BACKGROUND_TEXTURE):
+                self.background = pygame.image.load(settings.BACKGROUND_TEXTURE)
+                bg_width, bg_height = self.background.get_size()
+                self.background_large = pygame.Surface((bg_width * 5, bg_height * 5))
+                for x in range(0, 5):
+                    for y in range(0, 5):
+                        self.background_large.blit(self.background, (x * bg_width, y * bg_height))
+            else:
+                self.background_large = pygame.Surface((settings.SCREEN_WIDTH * 5, settings.SCREEN_HEIGHT * 5))
+                self.background_large.fill(settings.DARK_BLUE)
+                for y in range(0, settings.SCREEN_HEIGHT * 5, 20):
+                    pygame.draw.line(self.background_large, settings.BLUE, 
+                                   (0, y), (settings.SCREEN_WIDTH * 5, y), 2)
+        except Exception as e:
+            print(f"Background loading error: {e}. Using fallback.")
+            self.background_large = pygame.Surface((settings.SCREEN_WIDTH * 5, settings.SCREEN_HEIGHT * 5))
+            self.background_large.fill(settings.DARK_BLUE)
+            for y in range(0, settings.SCREEN_HEIGHT * 5, grid_spacing):
+                pygame.draw.line(self.background_large, (0, 70, 130), 
+                               (0, y), (settings.SCREEN_WIDTH * 5, y), 1)
+    
+    def step(self, events=()):
+        """Apply one tick's input events and advance the simulation by one tick"""
+        # Swap in an edited settings profile before the tick starts
+        if self.settings_watcher is not None:
+            new_settings = self.settings_watcher.poll(self.sim_time)
+            if new_settings is not None:
+                self.apply_settings(new_settings)
         
+        for event in events:
+            self.handle_event(event)
+        self.update()
+        self.tick += 1
+        self.sim_time += 1000 / self.settings.FPS
+        if self.metrics is not None:
+            self.metrics.record_tick()
+    
     def handle_event(self, event):
         """Handle game events"""
         try:
             if event.type == pygame.KEYDOWN:
                 if self.game_state == "instructions":
+                    if not self.world_ready:
+                        return  # Still waiting for the first world
                     self.game_state = "playing"
                     self.show_current_notification = True
                     self.current_notification = "Press UP arrow to undock the boat and start your journey!"
-                    self.notification_start_time = pygame.time.get_ticks()
+                    self.notification_start_time = self.sim_time
                     return
                 
-                if event.key == pygame.K_r and (self.game_state == "fail" or self.game_state == "win"):
+                # Single table lookup; steering keys fall through to the boat
+                action = self.controls.actions.get(event.key)
+                if action == "restart" and (self.game_state == "fail" or self.game_state == "win"):
                     print("Debug: R key pressed, initiating restart")
                     self.initiate_restart()
                     return
-                elif event.key == pygame.K_ESCAPE:
+                elif action == "quit":
                     pygame.quit()
                     sys.exit()
+                elif action == "save" and self.game_state == "playing":
+                    self.save_snapshot()
+                    return
+                elif action == "load":
+                    self.load_snapshot()
+                    return
+                elif action in ("zoom_in", "zoom_out") and self.game_state == "playing":
+                    self.step_zoom(1 if action == "zoom_in" else -1)
+                    return
                 
                 if self.game_state == "playing":
                     if self.show_current_notification:
@@ -149,16 +321,16 @@ class GameEngine:
                             self.instruction_shown = True
                             self.show_current_notification = True
                             self.current_notification = f"Current detected! Magnitude: {self.wave_generator.get_magnitude():.1f}, Direction: {self.wave_generator.get_direction()}°"
-                            self.notification_start_time = pygame.time.get_ticks()
+                            self.notification_start_time = self.sim_time
                         return
                     
-                    if self.is_docked and event.key == pygame.K_UP:
+                    if self.is_docked and action == "force_forward":
                         self.is_docked = False
                         self.boat.is_docked = False  # Update boat's docked state
                         self.show_current_notification = True
                         self.game_paused = True
                         self.current_notification = "Boat undocked! Navigate carefully through the currents."
-                        self.notification_start_time = pygame.time.get_ticks()
+                        self.notification_start_time = self.sim_time
                         if hasattr(self, 'boat'):
                             self.boat.velocity = [0, 0]  # Reset velocity when undocking
                             self.boat.momentum = [0, 0]  # Reset momentum when undocking
@@ -185,162 +357,386 @@ class GameEngine:
                 if hasattr(self, 'boat'):
                     self.boat.reset_controls()
         except Exception as e:
-            print(f"Debug: Error in handle_event: {str(e)}")
-            import traceback
-            traceback.print_exc()
-    
-    def generate_world_features(self):
-        """Generate random world features"""
-        import random
-        
-        # Clear existing features
-        self.settings.SEA_FEATURES = []
-        
-        # Generate random rocks (4-6)
-        num_rocks = random.randint(4, 6)
-        for _ in range(num_rocks):
-            distance = random.uniform(self.settings.ISLAND_DISTANCE_MIN * 0.5,
-                                   self.settings.ISLAND_DISTANCE_MAX * 0.7)
-            angle = random.uniform(0, 2 * math.pi)
-            self.settings.SEA_FEATURES.append({
-                "type": "rock",
-                "x": distance * math.cos(angle),
-                "y": distance * math.sin(angle),
-                "size": random.randint(20, 35)  # Rocks are smaller than islands
-            })
-        
-        # Generate random islands (3-5)
-        num_islands = random.randint(3, 5)
-        for _ in range(num_islands):
-            distance = random.uniform(self.settings.ISLAND_DISTANCE_MIN * 0.7,
-                                   self.settings.ISLAND_DISTANCE_MAX * 0.8)
-            angle = random.uniform(0, 2 * math.pi)
-            self.settings.SEA_FEATURES.append({
-                "type": "island",
-                "x": distance * math.cos(angle),
-                "y": distance * math.sin(angle),
-                "size": random.randint(30, 50)
-            })
-        
-        # Generate trees on islands (2-4 per island)
-        for island in self.settings.SEA_FEATURES:
-            if island["type"] == "island":
-                num_trees = random.randint(2, 4)
-                for _ in range(num_trees):
-                    tree_angle = random.uniform(0, 2 * math.pi)
-                    tree_distance = island["size"] * 0.6
-                    self.settings.SEA_FEATURES.append({
-                        "type": "tree",
-                        "x": island["x"] + tree_distance * math.cos(tree_angle),
-                        "y": island["y"] + tree_distance * math.sin(tree_angle),
-                        "size": random.randint(10, 15)
-                    })
-        
-        # Generate other boats (2-3)
-        num_boats = random.randint(2, 3)
-        for _ in range(num_boats):
-            distance = random.uniform(self.settings.ISLAND_DISTANCE_MIN * 0.4,
-                                   self.settings.ISLAND_DISTANCE_MAX * 0.6)
-            angle = random.uniform(0, 2 * math.pi)
-            self.settings.SEA_FEATURES.append({
-                "type": "other_boat",
-                "x": distance * math.cos(angle),
-                "y": distance * math.sin(angle),
-                "size": 20,
-                "heading": random.randint(0, 359)
-            })
-        
-        # Generate the target island last to ensure it's properly placed
-        self._generate_target_island()
-        
-        # Add target island to features
-        self.all_features = self.settings.SEA_FEATURES.copy()
-        self.all_features.append({
-            "type": "target_island",
-            "x": self.target_pos[0],
-            "y": self.target_pos[1],
-            "size": self.settings.ISLAND_RADIUS,
-        })
-    
-    def _generate_target_island(self):
-        """Generate a random position for the target island"""
-        import random
-        
-        # Keep trying until we find a valid position
-        while True:
-            # Random distance between min and max
-            distance = random.uniform(self.settings.ISLAND_DISTANCE_MIN,
-                                   self.settings.ISLAND_DISTANCE_MAX)
-            # Random angle
-            angle = random.uniform(0, 2 * math.pi)
-            
-            # Calculate position
-            x = distance * math.cos(angle)
-            y = distance * math.sin(angle)
-            
-            # Check if position is far enough from other features
-            valid = True
-            min_distance = 200  # Minimum distance from other features
-            
-            for feature in self.settings.SEA_FEATURES:
-                dx = x - feature["x"]
-                dy = y - feature["y"]
-                dist = math.sqrt(dx*dx + dy*dy)
-                if dist < min_distance:
-                    valid = False
-                    break
-            
-            if valid:
-                self.target_pos = [x, y]
-                break
+            self.errors.report("handle_event", e)
+    
+    def end_frame(self, frame_ms):
+        """Feed the work time of the last frame (excluding the frame cap wait) to the adaptive controls"""
+        if self.quality is not None:
+            decision = self.quality.update(frame_ms)
+            if decision is not None:
+                self._apply_quality()
+            if self.metrics is not None:
+                self.metrics.record_quality(self.quality.status(), decision)
+        if self.resolution is not None:
+            scale = self.resolution.update(frame_ms)
+            if scale is not None:
+                self.render_target.set_scale(scale)
+        if self.metrics is not None:
+            self.metrics.record_frame(frame_ms, self.surface_pool.last_frame_allocations)
+            self.metrics.poll(pygame.time.get_ticks())
+    
+    def shutdown(self):
+        """Flush and stop the background services before exiting"""
+        if self.errors.entries:
+            print("Debug: Errors this session:")
+            for line in self.errors.summary():
+                print(f"Debug:   {line}")
+            if self.settings.ERROR_REPORT_FILE:
+                self.errors.write_report(self.settings.ERROR_REPORT_FILE)
+        if self.metrics is not None:
+            self.metrics.close()
+            self.metrics = None
+        if self.memory_profiler is not None:
+            self.memory_profiler.stop()
+            self.memory_profiler = None
+        self._stop_ghosts()
+        self._end_trace("abandoned")
+        self.leaderboard.close()
+        self.world_pool.stop()
+        if self.net_client is not None:
+            self.net_client.close()
+            self.net_client = None
+    
+    def _apply_quality(self):
+        """Set each effect to full or reduced quality per the governor"""
+        degraded = self.quality.degraded if self.quality is not None else ()
+        if "wake_particles" in degraded:
+            self.boat.MAX_WAKE_PARTICLES = self.settings.QUALITY_LOW_WAKE_PARTICLES
+        else:
+            self.boat.MAX_WAKE_PARTICLES = self._full_wake_particles
+        self.island_glow = "island_glow" not in degraded
+        self.boat.arrow_glow = "arrow_glow" not in degraded
+        if "minimap_refresh" in degraded:
+            self.minimap_interval = self.settings.QUALITY_LOW_MINIMAP_INTERVAL
+        else:
+            self.minimap_interval = 1
+            self._minimap_cache = None
+        self.text_antialias = self.boat.text_antialias = "text_antialias" not in degraded
+    
+    def step_zoom(self, direction):
+        """Move to the next zoom level in (1) or out (-1)"""
+        levels = sorted(self.settings.ZOOM_LEVELS)
+        index = min(range(len(levels)), key=lambda i: abs(levels[i] - self.camera.zoom))
+        index = max(0, min(len(levels) - 1, index + direction))
+        if levels[index] != self.camera.zoom:
+            self.camera.zoom = levels[index]
+            print(f"Debug: Zoom {self.camera.zoom}")
+    
+    def _connect(self, address):
+        """Connect to a game server and build its world from the shared seed"""
+        # Imported here so single-player startup doesn't pay for asyncio
+        from net.client import NetworkClient
+        
+        host, _, port = address.rpartition(":")
+        self.net_client = NetworkClient(self.settings)
+        self.net_client.connect(host, int(port))
+        if self.net_client.fixed_point != self.settings.FIXED_POINT_PHYSICS:
+            # Prediction has to step exactly like the server
+            self.settings = self.settings.replace(FIXED_POINT_PHYSICS=self.net_client.fixed_point)
+        self._apply_world(generate_world(self.settings, world_random(self.net_client.seed, 0)))
+    
+    def apply_settings(self, settings):
+        """Switch every component to new settings; call between ticks"""
+        if self.net_client is not None and settings.FIXED_POINT_PHYSICS != self.net_client.fixed_point:
+            settings = settings.replace(FIXED_POINT_PHYSICS=self.net_client.fixed_point)  # The server decides
+        changed = self.settings.diff(settings)
+        self.settings = settings
+        self.boat.settings = settings
+        self.wave_generator.settings = settings
+        self.world_pool.settings = settings  # Worlds already queued keep the old generation values
+        self.controls.reload_interval = settings.CONTROLS_RELOAD_INTERVAL
+        self.surface_pool.debug = settings.DEBUG_SURFACE_POOL
+        self.render_target.smooth = settings.RENDER_SMOOTH
+        if self.resolution is not None:
+            self.resolution.budget_ms = settings.FRAME_BUDGET_MS
+            self.resolution.min_scale = settings.RENDER_SCALE_MIN
+            self.resolution.max_scale = settings.RENDER_SCALE
+            self.resolution.step = settings.RENDER_SCALE_STEP
+        else:
+            self.render_target.set_scale(settings.RENDER_SCALE)
+        self.settings_watcher.reload_interval = settings.SETTINGS_RELOAD_INTERVAL
+        if self.metrics is not None:
+            self.metrics.flush_interval = settings.METRICS_FLUSH_INTERVAL
+        self.errors.safe_mode_after = settings.ERROR_SAFE_MODE_AFTER
+        self.errors.abort_after = settings.ERROR_ABORT_AFTER
+        if self.memory_profiler is not None:
+            self.memory_profiler.interval = settings.MEMORY_PROFILE_INTERVAL
+            self.memory_profiler.top = settings.MEMORY_PROFILE_TOP
+            self.memory_profiler.threshold = settings.MEMORY_LEAK_THRESHOLD_KB * 1024
+        if self.net_client is not None:
+            self.net_client.settings = settings
+            self.net_client.prediction.boat_speed = settings.BOAT_SPEED
+        
+        # Cached renders pick up new colors and sizes
+        if self.world_ready:
+            self.minimap_layer = self.world.render_minimap(settings)
+            self.world.clear_impostors()
+        self._minimap_labels = None
+        self._minimap_cache = None
+        if self.camera.zoom not in settings.ZOOM_LEVELS:
+            self.camera.zoom = settings.ZOOM_START
+        self.camera.smoothing = settings.CAMERA_SMOOTHING
+        self.camera.snap_distance = settings.CAMERA_SNAP_DISTANCE
+        if self.quality is not None:
+            if "QUALITY_DEGRADE_ORDER" in changed or "QUALITY_SAMPLE_FRAMES" in changed:
+                # A new order or window starts over at full quality
+                self.quality = QualityGovernor(settings.QUALITY_DEGRADE_MS, settings.QUALITY_RESTORE_MS,
+                                               settings.QUALITY_DEGRADE_ORDER, settings.QUALITY_SAMPLE_FRAMES)
+            else:
+                self.quality.degrade_ms = settings.QUALITY_DEGRADE_MS
+                self.quality.restore_ms = settings.QUALITY_RESTORE_MS
+        self._apply_quality()
+        self._nav_arrow_surf = None
+        self.ghost_sprites = RotatedSprites(self.boat.original_image, settings.GHOST_ROTATION_STEPS,
+                                            settings.GHOST_COLOR, settings.GHOST_ALPHA)
+        self.leaderboard.top_n = settings.LEADERBOARD_TOP
+        
+        print(f"Debug: Settings profile '{settings.PROFILE_NAME}' applied, changed: {', '.join(changed) or 'nothing'}")
+        pending = [name for name in changed if name in RESTART_REQUIRED]
+        if pending:
+            print(f"Debug: {', '.join(pending)} take effect on the next start")
+    
+    def _apply_world(self, world):
+        """Make a generated world the active one"""
+        self.world = world
+        self.world_ready = True
+        self.sea_features = world.features
+        self.target_pos = world.target_pos
+        self.all_features = world.all_features
+        self.minimap_layer = world.minimap or world.render_minimap(self.settings)
+        self._minimap_cache = None
+        self._start_run()
+    
+    def _start_run(self):
+        """Reset what is tracked per run: the raced ghosts, the ghost recording, the run stats and the trace"""
+        self._reset_ghosts()
+        self._end_trace("abandoned")
+        self.run_stats = RunStats()
+    
+    def _record_run(self, outcome):
+        """Queue the run that just ended for the leaderboard and finish its trace"""
+        self._end_trace(outcome)
+        stats, self.run_stats = self.run_stats, None
+        if stats is None or not stats.ticks:
+            return
+        finished_at = self.leaderboard.record(
+            seed=self.world_seed, world=self.world.key, profile=self.settings.PROFILE_NAME, outcome=outcome,
+            ticks=stats.ticks, seconds=stats.ticks / self.settings.FPS,
+            path_length=stats.path_length, max_speed=stats.max_speed)
+        if outcome == "dock_success":
+            self._last_win_time = finished_at
+    
+    def _trace_tick(self, current_vector):
+        """Add the tick to the run's trace, starting one on the run's first tick"""
+        if self.trace is None:
+            # Runs already under way (resumed, or tracing just turned on) aren't traced
+            if not self.settings.TRACE_DIRECTORY or self.run_stats is None or self.run_stats.ticks != 1:
+                return
+            self.trace = TraceWriter(trace_path(self.settings.TRACE_DIRECTORY, self.world_seed), self.world_seed,
+                                     self.world.key, self.settings.FPS, self.boat.original_image.get_width() // 2,
+                                     self.target_pos, self.settings.ISLAND_RADIUS, self.sea_features)
+        try:
+            self.trace.add(self.boat, current_vector)
+        except OSError as e:
+            print(f"Debug: Could not write trace {self.trace.path}: {e}")
+            self.trace.discard()
+            self.trace = None
     
-    def initiate_restart(self):
-        """Safely initiate a game restart"""
+    def _end_trace(self, outcome):
+        """Finish the current run's trace, if any"""
+        trace, self.trace = self.trace, None
+        if trace is None:
+            return
+        try:
+            trace.close(outcome)
+        except OSError as e:
+            print(f"Debug: Could not write trace {trace.path}: {e}")
+            trace.discard()
+    
+    def _reset_ghosts(self):
+        """Line up the fastest earlier runs of this world and start recording a new one"""
+        self._stop_ghosts()
+        settings = self.settings
+        if settings.GHOST_COUNT:
+            self.ghosts = open_runs(settings.GHOST_DIRECTORY, self.world.key, settings.GHOST_COUNT)
+        if settings.GHOST_RECORD:
+            self.ghost_recorder = GhostRecorder(self.world.key, settings.GHOST_CHUNK_TICKS)
+    
+    def _stop_ghosts(self):
+        """Close the raced runs and drop the recording"""
+        for ghost in self.ghosts:
+            ghost.close()
+        self.ghosts = []
+        self.ghost_recorder = None
+    
+    def _save_ghost_run(self):
+        """Save the run that just docked so later runs of this world can race it"""
+        recorder, self.ghost_recorder = self.ghost_recorder, None
+        if recorder is None or not recorder.ticks:
+            return
+        settings = self.settings
+        try:
+            path = save_run(settings.GHOST_DIRECTORY, recorder, settings.GHOST_KEEP, settings.GHOST_MAX_FILES)
+            print(f"Debug: Ghost run of {recorder.ticks} ticks saved to {path}")
+        except OSError as e:
+            print(f"Debug: Could not save ghost run: {e}")
+    
+    def initiate_restart(self, keep_world=None):
+        """Safely initiate a game restart, reusing the existing game objects"""
         try:
             print("Debug: Initiating game restart")
-            # Create new boat instance
-            from game.boat import Boat
-            self.boat = Boat(self.settings, self.screen.get_rect())
+            if self.metrics is not None:
+                self.metrics.record_restart()
+            # A failed run returns to the checkpoint in the same world by default
+            if keep_world is None:
+                keep_world = self.game_state == "fail" and self.settings.RESTART_KEEP_WORLD_ON_FAIL
+            if self.net_client is not None:
+                keep_world = True  # The server owns the world
             
-            # Create new player instance with new boat
-            from game.player import Player
-            self.player = Player(self.boat)
+            # Reset pooled objects in place instead of reconstructing them
+            self.boat.reset(self.screen.get_rect())
+            if self.net_client is not None:
+                self.net_client.prediction.clear()
+            self.wave_generator.reset()
             
-            # Reset world position to center
-            self.world_pos = [0, 0]
-            
-            # Generate new world features
-            self.generate_world_features()
+            if keep_world:
+                # Reposition to the last checkpoint
+                self.boat.x = self.checkpoint_pos[0]
+                self.boat.y = self.checkpoint_pos[1]
+                self.world_pos = list(self.checkpoint_pos)
+                self._start_run()
+            else:
+                # Reset world position to center and swap in the next world
+                self.world_pos = [0, 0]
+                self._apply_world(self.world_pool.take())
             
             # Reset game state variables
             self.near_target_notified = False
             self.instruction_shown = False
             self.bermuda_triggered = False
             
-            # Create new wave generator
-            from game.wave import WaveGenerator
-            self.wave_generator = WaveGenerator(self.settings)
-            
             # Reset game state
             self.game_state = "playing"
             self.success_start_time = 0
             self.is_docked = True
             self.show_current_notification = True
             self.current_notification = "Press UP arrow to undock the boat and start your journey!"
-            self.notification_start_time = pygame.time.get_ticks()
+            self.notification_start_time = self.sim_time
             self.game_paused = True
             
             print("Debug: Game restart completed successfully")
+            if self.memory_profiler is not None:
+                self.memory_profiler.on_restart()
             
         except Exception as e:
-            print(f"Debug: Error in initiate_restart: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            self.errors.report("initiate_restart", e)
+    
+    def save_snapshot(self, path=None):
+        """Save the current world and boat state to a snapshot file"""
+        path = path or self.settings.SNAPSHOT_FILE
+        snapshot = WorldSnapshot()
+        snapshot.game_state = self.game_state
+        snapshot.world_pos = list(self.world_pos)
+        snapshot.target_pos = list(self.target_pos)
+        snapshot.checkpoint_pos = list(self.checkpoint_pos)
+        snapshot.boat = {
+            "x": self.boat.x,
+            "y": self.boat.y,
+            "heading": self.boat.heading,
+            "velocity": list(self.boat.velocity),
+            "momentum": list(self.boat.momentum),
+            "angular_velocity": self.boat.angular_velocity,
+            "left_force": self.boat.left_force,
+            "right_force": self.boat.right_force,
+            "forward_force": self.boat.forward_force,
+            "backward_force": self.boat.backward_force,
+            "is_docked": self.is_docked,
+        }
+        snapshot.current_magnitude = self.wave_generator.current_magnitude
+        snapshot.current_direction = self.wave_generator.current_direction
+        if self.world.index is not None:
+            snapshot.world_seed = self.world_seed
+            snapshot.world_index = self.world.index
+        snapshot.features = self.sea_features
+        try:
+            save_snapshot(path, snapshot)
+            print(f"Debug: Snapshot saved to {path}")
+            self._notify(f"Game saved to {path}")
+        except OSError as e:
+            print(f"Debug: Error saving snapshot: {e}")
+            self._warn("Could not save the game!")
+    
+    def load_snapshot(self, path=None):
+        """Restore the world and boat state from a snapshot file"""
+        path = path or self.settings.SNAPSHOT_FILE
+        self.finish_startup()
+        try:
+            snapshot = load_snapshot(path)
+        except (OSError, ValueError) as e:
+            print(f"Debug: Error loading snapshot: {e}")
+            self._warn("Could not load the saved game!")
+            return False
+        
+        # Restore world; new worlds continue its seed's sequence after it
+        self._apply_world(World(snapshot.features, snapshot.target_pos, self.settings.ISLAND_RADIUS))
+        if snapshot.world_seed is not None and self.net_client is None:
+            self.world_seed = snapshot.world_seed
+            self.world.index = snapshot.world_index
+            self.world_pool.seek(snapshot.world_seed, snapshot.world_index + 1)
+        self.checkpoint_pos = snapshot.checkpoint_pos
+        self.world_pos = snapshot.world_pos
+        
+        # Restore boat
+        boat_state = snapshot.boat
+        for name, value in boat_state.items():
+            setattr(self.boat, name, value)
+        self.is_docked = boat_state["is_docked"]
+        if not self.is_docked:
+            # Resumed mid-run; neither a fair race nor a complete run to record
+            self._stop_ghosts()
+            self.run_stats = None
+        self.boat.image = pygame.transform.rotate(self.boat.original_image, self.boat.heading)
+        self.boat.rect = self.boat.image.get_rect(center=self.screen.get_rect().center)
+        self.boat.update_click_regions()
+        
+        # Restore current
+        self.wave_generator.current_magnitude = snapshot.current_magnitude
+        self.wave_generator.current_direction = snapshot.current_direction
+        self.wave_generator.update_current_vector()
+        
+        self.background_offset[0] = -(self.world_pos[0] % self.background_large.get_width())
+        self.background_offset[1] = -(self.world_pos[1] % self.background_large.get_height())
+        
+        # Resume paused so the player can get their bearings
+        self.game_state = snapshot.game_state
+        if self.game_state == "playing":
+            self._notify("Saved game loaded!")
+        print(f"Debug: Snapshot loaded from {path}")
+        return True
+    
+    def _notify(self, message):
+        """Show a notification and pause until it is dismissed"""
+        self.show_current_notification = True
+        self.current_notification = message
+        self.notification_start_time = self.sim_time
+        self.game_paused = True
+    
+    def _warn(self, message):
+        """Show a warning at the bottom of the screen"""
+        self.show_warning = True
+        self.warning_message = message
+        self.warning_start_time = self.sim_time
     
     def update(self):
         """Update game state"""
+        if not self.startup_complete:
+            self.finish_startup()
+        self.poll_first_world()
         try:
-            current_time = pygame.time.get_ticks()
+            current_time = self.sim_time
+            
+            # Pick up edited key bindings between ticks
+            self.controls.poll_reload(current_time)
             
             # Handle notifications timing
             if self.show_current_notification and current_time - self.notification_start_time > self.settings.NOTIFICATION_DURATION:
@@ -367,8 +763,23 @@ class GameEngine:
                     # Get current vector before boat update
                     current_vector = self.wave_generator.get_current_vector()
                     
+                    # Rebase on the latest authoritative state before predicting
+                    if self.net_client is not None:
+                        self.net_client.reconcile(self.boat, current_vector)
+                    
                     # Update boat
                     self.boat.update(current_vector)
+                    if self.net_client is not None:
+                        self.net_client.send_input(self.boat)
+                    
+                    # Ghosts and the recording share the run's tick clock
+                    for ghost in self.ghosts:
+                        ghost.advance()
+                    if self.ghost_recorder is not None:
+                        self.ghost_recorder.add(self.boat.x, self.boat.y, self.boat.heading)
+                    if self.run_stats is not None:
+                        self.run_stats.add(self.boat.x, self.boat.y, self.boat.velocity)
+                    self._trace_tick(current_vector)
                     
                     # Get boat position and velocity
                     boat_pos = self.boat.get_position()
@@ -384,6 +795,7 @@ class GameEngine:
                         self.boat.velocity = [0, 0]
                         self.boat.momentum = [0, 0]
                         self.world_pos = list(self.checkpoint_pos)
+                        self.camera.shake(self.settings.CAMERA_SHAKE_MAGNITUDE, self.settings.CAMERA_SHAKE_DURATION)
                         
                         # Show warning
                         self.show_warning = True
@@ -394,6 +806,9 @@ class GameEngine:
                     # Check for collisions
                     collision_result = self.boat.check_collision(self.all_features)
                     if collision_result != "no_collision":
+                        if self.metrics is not None:
+                            self.metrics.record_outcome(collision_result)
+                        self._record_run(collision_result)
                         # Handle speed-related crashes first
                         if collision_result == "crash_speed_general":
                             print("Debug: Crashed due to excessive speed!")
@@ -414,6 +829,7 @@ class GameEngine:
                         if collision_result == "dock_success":
                             print("Debug: Target island reached!")
                             self.game_state = "win"
+                            self._save_ghost_run()
                             self.success_start_time = current_time
                             return
                         elif collision_result == "dock_fail":
@@ -439,9 +855,7 @@ class GameEngine:
                     self.background_offset[1] = -(self.world_pos[1] % self.background_large.get_height())
                 
         except Exception as e:
-            print(f"Debug: Error in update loop: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            self.errors.report("update loop", e)
     
     def draw(self):
         """Draw the game state"""
@@ -464,7 +878,7 @@ class GameEngine:
                     "- Watch minimap and compass",
                     "- Mind the currents",
                     "",
-                    "Press ANY KEY to begin..."
+                    "Press ANY KEY to begin..." if self.world_ready else "Preparing the sea..."
                 ]
                 
                 y_offset = self.settings.SCREEN_HEIGHT // 4  # Start higher up
@@ -505,18 +919,35 @@ class GameEngine:
                 for option in menu_options:
                     self._draw_message(option, self.settings.WHITE, y_offset)
                     y_offset += 40
+                self._draw_leaderboard(y_offset)
                 return
                 
             # Only draw game elements if in playing state
             if self.game_state == "playing":
+                if not self.startup_complete:
+                    self.finish_startup()
                 try:
                     print("Debug: Drawing game state")
-                    self.screen.blit(self.background_large, self.background_offset)
-                    self._draw_features()
+                    
+                    if self.errors.safe_mode:
+                        self._draw_safe_mode()
+                        return
+                    
+                    # World layer at render scale x zoom, then one scale onto the window
+                    target = self.render_target.surface
+                    self._update_camera(target)
+                    scale = self.camera.scale
+                    self._draw_background(target, scale)
+                    self._draw_features(target, scale)
+                    self.render_target.present()
+                    
+                    # Ghosts, boat and HUD at full resolution
+                    self._draw_ghosts()
                     
                     if hasattr(self, 'boat') and hasattr(self, 'wave_generator'):
+                        self._place_boat()
                         self.wave_generator.draw_indicator(self.screen, self.boat.rect)
-                        self.boat.draw(self.screen)
+                        self.boat.draw(self.screen, self.camera.zoom)
                         self._draw_navigation_arrow()
                         self._draw_ui()
                     else:
@@ -533,20 +964,75 @@ class GameEngine:
                         self._draw_warning(self.warning_message)
                         
                 except Exception as e:
-                    print(f"Debug: Error drawing game elements: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
+                    self.errors.report("drawing game elements", e)
                     
         except Exception as e:
-            print(f"Debug: Critical error in draw method: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            self.errors.report("draw method", e)
+        finally:
+            # Reclaim this frame's transient surfaces
+            self.surface_pool.end_frame()
+    
+    def _draw_safe_mode(self):
+        """Minimal rendering used once drawing keeps failing: flat features, the boat and the distance"""
+        target = self.render_target.surface
+        self._update_camera(target)
+        target.fill(self.settings.DARK_BLUE)
+        stores = [self.all_features]
+        if self.net_client is not None:
+            stores.append(self.net_client.remote_features())
+        scale = self.camera.scale
+        for store in stores:
+            kinds, xs, ys, sizes, headings = store.columns()
+            indices, screen_xs, screen_ys = self.camera.cull(xs, ys, sizes)
+            for index, screen_x, screen_y in zip(indices, screen_xs, screen_ys):
+                draw_simple(target, kinds[index], (screen_x, screen_y), sizes[index] * scale, self.settings)
+        self.render_target.present()
+        
+        self._place_boat()
+        self.boat.draw(self.screen, self.camera.zoom)
+        dx = self.target_pos[0] - self.world_pos[0]
+        dy = self.target_pos[1] - self.world_pos[1]
+        text = self.font.render(f"Safe mode - target {int(math.hypot(dx, dy))} m", False, self.settings.WHITE)
+        self.screen.blit(text, (10, self.settings.SCREEN_HEIGHT - 30))
+    
+    def _update_camera(self, target):
+        """Point the camera at the boat and advance its smoothing and shake"""
+        now = pygame.time.get_ticks()
+        dt = 0 if self._last_draw_time is None else now - self._last_draw_time
+        self._last_draw_time = now
+        camera = self.camera
+        if camera.pixel_scale != self.render_target.scale or camera.viewport.size != target.get_size():
+            camera.set_viewport(target.get_size(), self.render_target.scale)
+        camera.follow(self.world_pos[0], self.world_pos[1])
+        camera.update(dt)
+    
+    def _draw_ghosts(self):
+        """Draw the raced runs as translucent boats in one batched blit"""
+        if not self.ghosts:
+            return
+        camera = self.camera
+        zoom = camera.zoom
+        center_x, center_y = self.screen.get_rect().center
+        pixel_ratio = 1.0 / camera.pixel_scale  # Camera shake is in render target pixels
+        offset_x = center_x - camera.x * zoom + camera.shake_x * pixel_ratio
+        offset_y = center_y - camera.y * zoom + camera.shake_y * pixel_ratio
+        self.ghost_sprites.draw(self.screen, [(offset_x + ghost.x * zoom, offset_y + ghost.y * zoom, ghost.heading)
+                                              for ghost in self.ghosts], zoom)
     
-    def _world_to_screen(self, world_pos):
-        """Convert world coordinates to screen coordinates"""
-        screen_x = self.screen.get_rect().centerx - (self.world_pos[0] - world_pos[0])
-        screen_y = self.screen.get_rect().centery - (self.world_pos[1] - world_pos[1])
-        return (screen_x, screen_y)
+    def _place_boat(self):
+        """Move the boat sprite to where the camera sees it on the window
+        
+        The view is anchored on world_pos, which only starts tracking the
+        boat once it leaves the dock, so the sprite is placed relative to it.
+        """
+        camera = self.camera
+        center = self.screen.get_rect().center
+        pixel_ratio = 1.0 / camera.pixel_scale  # Camera shake is in render target pixels
+        position = (round(center[0] + (self.world_pos[0] - camera.x) * camera.zoom + camera.shake_x * pixel_ratio),
+                    round(center[1] + (self.world_pos[1] - camera.y) * camera.zoom + camera.shake_y * pixel_ratio))
+        if self.boat.rect.center != position:
+            self.boat.rect.center = position
+            self.boat.update_click_regions()
         
     def _draw_ui(self):
         """Draw UI elements like minimap and distance indicator"""
@@ -556,86 +1042,71 @@ class GameEngine:
         # Draw distance text at the bottom
         dx = self.target_pos[0] - self.world_pos[0]
         dy = self.target_pos[1] - self.world_pos[1]
-        distance = math.sqrt(dx * dx + dy * dy)
+        distance = kernels.length(dx, dy)
         
         # Draw distance text at bottom center
         distance_text = f"Distance: {int(distance)} m"
-        font = pygame.font.SysFont(None, 30)
-        text_surface = font.render(distance_text, True, self.settings.WHITE)
+        font = get_font(30)
+        text_surface = font.render(distance_text, self.text_antialias, self.settings.WHITE)
         text_rect = text_surface.get_rect(centerx=self.settings.SCREEN_WIDTH // 2,
                                         bottom=self.settings.SCREEN_HEIGHT - 10)
         self.screen.blit(text_surface, text_rect)
     
     def _draw_minimap(self):
         """Draw the minimap showing the entire game world"""
-        # Create minimap surface with transparency
-        minimap_surf = pygame.Surface((self.settings.MINIMAP_SIZE, self.settings.MINIMAP_SIZE), pygame.SRCALPHA)
-        minimap_surf.fill((0, 0, 0, self.settings.MINIMAP_OPACITY))
-        
-        # Calculate scale factor to fit world into minimap
+        size = self.settings.MINIMAP_SIZE
         scale = self.settings.MINIMAP_SCALE
+        minimap_center = size // 2
         
-        # Draw world boundary
-        pygame.draw.rect(minimap_surf, (50, 50, 50, 100), 
-                        (0, 0, self.settings.MINIMAP_SIZE, self.settings.MINIMAP_SIZE), 1)
+        # Position minimap in lower-right corner with margin
+        minimap_x = self.settings.SCREEN_WIDTH - size - self.settings.MINIMAP_MARGIN
+        minimap_y = self.settings.SCREEN_HEIGHT - size - self.settings.MINIMAP_MARGIN
         
-        # Draw all features on minimap
-        minimap_center = self.settings.MINIMAP_SIZE // 2
-        for feature in self.all_features:
-            # Convert world coordinates to minimap coordinates
-            mini_x = minimap_center + feature["x"] * scale
-            mini_y = minimap_center + feature["y"] * scale
-            
-            # Only draw if within minimap bounds
-            if (0 <= mini_x <= self.settings.MINIMAP_SIZE and 
-                0 <= mini_y <= self.settings.MINIMAP_SIZE):
-                
-                if feature["type"] == "target_island":
-                    # Draw target island (larger, gold)
-                    pygame.draw.circle(minimap_surf, self.settings.MINIMAP_TARGET_COLOR,
-                                     (int(mini_x), int(mini_y)), 4)
-                elif feature["type"] == "island":
-                    # Draw regular island (green)
-                    pygame.draw.circle(minimap_surf, self.settings.MINIMAP_ISLAND_COLOR,
-                                     (int(mini_x), int(mini_y)), 2)
-                elif feature["type"] == "rock":
-                    # Draw rocks (gray)
-                    pygame.draw.circle(minimap_surf, (100, 100, 100),
-                                     (int(mini_x), int(mini_y)), 2)
+        # At reduced quality the finished minimap is reused between refreshes
+        if self.minimap_interval > 1:
+            self._minimap_frame += 1
+            if self._minimap_cache is not None and self._minimap_frame % self.minimap_interval:
+                self.screen.blit(self._minimap_cache, (minimap_x, minimap_y))
+                return
+            target = self._minimap_cache = self.minimap_layer.copy()
+            origin_x, origin_y = 0, 0
+        else:
+            # Static layer (features, border) is pre-rendered per world
+            target = self.screen
+            origin_x, origin_y = minimap_x, minimap_y
+            target.blit(self.minimap_layer, (minimap_x, minimap_y))
         
         # Draw player position
         player_x = minimap_center + self.world_pos[0] * scale
         player_y = minimap_center + self.world_pos[1] * scale
-        pygame.draw.circle(minimap_surf, self.settings.MINIMAP_PLAYER_COLOR,
-                         (int(player_x), int(player_y)), 3)
-        
-        # Draw minimap border
-        pygame.draw.rect(minimap_surf, self.settings.MINIMAP_BORDER_COLOR,
-                        (0, 0, self.settings.MINIMAP_SIZE, self.settings.MINIMAP_SIZE), 2)
+        if 0 <= player_x <= size and 0 <= player_y <= size:
+            pygame.draw.circle(target, self.settings.MINIMAP_PLAYER_COLOR,
+                             (origin_x + int(player_x), origin_y + int(player_y)), 3)
         
         # Draw compass points on minimap
-        font = pygame.font.SysFont(None, 20)
-        compass_points = [
-            ("N", (minimap_center, 5)),
-            ("S", (minimap_center, self.settings.MINIMAP_SIZE - 5)),
-            ("E", (self.settings.MINIMAP_SIZE - 5, minimap_center)),
-            ("W", (5, minimap_center))
-        ]
-        
-        for label, pos in compass_points:
-            text = font.render(label, True, self.settings.WHITE)
-            text_rect = text.get_rect(center=pos)
-            minimap_surf.blit(text, text_rect)
+        if self._minimap_labels is None:
+            font = get_font(20)
+            compass_points = [
+                ("N", (minimap_center, 5)),
+                ("S", (minimap_center, size - 5)),
+                ("E", (size - 5, minimap_center)),
+                ("W", (5, minimap_center))
+            ]
+            self._minimap_labels = []
+            for label, pos in compass_points:
+                text = font.render(label, True, self.settings.WHITE)
+                self._minimap_labels.append((text, text.get_rect(center=pos)))
         
-        # Position minimap in lower-right corner with margin
-        minimap_x = self.settings.SCREEN_WIDTH - self.settings.MINIMAP_SIZE - self.settings.MINIMAP_MARGIN
-        minimap_y = self.settings.SCREEN_HEIGHT - self.settings.MINIMAP_SIZE - self.settings.MINIMAP_MARGIN
-        self.screen.blit(minimap_surf, (minimap_x, minimap_y))
+        for text, text_rect in self._minimap_labels:
+            target.blit(text, text_rect.move(origin_x, origin_y))
+        
+        if target is not self.screen:
+            self.screen.blit(target, (minimap_x, minimap_y))
     
     def _draw_message(self, message, color, y_offset=None):
         """Draw a centered message on the screen"""
-        font = pygame.font.SysFont(None, 24)  # Reduced from 36 to 24
-        text_surface = font.render(message, True, color)
+        font = get_font(24)  # Reduced from 36 to 24
+        text_surface = font.render(message, self.text_antialias, color)
         
         if y_offset is None:
             # Center vertically if no y_offset provided
@@ -647,44 +1118,51 @@ class GameEngine:
         
         # Draw semi-transparent background
         bg_rect = text_rect.inflate(20, 20)
-        bg_surface = pygame.Surface(bg_rect.size, pygame.SRCALPHA)
-        bg_surface.fill((0, 0, 0, 150))
+        bg_surface = self.surface_pool.acquire(bg_rect.size, pygame.SRCALPHA, (0, 0, 0, 150))
         self.screen.blit(bg_surface, bg_rect)
         
         # Draw text
         self.screen.blit(text_surface, text_rect)
     
+    def _draw_leaderboard(self, top):
+        """List the best runs of this world, from the leaderboard's cached query"""
+        if not self.settings.LEADERBOARD_TOP:
+            return
+        rows = self.leaderboard.top("world", self.world.key)
+        if not rows:
+            return  # Not queried yet; shows up a frame or two later
+        settings = self.settings
+        font = get_font(settings.UI_FONT_SIZE)
+        lines = [(f"Best runs - world {self.world.key:08x}", settings.WHITE)]
+        for rank, row in enumerate(rows, 1):
+            color = settings.GOLD if row["finished_at"] == self._last_win_time else settings.WHITE
+            lines.append((f"{rank}. {row['seconds']:.1f} s   {row['path_length']:.0f} m   "
+                          f"max speed {row['max_speed']:.1f}", color))
+        
+        line_height = font.get_linesize()
+        width = max(font.size(text)[0] for text, _ in lines) + 20
+        panel = pygame.Rect(0, 0, width, line_height * len(lines) + 10)
+        panel.midtop = (settings.SCREEN_WIDTH // 2, top)
+        self.screen.blit(self.surface_pool.acquire(panel.size, pygame.SRCALPHA, (0, 0, 0, 150)), panel)
+        y = panel.top + 5
+        for text, color in lines:
+            surface = font.render(text, self.text_antialias, color)
+            self.screen.blit(surface, surface.get_rect(midtop=(panel.centerx, y)))
+            y += line_height
+    
     def _draw_message_with_glow(self, message, color, alpha=255):
         """Draw a centered message with a glow effect"""
-        font = pygame.font.SysFont(None, 48)  # Larger font for better visibility
-        
-        # Create the main text
-        text_surface = font.render(message, True, color)
+        # Glow text is rendered once and cached; only the alpha changes per frame
+        text_surface = self.glow_text.get(message, color, 48, alpha)  # Larger font for better visibility
         text_rect = text_surface.get_rect(center=(self.settings.SCREEN_WIDTH // 2, 
                                                 self.settings.SCREEN_HEIGHT // 2))
         
-        # Create glow effect
-        glow_surfaces = []
-        for size in range(10, 0, -2):  # Create multiple layers of glow
-            glow_color = (*color, int(alpha * 0.1))  # Reduce alpha for glow
-            glow_surface = font.render(message, True, glow_color)
-            glow_surface = pygame.transform.scale(glow_surface, 
-                (glow_surface.get_width() + size, 
-                 glow_surface.get_height() + size))
-            glow_rect = glow_surface.get_rect(center=text_rect.center)
-            glow_surfaces.append((glow_surface, glow_rect))
-        
         # Draw semi-transparent background
-        bg_rect = text_rect.inflate(40, 40)
-        bg_surface = pygame.Surface(bg_rect.size, pygame.SRCALPHA)
-        bg_surface.fill((0, 0, 0, min(200, alpha)))
+        bg_rect = text_rect.inflate(40 - 4 * self.glow_text.glow_radius, 40 - 4 * self.glow_text.glow_radius)
+        bg_surface = self.surface_pool.acquire(bg_rect.size, pygame.SRCALPHA, (0, 0, 0, min(200, alpha)))
         self.screen.blit(bg_surface, bg_rect)
         
-        # Draw glow layers
-        for glow_surface, glow_rect in glow_surfaces:
-            self.screen.blit(glow_surface, glow_rect)
-        
-        # Draw main text
+        # Draw text with its glow
         self.screen.blit(text_surface, text_rect)
     
     def _draw_navigation_arrow(self):
@@ -698,160 +1176,189 @@ class GameEngine:
         angle = math.degrees(math.atan2(dy, dx))
         
         # Calculate arrow position (centered on boat)
-        center_x = self.screen.get_rect().centerx
-        center_y = self.screen.get_rect().centery
+        center_x, center_y = self.boat.rect.center
         
-        # Create arrow surface
+        # Arrow shape is drawn once and only rotated per frame
         arrow_size = 40
-        arrow_surf = pygame.Surface((arrow_size * 2, arrow_size * 2), pygame.SRCALPHA)
-        
-        # Calculate arrow points
-        arrow_points = [
-            (arrow_size * 2, arrow_size),  # Tip
-            (arrow_size, arrow_size - 10),  # Left wing
-            (arrow_size, arrow_size + 10)   # Right wing
-        ]
-        
-        # Draw arrow
-        pygame.draw.polygon(arrow_surf, self.settings.GOLD, arrow_points)
+        if self._nav_arrow_surf is None:
+            self._nav_arrow_surf = pygame.Surface((arrow_size * 2, arrow_size * 2), pygame.SRCALPHA)
+            
+            # Calculate arrow points
+            arrow_points = [
+                (arrow_size * 2, arrow_size),  # Tip
+                (arrow_size, arrow_size - 10),  # Left wing
+                (arrow_size, arrow_size + 10)   # Right wing
+            ]
+            
+            # Draw arrow
+            pygame.draw.polygon(self._nav_arrow_surf, self.settings.GOLD, arrow_points)
         
         # Rotate arrow to point at target
-        rotated_arrow = pygame.transform.rotate(arrow_surf, -angle - 90)
+        rotated_arrow = pygame.transform.rotate(self._nav_arrow_surf, -angle - 90)
         arrow_rect = rotated_arrow.get_rect(center=(center_x, center_y))
         
         # Draw distance text
-        distance = math.sqrt(dx * dx + dy * dy)
-        font = pygame.font.SysFont(None, 24)
+        distance = kernels.length(dx, dy)
+        font = get_font(24)
         distance_text = f"{int(distance)}m"
-        text_surf = font.render(distance_text, True, self.settings.GOLD)
+        text_surf = font.render(distance_text, self.text_antialias, self.settings.GOLD)
         text_rect = text_surf.get_rect(center=(center_x, center_y + arrow_size + 20))
         
-        # Draw arrow with slight transparency
-        arrow_surf = pygame.Surface(rotated_arrow.get_size(), pygame.SRCALPHA)
-        arrow_surf.fill((0, 0, 0, 0))
-        arrow_surf.blit(rotated_arrow, (0, 0))
-        self.screen.blit(arrow_surf, arrow_rect)
+        # Draw arrow
+        self.screen.blit(rotated_arrow, arrow_rect)
         self.screen.blit(text_surf, text_rect)
     
-    def _draw_features(self):
-        """Draw all sea features"""
+    def _draw_background(self, surface, scale):
+        """Tile the water background over the world layer at the given draw scale"""
+        background = self.render_target.scaled(self.background_large, scale)
+        bg_width, bg_height = background.get_size()
+        width, height = surface.get_size()
+        start_x = -((self.camera.x * scale - self.camera.shake_x) % bg_width)
+        y = -((self.camera.y * scale - self.camera.shake_y) % bg_height)
+        if start_x > 0 or y > 0 or bg_width < width - start_x or bg_height < height - y:
+            surface.fill(self.settings.BLACK)
+        while y < height:
+            x = start_x
+            while x < width:
+                surface.blit(background, (x, y))
+                x += bg_width
+            y += bg_height
+    
+    def _draw_features(self, surface, scale=1.0):
+        """Draw all sea features onto the world layer at the given draw scale
+        
+        The detail tier follows the scale: full detail close up, one flat
+        shape per feature further out, and a single pre-rendered image of
+        the static features when zoomed far out.
+        """
         try:
-            for feature in self.all_features:
-                # Convert world coordinates to screen coordinates
-                screen_pos = self._world_to_screen([feature["x"], feature["y"]])
-                
-                # Only draw if within view distance
-                if (-100 <= screen_pos[0] <= self.settings.SCREEN_WIDTH + 100 and
-                    -100 <= screen_pos[1] <= self.settings.SCREEN_HEIGHT + 100):
+            camera = self.camera
+            lod = lod_for_scale(scale, self.settings.LOD_FULL_SCALE, self.settings.LOD_IMPOSTOR_SCALE)
+            
+            if lod == LOD_IMPOSTOR:
+                # One blit for every static feature; only other players are drawn one by one
+                impostor, (origin_x, origin_y) = self.world.impostor(self.settings, scale)
+                screen_origin = camera.world_to_screen(0, 0)
+                surface.blit(impostor, (screen_origin[0] - origin_x, screen_origin[1] - origin_y))
+                stores = []
+            else:
+                stores = [self.all_features]
+            if self.net_client is not None:
+                # Other players are drawn like the other_boat features
+                stores.append(self.net_client.remote_features())
+            
+            label_font = get_font(max(8, int(24 * scale)))
+            boats_x, boats_y, boats_size, boats_heading = [], [], [], []
+            for store in stores:
+                # Transform and cull the whole store at once; the pad covers glows and labels
+                kinds, xs, ys, sizes, headings = store.columns()
+                indices, screen_xs, screen_ys = camera.cull(xs, ys, sizes, 100)
+                for index, screen_x, screen_y in zip(indices, screen_xs, screen_ys):
+                    screen_pos = (screen_x, screen_y)
+                    kind = kinds[index]
+                    size = sizes[index] * scale
+                    if lod != LOD_FULL:
+                        draw_simple(surface, kind, screen_pos, size, self.settings)
+                        continue
                     
-                    if feature["type"] == "starting_island":
+                    if kind == STARTING_ISLAND:
                         # Draw starting island (blue color to distinguish)
-                        pygame.draw.circle(self.screen, self.settings.BLUE,
-                                         screen_pos, feature["size"])
-                        pygame.draw.circle(self.screen, self.settings.LIGHT_BLUE,
-                                         screen_pos, feature["size"] - 3)
+                        pygame.draw.circle(surface, self.settings.BLUE,
+                                         screen_pos, size)
+                        pygame.draw.circle(surface, self.settings.LIGHT_BLUE,
+                                         screen_pos, size - 3 * scale)
                         # Add "START" text above
-                        font = pygame.font.SysFont(None, 24)
-                        text = font.render("START", True, self.settings.WHITE)
-                        text_rect = text.get_rect(center=(screen_pos[0], screen_pos[1] - feature["size"] - 10))
-                        self.screen.blit(text, text_rect)
+                        text = label_font.render("START", self.text_antialias, self.settings.WHITE)
+                        text_rect = text.get_rect(center=(screen_pos[0], screen_pos[1] - size - 10 * scale))
+                        surface.blit(text, text_rect)
                     
-                    elif feature["type"] == "rock":
+                    elif kind == ROCK:
                         # Draw rock
                         rock_color = (100, 100, 100)  # Gray color for rocks
-                        pygame.draw.circle(self.screen, rock_color,
-                                         screen_pos, feature["size"])
+                        pygame.draw.circle(surface, rock_color,
+                                         screen_pos, size)
                         # Add some texture/detail to rocks
-                        pygame.draw.circle(self.screen, (80, 80, 80),
-                                         (screen_pos[0] - 5, screen_pos[1] - 5),
-                                         feature["size"] // 3)
+                        pygame.draw.circle(surface, (80, 80, 80),
+                                         (screen_pos[0] - 5 * scale, screen_pos[1] - 5 * scale),
+                                         size / 3)
                     
-                    elif feature["type"] == "target_island":
+                    elif kind == TARGET_ISLAND:
                         # Draw target island with enhanced glow effect
-                        glow_surf = pygame.Surface((feature["size"] * 3, feature["size"] * 3),
-                                                pygame.SRCALPHA)
-                        # Pulse effect
-                        pulse = (math.sin(pygame.time.get_ticks() / 500) + 1) * 0.5
-                        glow_alpha = int(100 + pulse * 50)
-                        
-                        pygame.draw.circle(glow_surf, (*self.settings.GOLD, glow_alpha),
-                                         (feature["size"] * 1.5, feature["size"] * 1.5),
-                                         feature["size"] * 1.5)
-                        self.screen.blit(glow_surf, (screen_pos[0] - feature["size"] * 1.5,
-                                               screen_pos[1] - feature["size"] * 1.5))
+                        if self.island_glow:
+                            glow_surf = self.surface_pool.acquire((int(size * 3), int(size * 3)), pygame.SRCALPHA)
+                            # Pulse effect
+                            pulse = (math.sin(pygame.time.get_ticks() / 500) + 1) * 0.5
+                            glow_alpha = int(100 + pulse * 50)
+                            
+                            pygame.draw.circle(glow_surf, (*self.settings.GOLD, glow_alpha),
+                                             (size * 1.5, size * 1.5),
+                                             size * 1.5)
+                            surface.blit(glow_surf, (screen_pos[0] - size * 1.5,
+                                                   screen_pos[1] - size * 1.5))
                         
                         # Draw the island with more detail
-                        pygame.draw.circle(self.screen, self.settings.SAND_COLOR,
-                                         screen_pos, feature["size"])
-                        pygame.draw.circle(self.screen, self.settings.GREEN,
-                                         screen_pos, feature["size"] - 5)
+                        pygame.draw.circle(surface, self.settings.SAND_COLOR,
+                                         screen_pos, size)
+                        pygame.draw.circle(surface, self.settings.GREEN,
+                                         screen_pos, size - 5 * scale)
                         
                         # Add "TARGET" text above
-                        font = pygame.font.SysFont(None, 24)
-                        text = font.render("TARGET", True, self.settings.GOLD)
-                        text_rect = text.get_rect(center=(screen_pos[0], screen_pos[1] - feature["size"] - 20))
-                        self.screen.blit(text, text_rect)
+                        text = label_font.render("TARGET", self.text_antialias, self.settings.GOLD)
+                        text_rect = text.get_rect(center=(screen_pos[0], screen_pos[1] - size - 20 * scale))
+                        surface.blit(text, text_rect)
                         
-                    elif feature["type"] == "island":
+                    elif kind == ISLAND:
                         # Draw regular island
-                        pygame.draw.circle(self.screen, self.settings.SAND_COLOR,
-                                         screen_pos, feature["size"])
-                        pygame.draw.circle(self.screen, self.settings.GREEN,
-                                         screen_pos, feature["size"] - 3)
+                        pygame.draw.circle(surface, self.settings.SAND_COLOR,
+                                         screen_pos, size)
+                        pygame.draw.circle(surface, self.settings.GREEN,
+                                         screen_pos, size - 3 * scale)
                         
-                    elif feature["type"] == "tree":
+                    elif kind == TREE:
                         # Draw tree
                         trunk_color = (101, 67, 33)  # Brown
                         leaf_color = (34, 139, 34)   # Forest green
                         
                         # Draw trunk
-                        pygame.draw.rect(self.screen, trunk_color,
-                                       (screen_pos[0] - 2, screen_pos[1] - feature["size"],
-                                        4, feature["size"]))
+                        pygame.draw.rect(surface, trunk_color,
+                                       (screen_pos[0] - 2 * scale, screen_pos[1] - size,
+                                        4 * scale, size))
                         
                         # Draw triangular leaves
-                        pygame.draw.polygon(self.screen, leaf_color, [
-                            (screen_pos[0], screen_pos[1] - feature["size"] * 2),
-                            (screen_pos[0] - feature["size"], screen_pos[1] - feature["size"] * 0.5),
-                            (screen_pos[0] + feature["size"], screen_pos[1] - feature["size"] * 0.5)
+                        pygame.draw.polygon(surface, leaf_color, [
+                            (screen_pos[0], screen_pos[1] - size * 2),
+                            (screen_pos[0] - size, screen_pos[1] - size * 0.5),
+                            (screen_pos[0] + size, screen_pos[1] - size * 0.5)
                         ])
                         
-                    elif feature["type"] == "other_boat":
-                        # Draw other boats
-                        boat_color = (200, 200, 200)  # Light gray
-                        
-                        # Create a simple boat shape
-                        boat_points = [
-                            (screen_pos[0], screen_pos[1] - feature["size"]),
-                            (screen_pos[0] + feature["size"], screen_pos[1] + feature["size"]),
-                            (screen_pos[0] - feature["size"], screen_pos[1] + feature["size"])
-                        ]
-                        
-                        # Rotate the boat based on its heading
-                        center = screen_pos
-                        angle = feature["heading"]
-                        rotated_points = [
-                            (
-                                center[0] + (x - center[0]) * math.cos(math.radians(angle)) -
-                                (y - center[1]) * math.sin(math.radians(angle)),
-                                center[1] + (x - center[0]) * math.sin(math.radians(angle)) +
-                                (y - center[1]) * math.cos(math.radians(angle))
-                            )
-                            for x, y in boat_points
-                        ]
-                        
-                        pygame.draw.polygon(self.screen, boat_color, rotated_points)
-                        pygame.draw.polygon(self.screen, (100, 100, 100), rotated_points, 2)
+                    elif kind == OTHER_BOAT:
+                        # Other boats are rotated together once the store's are collected
+                        boats_x.append(screen_x)
+                        boats_y.append(screen_y)
+                        boats_size.append(size)
+                        boats_heading.append(headings[index])
+                
+                # Draw the store's other boats, each rotated to its heading, before the next store
+                if boats_x:
+                    self._draw_other_boats(surface, boats_x, boats_y, boats_size, boats_heading)
+                    boats_x, boats_y, boats_size, boats_heading = [], [], [], []
         except Exception as e:
-            print(f"Error drawing features: {e}")
+            self.errors.report("drawing features", e)
+    
+    def _draw_other_boats(self, surface, xs, ys, sizes, headings):
+        """Draw other boats at screen positions, each rotated to its heading"""
+        boat_color = (200, 200, 200)  # Light gray
+        for points in kernels.rotate_polygons(OTHER_BOAT_SHAPE, xs, ys, sizes, headings):
+            pygame.draw.polygon(surface, boat_color, points)
+            pygame.draw.polygon(surface, (100, 100, 100), points, 2)
     
     def _draw_notification(self, message):
         """Draw a notification message with background"""
-        notification_surface = pygame.Surface((self.settings.SCREEN_WIDTH, 100), pygame.SRCALPHA)
-        notification_surface.fill((0, 0, 0, 180))
+        notification_surface = self.surface_pool.acquire((self.settings.SCREEN_WIDTH, 100), pygame.SRCALPHA,
+                                                         (0, 0, 0, 180))
         
-        font = pygame.font.SysFont(None, 36)
-        text_surface = font.render(message, True, self.settings.WHITE)
+        font = get_font(36)
+        text_surface = font.render(message, self.text_antialias, self.settings.WHITE)
         text_rect = text_surface.get_rect(center=(self.settings.SCREEN_WIDTH // 2, 50))
         
         notification_surface.blit(text_surface, text_rect)
@@ -859,11 +1366,11 @@ class GameEngine:
     
     def _draw_warning(self, message):
         """Draw a warning message at the bottom of the screen"""
-        warning_surface = pygame.Surface((self.settings.SCREEN_WIDTH, 50), pygame.SRCALPHA)
-        warning_surface.fill((255, 0, 0, 150))
+        warning_surface = self.surface_pool.acquire((self.settings.SCREEN_WIDTH, 50), pygame.SRCALPHA,
+                                                    (255, 0, 0, 150))
         
-        font = pygame.font.SysFont(None, 30)
-        text_surface = font.render(message, True, self.settings.WHITE)
+        font = get_font(30)
+        text_surface = font.render(message, self.text_antialias, self.settings.WHITE)
         text_rect = text_surface.get_rect(center=(self.settings.SCREEN_WIDTH // 2, 25))
         
         warning_surface.blit(text_surface, text_rect)
@@ -0,0 +1,108 @@
+import json
+import sys
+import time
+import traceback
+
+# Sites whose repeated errors switch the engine to safe-mode rendering
+SAFE_MODE_SITES = ("draw method", "drawing game elements", "drawing features")
+
+
+class ErrorLimitExceeded(BaseException):
+    """One error repeated more often than ERROR_ABORT_AFTER allows
+
+    Derives from BaseException so the broad except Exception blocks it is
+    raised inside let it through to the main loop.
+    """
+
+
+class ErrorEntry:
+    """One distinct error: the site that caught it and its exception type"""
+
+    __slots__ = ("site", "type_name", "count", "first_message", "last_message", "first_traceback",
+                 "first_time", "last_time", "next_log")
+
+    def __init__(self, site, type_name, message, first_traceback, now):
+        """Record the first occurrence"""
+        self.site = site
+        self.type_name = type_name
+        self.count = 1
+        self.first_message = message
+        self.last_message = message
+        self.first_traceback = first_traceback
+        self.first_time = now
+        self.last_time = now
+        self.next_log = 10  # Repeats are logged at 10, 100, 1000, ...
+
+    def as_dict(self):
+        """Return the entry as a JSON-ready dict"""
+        return {"site": self.site, "type": self.type_name, "count": self.count,
+                "first_message": self.first_message, "last_message": self.last_message,
+                "first_time": round(self.first_time, 3), "last_time": round(self.last_time, 3),
+                "first_traceback": self.first_traceback}
+
+
+class ErrorLog:
+    """Accounts for exceptions caught by the engine's broad except blocks
+
+    Errors are deduped by site and exception type. The first occurrence
+    is logged with its traceback, which is kept; repeats only bump a
+    counter and are logged again at 10, 100, 1000, ... so a bug hit every
+    frame can't flood the output. When one error at a drawing site
+    repeats safe_mode_after times, safe_mode is set and the engine falls
+    back to minimal rendering; any error repeating abort_after times
+    raises ErrorLimitExceeded. 0 disables either threshold.
+    """
+
+    def __init__(self, safe_mode_after=100, abort_after=0, safe_mode_sites=SAFE_MODE_SITES):
+        """Initialize an empty log"""
+        self.safe_mode_after = safe_mode_after
+        self.abort_after = abort_after
+        self.safe_mode_sites = safe_mode_sites
+        self.safe_mode = False
+        self.total = 0
+        self.entries = {}  # (site, exception type name) -> ErrorEntry
+
+    def report(self, site, error):
+        """Account for an exception caught at site; call from its except block"""
+        self.total += 1
+        key = (site, type(error).__name__)
+        entry = self.entries.get(key)
+        now = time.time()
+        if entry is None:
+            first_traceback = "".join(traceback.format_exception(error))
+            entry = self.entries[key] = ErrorEntry(site, key[1], str(error), first_traceback, now)
+            print(f"Debug: Error in {site}: {error}")
+            sys.stderr.write(first_traceback)
+        else:
+            entry.count += 1
+            entry.last_message = str(error)
+            entry.last_time = now
+            if entry.count == entry.next_log:
+                entry.next_log *= 10
+                print(f"Debug: Error in {site} repeated {entry.count} times: {error}")
+
+        if (self.safe_mode_after and not self.safe_mode and site in self.safe_mode_sites
+                and entry.count >= self.safe_mode_after):
+            self.safe_mode = True
+            print(f"Debug: Switching to safe-mode rendering after {entry.count} errors in {site}")
+        if self.abort_after and entry.count >= self.abort_after:
+            raise ErrorLimitExceeded(f"{key[1]} in {site} repeated {entry.count} times: {entry.last_message}")
+
+    def counts(self):
+        """Return {(site, exception type name): count}"""
+        return {key: entry.count for key, entry in self.entries.items()}
+
+    def summary(self):
+        """Return one line per distinct error, most frequent first"""
+        entries = sorted(self.entries.values(), key=lambda e: e.count, reverse=True)
+        return [f"{e.count}x {e.type_name} in {e.site}: {e.first_message}" for e in entries]
+
+    def write_report(self, path):
+        """Write every distinct error with its first traceback to a JSON file"""
+        entries = sorted(self.entries.values(), key=lambda e: e.count, reverse=True)
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"total": self.total, "safe_mode": self.safe_mode,
+                           "errors": [entry.as_dict() for entry in entries]}, f, indent=2)
+        except OSError as e:
+            print(f"Debug: Could not write error report to {path}: {e}")
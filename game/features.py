@@ -0,0 +1,121 @@
+from array import array
+
+# Integer feature kinds (compared in hot loops instead of strings)
+STARTING_ISLAND = 0
+ROCK = 1
+ISLAND = 2
+TREE = 3
+OTHER_BOAT = 4
+TARGET_ISLAND = 5
+
+KIND_NAMES = ("starting_island", "rock", "island", "tree", "other_boat", "target_island")
+KIND_BY_NAME = {name: kind for kind, name in enumerate(KIND_NAMES)}
+
+
+class Feature:
+    """Compact record for a single sea feature"""
+
+    __slots__ = ("kind", "x", "y", "size", "heading")
+
+    def __init__(self, kind, x, y, size, heading=0):
+        """Initialize the feature record"""
+        self.kind = kind
+        self.x = x
+        self.y = y
+        self.size = size
+        self.heading = heading
+
+    @property
+    def type(self):
+        """Return the feature type name"""
+        return KIND_NAMES[self.kind]
+
+    def __getitem__(self, key):
+        """Allow legacy dict-style access (feature["x"], feature["type"])"""
+        if key == "type":
+            return KIND_NAMES[self.kind]
+        if key in Feature.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        """Dict-style get for legacy callers"""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f"Feature({KIND_NAMES[self.kind]}, x={self.x:.1f}, y={self.y:.1f}, size={self.size})"
+
+
+class FeatureStore:
+    """List-like container of features with cached columnar views"""
+
+    def __init__(self, features=None):
+        """Initialize the store, optionally from existing features"""
+        self._features = []
+        self._columns = None
+        if features is not None:
+            self.extend(features)
+
+    def add(self, kind, x, y, size, heading=0):
+        """Create a feature and append it to the store"""
+        feature = Feature(kind, x, y, size, heading)
+        self._features.append(feature)
+        self._columns = None
+        return feature
+
+    def append(self, feature):
+        """Append a feature (accepts Feature records or legacy dicts)"""
+        if isinstance(feature, dict):
+            feature = Feature(KIND_BY_NAME[feature["type"]], feature["x"], feature["y"],
+                              feature["size"], feature.get("heading", 0))
+        self._features.append(feature)
+        self._columns = None
+
+    def extend(self, features):
+        """Append several features"""
+        for feature in features:
+            self.append(feature)
+
+    def clear(self):
+        """Remove all features"""
+        self._features.clear()
+        self._columns = None
+
+    def copy(self):
+        """Return a shallow copy of the store (records are shared)"""
+        store = FeatureStore()
+        store._features = self._features.copy()
+        return store
+
+    def invalidate(self):
+        """Drop the cached columns after records were mutated in place"""
+        self._columns = None
+
+    def of_kind(self, kind):
+        """Return the features of a given kind"""
+        return [feature for feature in self._features if feature.kind == kind]
+
+    def columns(self):
+        """Return (kinds, xs, ys, sizes, headings) as packed arrays for vectorized queries"""
+        if self._columns is None:
+            features = self._features
+            self._columns = (
+                array("B", [f.kind for f in features]),
+                array("d", [f.x for f in features]),
+                array("d", [f.y for f in features]),
+                array("d", [f.size for f in features]),
+                array("d", [f.heading for f in features]),
+            )
+        return self._columns
+
+    def __iter__(self):
+        return iter(self._features)
+
+    def __len__(self):
+        return len(self._features)
+
+    def __getitem__(self, index):
+        return self._features[index]
@@ -0,0 +1,219 @@
+"""
+Ghost runs for Island Navigator
+
+The boat trajectory of every successful dock is saved so later runs of
+the same world can race against it. Runs are stored in a small versioned
+little-endian binary format:
+
+    header    magic "INGH", format version, world key, tick count
+    chunks    sample count and a keyframe (absolute position and heading),
+              then one (dx, dy, dheading) int16 delta per further tick
+
+Positions are quantized to 1/16 px and headings to 1/65536 of a turn,
+so a tick takes 6 bytes. Deltas are taken between quantized values and
+every chunk restarts from a keyframe, so rounding never accumulates.
+Playback reads one chunk at a time instead of loading the whole file.
+"""
+
+import os
+import struct
+import time
+
+MAGIC = b"INGH"
+FORMAT_VERSION = 1
+
+POSITION_SCALE = 16
+HEADING_SCALE = 65536 / 360
+
+_HEADER = struct.Struct("<4sHII")
+_CHUNK = struct.Struct("<HiiH")
+_DELTA = struct.Struct("<hhh")
+
+# Largest delta an int16 holds; bigger jumps (a checkpoint return) start a new chunk
+_DELTA_LIMIT = 32767
+
+FILE_SUFFIX = ".ghost"
+
+
+class GhostRecorder:
+    """Delta-encodes the boat's position and heading once per tick"""
+
+    def __init__(self, world_key, chunk_ticks=256):
+        """Initialize an empty recording for the world with the given key"""
+        self.world_key = world_key
+        self.chunk_ticks = chunk_ticks
+        self.ticks = 0
+        self._chunks = []  # Encoded chunks
+        self._keyframe = None  # (qx, qy, qheading) of the open chunk
+        self._deltas = []  # Flat dx, dy, dheading of the open chunk
+        self._last = None
+
+    def add(self, x, y, heading):
+        """Record the boat state of one tick"""
+        sample = (int(round(x * POSITION_SCALE)), int(round(y * POSITION_SCALE)),
+                  int(round((heading % 360) * HEADING_SCALE)) & 0xFFFF)
+        self.ticks += 1
+        last = self._last
+        self._last = sample
+        if last is not None and len(self._deltas) < (self.chunk_ticks - 1) * 3:
+            dx = sample[0] - last[0]
+            dy = sample[1] - last[1]
+            if -_DELTA_LIMIT <= dx <= _DELTA_LIMIT and -_DELTA_LIMIT <= dy <= _DELTA_LIMIT:
+                # Turn by the shortest way round
+                dheading = (sample[2] - last[2] + 32768) % 65536 - 32768
+                self._deltas.extend((dx, dy, dheading))
+                return
+        self._close_chunk()
+        self._keyframe = sample
+
+    def _close_chunk(self):
+        """Encode the open chunk"""
+        if self._keyframe is None:
+            return
+        deltas = self._deltas
+        count = len(deltas) // 3
+        self._chunks.append(_CHUNK.pack(count + 1, *self._keyframe) + struct.pack(f"<{len(deltas)}h", *deltas))
+        self._keyframe = None
+        self._deltas = []
+
+    def save(self, path):
+        """Write the recording to disk atomically"""
+        self._close_chunk()
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, self.world_key, self.ticks))
+            f.write(b"".join(self._chunks))
+        os.replace(temp_path, path)
+
+
+class GhostPlayer:
+    """Streams a saved run back one tick at a time"""
+
+    def __init__(self, path):
+        """Open a run and read its header, raising ValueError on bad files"""
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self.world_key, self.ticks = _read_header(self._file)
+        except ValueError:
+            self._file.close()
+            raise
+        self.tick = 0  # Ticks played; the first sample is shown until the race starts
+        self.finished = False
+        self.x = self.y = self.heading = None
+        self._state = None  # Quantized (x, y, heading) of the current sample
+        self._deltas = None
+        self._remaining = 0  # Deltas left in the loaded chunk
+        if not self._next_chunk():
+            self.close()
+            raise ValueError("Ghost run is empty")
+        self._show()
+
+    def advance(self):
+        """Move to the next tick; the ghost stays at its last position once the run is over"""
+        if self.finished:
+            return
+        self.tick += 1
+        if self.tick == 1:
+            return  # Already showing the first sample
+        if self._remaining:
+            self._remaining -= 1
+            dx, dy, dheading = next(self._deltas)
+            qx, qy, qheading = self._state
+            self._state = (qx + dx, qy + dy, (qheading + dheading) & 0xFFFF)
+        elif not self._next_chunk():
+            self.finished = True
+            self.close()
+            return
+        self._show()
+
+    def _show(self):
+        """Update the public position from the current sample"""
+        qx, qy, qheading = self._state
+        self.x = qx / POSITION_SCALE
+        self.y = qy / POSITION_SCALE
+        self.heading = qheading / HEADING_SCALE
+
+    def _next_chunk(self):
+        """Read the next chunk from disk; return False at the end of the run"""
+        header = self._file.read(_CHUNK.size)
+        if len(header) < _CHUNK.size:
+            return False
+        count, qx, qy, qheading = _CHUNK.unpack(header)
+        data = self._file.read((count - 1) * _DELTA.size)
+        if len(data) < (count - 1) * _DELTA.size:
+            print(f"Debug: Ghost run {self.path} is truncated")
+            return False
+        self._state = (qx, qy, qheading)
+        self._deltas = _DELTA.iter_unpack(data)
+        self._remaining = count - 1
+        return True
+
+    def close(self):
+        """Close the file"""
+        if not self._file.closed:
+            self._file.close()
+
+
+def _read_header(f):
+    """Return (world key, tick count) from the header of an open run"""
+    header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError("Ghost run is truncated")
+    magic, version, world_key, ticks = _HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Not an Island Navigator ghost run")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported ghost run version {version}")
+    return world_key, ticks
+
+
+def list_runs(directory, world_key):
+    """Return (ticks, path) of the saved runs of a world, fastest first"""
+    prefix = f"{world_key:08x}_"
+    try:
+        names = [name for name in os.listdir(directory) if name.startswith(prefix) and name.endswith(FILE_SUFFIX)]
+    except OSError:
+        return []
+    runs = []
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            with open(path, "rb") as f:
+                runs.append((_read_header(f)[1], path))
+        except (OSError, ValueError) as e:
+            print(f"Debug: Skipping ghost run {path}: {e}")
+    runs.sort()
+    return runs
+
+
+def open_runs(directory, world_key, count):
+    """Return players for the fastest count runs of a world"""
+    players = []
+    for ticks, path in list_runs(directory, world_key)[:count]:
+        try:
+            players.append(GhostPlayer(path))
+        except (OSError, ValueError) as e:
+            print(f"Debug: Could not open ghost run {path}: {e}")
+    return players
+
+
+def save_run(directory, recorder, keep=5, max_files=200):
+    """Save a finished run and prune old ones; return its path
+
+    Only the keep fastest runs of each world are kept, and the oldest
+    files go once the directory holds more than max_files runs.
+    """
+    path = os.path.join(directory, f"{recorder.world_key:08x}_{time.time_ns()}{FILE_SUFFIX}")
+    recorder.save(path)
+    for ticks, old_path in list_runs(directory, recorder.world_key)[keep:]:
+        os.remove(old_path)
+    names = [name for name in os.listdir(directory) if name.endswith(FILE_SUFFIX)]
+    if len(names) > max_files:
+        paths = sorted((os.path.join(directory, name) for name in names), key=os.path.getmtime)
+        for old_path in paths[:len(paths) - max_files]:
+            os.remove(old_path)
+    return path
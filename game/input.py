@@ -0,0 +1,110 @@
+import json
+import pygame
+from collections import deque
+
+# Event types the game reacts to; everything else is dropped at ingestion
+HANDLED_EVENT_TYPES = (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+
+class InputEvent:
+    """Timestamped copy of a pygame input event
+
+    Has the same attributes GameEngine.handle_event() reads, so it can be
+    passed in place of a pygame event, and is plain data so it can be
+    recorded and replayed.
+    """
+
+    __slots__ = ("time", "type", "key", "button", "pos")
+
+    def __init__(self, time, type, key=None, button=None, pos=None):
+        """Initialize the event"""
+        self.time = time
+        self.type = type
+        self.key = key
+        self.button = button
+        self.pos = pos
+
+    @classmethod
+    def from_pygame(cls, event, time):
+        """Copy the relevant fields of a pygame event"""
+        return cls(time, event.type, getattr(event, "key", None),
+                   getattr(event, "button", None), getattr(event, "pos", None))
+
+    def to_record(self, tick):
+        """Return a JSON-serializable record of the event applied at tick"""
+        return {"tick": tick, "time": self.time, "type": self.type, "key": self.key,
+                "button": self.button, "pos": list(self.pos) if self.pos else None}
+
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild an event from a recorded entry"""
+        pos = tuple(record["pos"]) if record["pos"] else None
+        return cls(record["time"], record["type"], record["key"], record["button"], pos)
+
+
+class InputQueue:
+    """Queues timestamped input and hands it out per simulation tick"""
+
+    def __init__(self, max_events_per_tick=16, record=False):
+        """Initialize the queue"""
+        self.max_events_per_tick = max_events_per_tick
+        self._events = deque()
+        self.recording = [] if record else None
+        self.dropped = 0  # Unhandled events filtered at ingestion
+
+    def push(self, event, time):
+        """Timestamp and queue a pygame event"""
+        if event.type not in HANDLED_EVENT_TYPES:
+            self.dropped += 1
+            return
+        self._events.append(InputEvent.from_pygame(event, time))
+
+    def __len__(self):
+        return len(self._events)
+
+    def pop_due(self, tick_time, tick):
+        """Return the events stamped at or before tick_time, up to the per-tick limit
+
+        Events beyond the limit stay queued for the following ticks so a
+        burst of input is spread out instead of stalling one frame.
+        """
+        events = self._events
+        due = []
+        while events and events[0].time <= tick_time and len(due) < self.max_events_per_tick:
+            due.append(events.popleft())
+        if self.recording is not None:
+            self.recording.extend(event.to_record(tick) for event in due)
+        return due
+
+    def save_recording(self, path, seed=None):
+        """Write the recorded input to a JSON lines file"""
+        with open(path, "w") as f:
+            f.write(json.dumps({"seed": seed}) + "\n")
+            for record in self.recording:
+                f.write(json.dumps(record) + "\n")
+
+
+class InputReplay:
+    """Feeds recorded input back at the ticks it was originally applied"""
+
+    def __init__(self, path):
+        """Load a recording written by InputQueue.save_recording()"""
+        with open(path) as f:
+            header = json.loads(f.readline())
+            self.seed = header.get("seed")
+            self._records = deque(json.loads(line) for line in f if line.strip())
+
+    def __len__(self):
+        return len(self._records)
+
+    def records(self):
+        """Return the recorded entries not yet replayed"""
+        return list(self._records)
+
+    def pop_due(self, tick_time, tick):
+        """Return the events recorded for this tick"""
+        records = self._records
+        due = []
+        while records and records[0]["tick"] <= tick:
+            due.append(InputEvent.from_record(records.popleft()))
+        return due
@@ -0,0 +1,168 @@
+import math
+
+try:
+    import numpy
+except ImportError:  # The Python backend is used instead
+    numpy = None
+
+try:
+    import numba
+except ImportError:  # Optional; NumPy is used instead
+    numba = None
+
+# Sine and cosine of each whole degree from 0 to 359 (same values as math.sin/cos)
+SIN_TABLE = tuple(math.sin(math.radians(degree)) for degree in range(360))
+COS_TABLE = tuple(math.cos(math.radians(degree)) for degree in range(360))
+
+# Batches smaller than this run in plain Python on every backend
+BATCH_MIN = 48
+
+# Batched kernels run on Numba when it is installed, NumPy otherwise. The
+# collision kernel gives the same answer on every backend, so clients and
+# the server agree; polygon rotation is drawing-only and may differ in the
+# last bit.
+BACKENDS = ("numba", "numpy", "python")
+backend = "numba" if numba is not None else "numpy" if numpy is not None else "python"
+
+
+def use_backend(name):
+    """Select the batched backend ("auto" picks the fastest available); return the one in use"""
+    global backend
+    available = [b for b, module in zip(BACKENDS, (numba, numpy, True)) if module is not None]
+    if name == "auto":
+        backend = available[0]
+    elif name in available:
+        backend = name
+    else:
+        print(f"Debug: Kernel backend '{name}' is not available, using {available[0]}")
+        backend = available[0]
+    return backend
+
+
+def sin_deg(degrees):
+    """Sine of an angle in degrees (table lookup for whole degrees in 0-359)"""
+    whole = int(degrees)
+    if whole == degrees and 0 <= whole < 360:
+        return SIN_TABLE[whole]
+    return math.sin(math.radians(degrees))
+
+
+def cos_deg(degrees):
+    """Cosine of an angle in degrees (table lookup for whole degrees in 0-359)"""
+    whole = int(degrees)
+    if whole == degrees and 0 <= whole < 360:
+        return COS_TABLE[whole]
+    return math.cos(math.radians(degrees))
+
+
+def length(x, y):
+    """Length of the vector (x, y)"""
+    return math.sqrt(x * x + y * y)
+
+
+def arrow_head(start, end, size, spread_cos=math.cos(math.pi / 6), spread_sin=math.sin(math.pi / 6)):
+    """Return the two back corners of an arrow head at end, pointing away from start
+
+    The direction is rotated by the spread (30 degrees by default) without
+    any trig per call.
+    """
+    dx = end[0] - start[0]
+    dy = end[1] - start[1]
+    distance = math.sqrt(dx * dx + dy * dy) or 1.0
+    ux = dx / distance * size
+    uy = dy / distance * size
+    return ((end[0] - (ux * spread_cos - uy * spread_sin), end[1] - (ux * spread_sin + uy * spread_cos)),
+            (end[0] - (ux * spread_cos + uy * spread_sin), end[1] - (uy * spread_cos - ux * spread_sin)))
+
+
+def _first_within_python(x, y, xs, ys, radii, pad):
+    for index in range(len(xs)):
+        dx = x - xs[index]
+        dy = y - ys[index]
+        if math.sqrt(dx * dx + dy * dy) < radii[index] + pad:
+            return index
+    return -1
+
+
+def _first_within_numpy(x, y, xs, ys, radii, pad):
+    dx = x - numpy.frombuffer(xs, dtype=numpy.float64)
+    dy = y - numpy.frombuffer(ys, dtype=numpy.float64)
+    hits = numpy.flatnonzero(numpy.sqrt(dx * dx + dy * dy) < numpy.frombuffer(radii, dtype=numpy.float64) + pad)
+    return int(hits[0]) if len(hits) else -1
+
+
+_first_within_numba = None
+
+
+def first_within(x, y, xs, ys, radii, pad=0.0):
+    """Return the index of the first circle (xs, ys, radii + pad) that contains (x, y), or -1
+
+    xs, ys and radii are float64 buffers such as FeatureStore.columns().
+    """
+    global _first_within_numba
+    if len(xs) < BATCH_MIN or backend == "python":
+        return _first_within_python(x, y, xs, ys, radii, pad)
+    if backend == "numba":
+        if _first_within_numba is None:
+            # Compiled on first use (and cached on disk for later runs)
+            _first_within_numba = numba.njit(cache=True)(_first_within_python)
+        return _first_within_numba(x, y, numpy.frombuffer(xs, dtype=numpy.float64),
+                                   numpy.frombuffer(ys, dtype=numpy.float64),
+                                   numpy.frombuffer(radii, dtype=numpy.float64), pad)
+    return _first_within_numpy(x, y, xs, ys, radii, pad)
+
+
+def _rotate_polygons_python(shape, xs, ys, scales, headings):
+    polygons = []
+    for x, y, scale, heading in zip(xs, ys, scales, headings):
+        c = cos_deg(heading) * scale
+        s = sin_deg(heading) * scale
+        polygons.append([(x + px * c - py * s, y + px * s + py * c) for px, py in shape])
+    return polygons
+
+
+def _rotate_polygons_numpy(shape, xs, ys, scales, headings):
+    shape = numpy.asarray(shape, dtype=numpy.float64)
+    radians = numpy.radians(numpy.asarray(headings, dtype=numpy.float64))
+    scales = numpy.asarray(scales, dtype=numpy.float64)
+    c = (numpy.cos(radians) * scales)[:, None]
+    s = (numpy.sin(radians) * scales)[:, None]
+    px = shape[:, 0][None, :]
+    py = shape[:, 1][None, :]
+    out_x = numpy.asarray(xs, dtype=numpy.float64)[:, None] + px * c - py * s
+    out_y = numpy.asarray(ys, dtype=numpy.float64)[:, None] + px * s + py * c
+    return numpy.stack((out_x, out_y), axis=-1).tolist()
+
+
+def _rotate_polygons_kernel(shape, xs, ys, scales, headings, out):
+    for i in range(len(xs)):
+        radians = headings[i] * math.pi / 180.0
+        c = math.cos(radians) * scales[i]
+        s = math.sin(radians) * scales[i]
+        for j in range(shape.shape[0]):
+            out[i, j, 0] = xs[i] + shape[j, 0] * c - shape[j, 1] * s
+            out[i, j, 1] = ys[i] + shape[j, 0] * s + shape[j, 1] * c
+
+
+_rotate_polygons_numba = None
+
+
+def rotate_polygons(shape, xs, ys, scales, headings):
+    """Place one polygon shape at many positions, scaled and rotated by heading degrees
+
+    shape is a sequence of (x, y) points around the origin. Returns one
+    point list per position, ready for pygame.draw.polygon.
+    """
+    global _rotate_polygons_numba
+    if len(xs) < BATCH_MIN or backend == "python":
+        return _rotate_polygons_python(shape, xs, ys, scales, headings)
+    if backend == "numba":
+        if _rotate_polygons_numba is None:
+            _rotate_polygons_numba = numba.njit(cache=True)(_rotate_polygons_kernel)
+        shape = numpy.asarray(shape, dtype=numpy.float64)
+        out = numpy.empty((len(xs), len(shape), 2))
+        _rotate_polygons_numba(shape, numpy.asarray(xs, dtype=numpy.float64), numpy.asarray(ys, dtype=numpy.float64),
+                               numpy.asarray(scales, dtype=numpy.float64),
+                               numpy.asarray(headings, dtype=numpy.float64), out)
+        return out.tolist()
+    return _rotate_polygons_numpy(shape, xs, ys, scales, headings)
@@ -0,0 +1,163 @@
+import math
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    seed INTEGER,
+    world INTEGER,
+    profile TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    ticks INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    path_length REAL NOT NULL,
+    max_speed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_top_by_seed ON runs (seed, seconds) WHERE outcome = 'dock_success';
+CREATE INDEX IF NOT EXISTS runs_top_by_world ON runs (world, seconds) WHERE outcome = 'dock_success';
+CREATE INDEX IF NOT EXISTS runs_top_by_profile ON runs (profile, seconds) WHERE outcome = 'dock_success';
+"""
+
+_COLUMNS = ("finished_at", "seed", "world", "profile", "outcome", "ticks", "seconds", "path_length", "max_speed")
+
+_INSERT = f"INSERT INTO runs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+# Top-N queries; each is served by one of the partial indexes above
+_TOP_QUERIES = {
+    "seed": "SELECT * FROM runs WHERE outcome = 'dock_success' AND seed = ? ORDER BY seconds LIMIT ?",
+    "world": "SELECT * FROM runs WHERE outcome = 'dock_success' AND world = ? ORDER BY seconds LIMIT ?",
+    "profile": "SELECT * FROM runs WHERE outcome = 'dock_success' AND profile = ? ORDER BY seconds LIMIT ?",
+}
+
+
+class RunStats:
+    """Per-tick totals of one run, from undocking to its outcome"""
+
+    __slots__ = ("ticks", "path_length", "max_speed", "_last")
+
+    def __init__(self):
+        """Initialize empty totals"""
+        self.ticks = 0
+        self.path_length = 0.0
+        self.max_speed = 0.0
+        self._last = None
+
+    def add(self, x, y, velocity, jump_limit=50.0):
+        """Count one tick at position (x, y); jumps (checkpoint returns) don't add to the path"""
+        self.ticks += 1
+        speed = math.sqrt(velocity[0] * velocity[0] + velocity[1] * velocity[1])
+        if speed > self.max_speed:
+            self.max_speed = speed
+        if self._last is not None:
+            step = math.hypot(x - self._last[0], y - self._last[1])
+            if step <= jump_limit:
+                self.path_length += step
+        self._last = (x, y)
+
+
+class Leaderboard:
+    """Run results in a local SQLite database, written from a background thread
+
+    record() and top() never touch the database on the calling thread.
+    Queued runs are inserted in one transaction per batch, and top-N
+    results are kept in a cache the writer refreshes after each batch, so
+    the win screen reads a plain list.
+    """
+
+    def __init__(self, path, top_n=5):
+        """Open (or create) the database and start the writer thread"""
+        self.path = path
+        self.top_n = top_n
+        self.written = 0
+        self.batches = 0
+        self.disabled = False  # Set by the writer when the database can't be opened
+        self._queue = queue.Queue()
+        self._top = {}  # (column, value) -> list of row dicts, replaced whole by the writer
+        self._requested = set()  # Keys queued for a first query (main thread only)
+        self._thread = threading.Thread(target=self._run, name="leaderboard", daemon=True)
+        self._thread.start()
+
+    def record(self, **run):
+        """Queue a finished run (the _COLUMNS values; finished_at defaults to now); returns its finished_at"""
+        run.setdefault("finished_at", time.time())
+        if not self.disabled:
+            self._queue.put(("run", run))
+        return run["finished_at"]
+
+    def top(self, column, value):
+        """Return the cached best runs for a seed, world or profile, or None until the first query finishes"""
+        key = (column, value)
+        rows = self._top.get(key)
+        if rows is None and key not in self._requested and not self.disabled:
+            self._requested.add(key)
+            self._queue.put(("top", key))
+        return rows
+
+    def close(self, timeout=2.0):
+        """Write what is still queued and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        """Writer thread: owns the connection and handles queued work in batches"""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            connection = sqlite3.connect(self.path)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Debug: Leaderboard disabled, could not open {self.path}: {e}")
+            self.disabled = True
+            return
+
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            runs = []
+            refresh = set()
+            for item in batch:
+                if item is None:
+                    stop = True
+                elif item[0] == "run":
+                    runs.append(item[1])
+                else:
+                    refresh.add(item[1])
+
+            if runs:
+                try:
+                    with connection:
+                        connection.executemany(_INSERT, [tuple(run.get(name) for name in _COLUMNS) for run in runs])
+                    self.written += len(runs)
+                    self.batches += 1
+                except sqlite3.Error as e:
+                    print(f"Debug: Could not write {len(runs)} leaderboard runs: {e}")
+                # Cached lists the new runs may belong on
+                for key in list(self._top):
+                    if any(run.get(key[0]) == key[1] for run in runs):
+                        refresh.add(key)
+
+            for column, value in refresh:
+                try:
+                    rows = connection.execute(_TOP_QUERIES[column], (value, self.top_n)).fetchall()
+                    self._top[(column, value)] = [dict(row) for row in rows]
+                except sqlite3.Error as e:
+                    print(f"Debug: Leaderboard query failed: {e}")
+        connection.close()
@@ -0,0 +1,147 @@
+import gc
+import json
+import time
+import tracemalloc
+from collections import Counter
+
+import pygame
+
+from game.metrics import read_rss
+
+# Reports in a row that must all grow before growth is flagged as a suspected leak
+GROWTH_REPORTS = 3
+
+# Allocations made by the profiler itself are left out of the diffs
+_IGNORED_TRACES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def count_surfaces():
+    """Return (count, pixel bytes) of the pygame surfaces reachable from Python objects
+
+    Surfaces aren't tracked by the garbage collector, so they are found
+    through the containers and instances that are. Subsurfaces share their
+    parent's pixels and only add to the count.
+    """
+    seen = set()
+    count = 0
+    pixel_bytes = 0
+    for obj in gc.get_objects():
+        for ref in gc.get_referents(obj):
+            if isinstance(ref, pygame.Surface) and id(ref) not in seen:
+                seen.add(id(ref))
+                count += 1
+                if ref.get_parent() is None:
+                    pixel_bytes += ref.get_pitch() * ref.get_height()
+    return count, pixel_bytes
+
+
+class MemoryProfiler:
+    """Diffs memory use every few restarts and flags steady growth
+
+    Each report holds the tracemalloc allocation sites that grew most since
+    the last report, the object types whose counts grew, the pygame surface
+    count and pixel bytes, and RSS. The first report is the baseline, taken
+    once caches have warmed up over the first interval.
+    """
+
+    def __init__(self, path, interval=50, top=10, threshold_kb=256, frames=1):
+        """Start tracing allocations; a report is written every interval restarts"""
+        self.path = path
+        self.interval = interval
+        self.top = top
+        self.threshold = threshold_kb * 1024  # Traced bytes per interval that count as growth
+        self.restarts = 0
+        self.reports = 0
+        self.suspected_leaks = 0
+        self._snapshot = None
+        self._types = None
+        self._surfaces = None
+        self._growth = []  # (traced growth, surface growth) per report, newest last
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        print(f"Debug: Memory profiling on, report every {interval} restarts to {path}")
+
+    def on_restart(self):
+        """Count a completed restart and report when the interval is reached"""
+        self.restarts += 1
+        if self.restarts % self.interval == 0:
+            self.report()
+
+    def report(self):
+        """Write one report line and return it as a dict"""
+        started = time.perf_counter()
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED_TRACES)
+        types = Counter(type(obj).__name__ for obj in gc.get_objects())
+        surfaces = count_surfaces()
+        traced, peak = tracemalloc.get_traced_memory()
+
+        report = {
+            "time": round(time.time(), 3),
+            "restarts": self.restarts,
+            "rss_bytes": read_rss(),
+            "traced_bytes": traced,
+            "traced_peak_bytes": peak,
+            "surfaces": surfaces[0],
+            "surface_bytes": surfaces[1],
+        }
+
+        if self._snapshot is None:
+            report["baseline"] = True
+        else:
+            stats = snapshot.compare_to(self._snapshot, "lineno")
+            traced_growth = sum(stat.size_diff for stat in stats)
+            report["traced_growth_bytes"] = traced_growth
+            report["top_growth"] = [
+                {"where": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                 "size_diff": stat.size_diff, "count_diff": stat.count_diff}
+                for stat in stats[:self.top] if stat.size_diff > 0
+            ]
+            type_growth = types - self._types  # Only positive differences are kept
+            report["type_growth"] = dict(type_growth.most_common(self.top))
+            report["surface_growth"] = surfaces[0] - self._surfaces[0]
+            report["surface_bytes_growth"] = surfaces[1] - self._surfaces[1]
+
+            self._growth.append((traced_growth, report["surface_growth"]))
+            del self._growth[:-GROWTH_REPORTS]
+            report["suspected_leak"] = self._check_growth()
+
+        self._snapshot = snapshot
+        self._types = types
+        self._surfaces = surfaces
+        self.reports += 1
+        report["report_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(report) + "\n")
+        except OSError as e:
+            print(f"Debug: Could not write memory report to {self.path}: {e}")
+        print(f"Debug: Memory report after {self.restarts} restarts - traced {traced / 1024:.0f} KiB, "
+              f"{surfaces[0]} surfaces ({surfaces[1] / 1024:.0f} KiB)")
+        return report
+
+    def _check_growth(self):
+        """Return what has grown over each of the last GROWTH_REPORTS reports, or None"""
+        if len(self._growth) < GROWTH_REPORTS:
+            return None
+        grown = []
+        if all(traced > self.threshold for traced, _ in self._growth):
+            grown.append("traced memory")
+        if all(surfaces > 0 for _, surfaces in self._growth):
+            grown.append("surfaces")
+        if not grown:
+            return None
+        self.suspected_leaks += 1
+        print(f"Debug: Possible memory leak - {' and '.join(grown)} grew over the last "
+              f"{GROWTH_REPORTS * self.interval} restarts")
+        return grown
+
+    def stop(self):
+        """Stop tracing allocations"""
+        tracemalloc.stop()
@@ -0,0 +1,259 @@
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (ms) of the frame time histogram buckets; slower frames land in +Inf
+FRAME_TIME_BUCKETS = (4, 8, 12, 16, 20, 25, 33, 50, 100, 250)
+
+# Prefix of every exported Prometheus metric
+METRIC_PREFIX = "island_navigator"
+
+
+def read_rss():
+    """Return the resident set size in bytes, or None where it can't be read"""
+    try:
+        # Linux: current RSS in pages
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # Elsewhere only the peak is available (bytes on macOS, KiB on other systems)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Metrics:
+    """Runtime counters for long-running instances
+
+    The main loop only bumps counters. Every flush_interval ms a summary
+    line is appended to a JSON lines file, and an optional HTTP endpoint
+    serves the counters in Prometheus text format from its own thread.
+    """
+
+    def __init__(self, path=None, flush_interval=10000, http_address=None, buckets=FRAME_TIME_BUCKETS):
+        """Initialize the counters; http_address is a (host, port) pair or None"""
+        self.path = path
+        self.flush_interval = flush_interval
+        self.buckets = tuple(buckets)
+        self.started = time.time()
+
+        # Counters (totals since start)
+        self.ticks = 0
+        self.frames = 0
+        self.frame_counts = [0] * (len(self.buckets) + 1)  # Per bucket, not cumulative; last is +Inf
+        self.frame_time_sum = 0.0
+        self.outcomes = {}  # check_collision result -> count
+        self.restarts = 0
+        self.surface_allocations = 0
+        self.quality_changes = {}  # (action, effect) of the quality governor's decisions -> count
+
+        # Gauges, refreshed on each flush
+        self.tick_rate = 0.0
+        self.frame_rate = 0.0
+        self.surface_allocations_per_frame = 0.0
+        self.rss = read_rss()
+        self.quality = None  # Quality governor status (level, average_ms, ...), None without a governor
+
+        self._last_poll = None
+        self._next_flush = None
+        self._window_start = None
+        self._window_ticks = 0
+        self._window_frames = 0
+        self._window_allocations = 0
+
+        self._file = None
+        if path:
+            try:
+                self._file = open(path, "a", encoding="utf-8")
+            except OSError as e:
+                # The gauges and the HTTP endpoint still work without the file
+                print(f"Debug: Could not open metrics file {path}: {e}")
+
+        self._server = None
+        self._thread = None
+        if http_address is not None:
+            self._start_server(http_address)
+
+    def record_tick(self):
+        """Count one simulation tick"""
+        self.ticks += 1
+
+    def record_frame(self, frame_ms, surface_allocations=0):
+        """Count one drawn frame with its work time and new surface allocations"""
+        self.frames += 1
+        self.frame_counts[bisect_left(self.buckets, frame_ms)] += 1
+        self.frame_time_sum += frame_ms
+        self.surface_allocations += surface_allocations
+
+    def record_outcome(self, result):
+        """Count a check_collision result that ended or changed the run"""
+        self.outcomes[result] = self.outcomes.get(result, 0) + 1
+
+    def record_restart(self):
+        """Count a game restart"""
+        self.restarts += 1
+
+    def record_quality(self, status, decision=None):
+        """Take the quality governor's status after a frame, counting its decision if it made one"""
+        self.quality = status
+        if decision is not None:
+            key = (decision["action"], decision["effect"])
+            self.quality_changes[key] = self.quality_changes.get(key, 0) + 1
+
+    def poll(self, now):
+        """Refresh the gauges and write a line once flush_interval ms have passed since the last"""
+        self._last_poll = now
+        if self._next_flush is None:
+            self._start_window(now)
+            return
+        if now < self._next_flush:
+            return
+        self.flush(now)
+
+    def flush(self, now):
+        """Refresh the gauges from the window ending at now (ms) and append a JSON line"""
+        if self._window_start is not None:
+            seconds = max(0.001, (now - self._window_start) / 1000)
+            self.tick_rate = (self.ticks - self._window_ticks) / seconds
+            self.frame_rate = (self.frames - self._window_frames) / seconds
+            frames = self.frames - self._window_frames
+            if frames:
+                self.surface_allocations_per_frame = (self.surface_allocations - self._window_allocations) / frames
+        self.rss = read_rss()
+        self._start_window(now)
+
+        if self._file is not None:
+            try:
+                self._file.write(json.dumps(self.snapshot()) + "\n")
+                self._file.flush()
+            except (OSError, ValueError) as e:
+                print(f"Debug: Could not write metrics to {self.path}: {e}")
+
+    def _start_window(self, now):
+        """Begin a new rate window at now (ms)"""
+        self._window_start = now
+        self._window_ticks = self.ticks
+        self._window_frames = self.frames
+        self._window_allocations = self.surface_allocations
+        self._next_flush = now + self.flush_interval
+
+    def snapshot(self):
+        """Return every counter and gauge as a JSON-ready dict"""
+        buckets = {str(bound): count for bound, count in zip(self.buckets, self.frame_counts)}
+        buckets["+Inf"] = self.frame_counts[-1]
+        return {
+            "time": round(time.time(), 3),
+            "uptime_s": round(time.time() - self.started, 1),
+            "ticks": self.ticks,
+            "tick_rate": round(self.tick_rate, 2),
+            "frames": self.frames,
+            "frame_rate": round(self.frame_rate, 2),
+            "frame_time_ms": {"buckets": buckets, "sum": round(self.frame_time_sum, 1), "count": self.frames},
+            "outcomes": dict(self.outcomes),
+            "restarts": self.restarts,
+            "surface_allocations": self.surface_allocations,
+            "surface_allocations_per_frame": round(self.surface_allocations_per_frame, 3),
+            "rss_bytes": self.rss,
+            "quality": self.quality,
+            "quality_changes": {f"{action} {effect}": count
+                                for (action, effect), count in sorted(dict(self.quality_changes).items())},
+        }
+
+    def prometheus(self):
+        """Return the counters in the Prometheus text exposition format"""
+        p = METRIC_PREFIX
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} {kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{p}_{name}{suffix}{labels} {value}")
+
+        metric("ticks_total", "counter", "Simulation ticks run", [("", "", self.ticks)])
+        metric("tick_rate", "gauge", "Simulation ticks per second over the last flush interval",
+               [("", "", round(self.tick_rate, 2))])
+        metric("frame_rate", "gauge", "Frames per second over the last flush interval",
+               [("", "", round(self.frame_rate, 2))])
+
+        samples = []
+        total = 0
+        counts = list(self.frame_counts)  # Copy; the main thread keeps counting
+        for bound, count in zip(self.buckets, counts):
+            total += count
+            samples.append(("_bucket", f'{{le="{bound}"}}', total))
+        total += counts[-1]
+        samples.append(("_bucket", '{le="+Inf"}', total))
+        samples.append(("_sum", "", round(self.frame_time_sum, 1)))
+        samples.append(("_count", "", total))
+        metric("frame_time_ms", "histogram", "Frame work time in milliseconds, excluding the frame cap wait", samples)
+
+        metric("outcomes_total", "counter", "Runs ended or changed by a collision check result",
+               [("", f'{{result="{result}"}}', count) for result, count in sorted(dict(self.outcomes).items())])
+        metric("restarts_total", "counter", "Game restarts", [("", "", self.restarts)])
+        metric("surface_allocations_total", "counter", "Transient surfaces allocated by the surface pool",
+               [("", "", self.surface_allocations)])
+        metric("surface_allocations_per_frame", "gauge", "Average surface allocations per frame over the last flush interval",
+               [("", "", round(self.surface_allocations_per_frame, 3))])
+        if self.rss is not None:
+            metric("rss_bytes", "gauge", "Resident set size in bytes", [("", "", self.rss)])
+        quality = self.quality
+        if quality is not None:
+            metric("quality_level", "gauge", "Number of effects the quality governor has turned down",
+                   [("", "", quality["level"])])
+            metric("quality_average_ms", "gauge", "Average frame time of the quality governor's last sample window",
+                   [("", "", quality["average_ms"])])
+            metric("quality_changes_total", "counter", "Effects turned down or restored by the quality governor",
+                   [("", f'{{action="{action}",effect="{effect}"}}', count)
+                    for (action, effect), count in sorted(dict(self.quality_changes).items())])
+        return "\n".join(lines) + "\n"
+
+    def _start_server(self, address):
+        """Serve /metrics on address from a daemon thread"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes would flood stdout
+
+        try:
+            self._server = ThreadingHTTPServer(address, Handler)
+        except OSError as e:
+            print(f"Debug: Metrics endpoint disabled, could not listen on {address[0]}:{address[1]}: {e}")
+            return
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        host, port = self._server.server_address[:2]
+        print(f"Debug: Metrics endpoint at http://{host}:{port}/metrics")
+
+    def close(self):
+        """Write a final line covering up to the last poll and stop the endpoint"""
+        if self._file is not None:
+            if self._last_poll is not None and self._last_poll > self._window_start:
+                self.flush(self._last_poll)
+            self._file.close()
+            self._file = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,166 @@
+import math
+import struct
+import zlib
+
+from game.features import TARGET_ISLAND, ROCK
+from game.kernels import first_within, length
+
+MAX_FORCE = 100
+MAX_DOCKING_SPEED = 2.0  # Maximum safe speed for docking
+MAX_SAFE_SPEED = 8.0  # Maximum safe speed for general navigation
+
+# Fixed-point physics keeps positions, velocity and momentum as integer
+# multiples of 1/2**FIXED_BITS px. Floats hold such values exactly (up to
+# 2**29 px), so the state stays in the usual float attributes.
+FIXED_BITS = 24
+FIXED_SCALE = 1 << FIXED_BITS
+_FIXED_HALF = FIXED_SCALE >> 1
+
+# Boat state as hashed by state_checksum()
+_CHECKSUM_STATE = struct.Struct("<6d")
+
+_DAMPING_FAST = round(0.90 * FIXED_SCALE)
+_DAMPING_SLOW = round(0.98 * FIXED_SCALE)
+_FAST_SPEED_SQUARED = (5 * FIXED_SCALE) ** 2
+
+
+class BoatState:
+    """Physics state of a boat, without any rendering attached"""
+
+    __slots__ = ("x", "y", "heading", "velocity", "momentum",
+                 "left_force", "right_force", "forward_force", "backward_force")
+
+    def __init__(self, x=0.0, y=0.0, heading=0):
+        """Initialize a resting boat at the given position"""
+        self.x = x
+        self.y = y
+        self.heading = heading
+        self.velocity = [0, 0]
+        self.momentum = [0, 0]
+        self.left_force = 0
+        self.right_force = 0
+        self.forward_force = 0
+        self.backward_force = 0
+
+
+def step_boat(boat, current_vector, boat_speed, fixed_point=False):
+    """Advance a boat by one tick and return its speed before the step
+
+    Works on any object with the BoatState attributes (including Boat).
+    With fixed_point the step runs in integer arithmetic instead.
+    """
+    if fixed_point:
+        return _step_boat_fixed(boat, current_vector, boat_speed)
+    
+    # Calculate directional forces with smoother transitions
+    horizontal_force = (boat.left_force - boat.right_force) / MAX_FORCE
+    vertical_force = (boat.backward_force - boat.forward_force) / MAX_FORCE
+
+    # Calculate movement vectors with improved precision
+    movement_x = horizontal_force * boat_speed
+    movement_y = vertical_force * boat_speed
+
+    # Calculate current velocity magnitude
+    velocity = boat.velocity
+    current_speed = length(velocity[0], velocity[1])
+
+    # Apply appropriate damping based on speed
+    if current_speed > 5.0:
+        damping = 0.90
+    else:
+        damping = 0.98
+
+    # Update momentum with movement forces and dynamic damping
+    momentum = boat.momentum
+    momentum[0] = (momentum[0] + movement_x) * damping
+    momentum[1] = (momentum[1] + movement_y) * damping
+
+    # Add current influence
+    velocity[0] = momentum[0] + current_vector[0]
+    velocity[1] = momentum[1] + current_vector[1]
+
+    # Update position
+    boat.x += velocity[0]
+    boat.y += velocity[1]
+    return current_speed
+
+
+def _step_boat_fixed(boat, current_vector, boat_speed):
+    """step_boat() in fixed-point integers
+
+    Same formula as the float step. Products are rounded half up (with
+    floor division, so negative values round the same way everywhere),
+    the speed threshold is compared squared, and the state written back
+    is exact, so every machine computes bit-identical results. The speed
+    and current are rounded onto the grid first, which also absorbs
+    last-bit differences in how they were computed.
+    """
+    scale = FIXED_SCALE
+    speed = round(boat_speed * scale)
+    movement_x = ((int(boat.left_force) - int(boat.right_force)) * speed * 2 + MAX_FORCE) // (2 * MAX_FORCE)
+    movement_y = ((int(boat.backward_force) - int(boat.forward_force)) * speed * 2 + MAX_FORCE) // (2 * MAX_FORCE)
+
+    velocity = boat.velocity
+    velocity_x = round(velocity[0] * scale)
+    velocity_y = round(velocity[1] * scale)
+    speed_squared = velocity_x * velocity_x + velocity_y * velocity_y
+    damping = _DAMPING_FAST if speed_squared > _FAST_SPEED_SQUARED else _DAMPING_SLOW
+
+    momentum = boat.momentum
+    momentum_x = ((round(momentum[0] * scale) + movement_x) * damping + _FIXED_HALF) >> FIXED_BITS
+    momentum_y = ((round(momentum[1] * scale) + movement_y) * damping + _FIXED_HALF) >> FIXED_BITS
+    velocity_x = momentum_x + round(current_vector[0] * scale)
+    velocity_y = momentum_y + round(current_vector[1] * scale)
+
+    momentum[0] = momentum_x / scale
+    momentum[1] = momentum_y / scale
+    velocity[0] = velocity_x / scale
+    velocity[1] = velocity_y / scale
+    boat.x = (round(boat.x * scale) + velocity_x) / scale
+    boat.y = (round(boat.y * scale) + velocity_y) / scale
+    return math.sqrt(speed_squared) / scale
+
+
+def state_checksum(boat):
+    """Return a CRC32 of the boat's position, velocity and momentum
+
+    Matching checksums mean bit-identical state. Only fixed-point state is
+    guaranteed to match across machines.
+    """
+    return zlib.crc32(_CHECKSUM_STATE.pack(boat.x, boat.y, *boat.velocity, *boat.momentum))
+
+
+def check_collision(x, y, velocity, boat_radius, features):
+    """Check a boat against the features and return the collision result"""
+    # Calculate current velocity magnitude
+    current_speed = length(velocity[0], velocity[1])
+
+    # Check for excessive speed first
+    if current_speed > MAX_SAFE_SPEED:
+        return "crash_speed_general"  # New result for general high-speed crash
+
+    # First feature whose circle (grown by the boat radius) contains the boat
+    if hasattr(features, "columns"):
+        kinds, xs, ys, sizes, _ = features.columns()
+        index = first_within(x, y, xs, ys, sizes, boat_radius)
+        kind = kinds[index] if index >= 0 else None
+    else:
+        kind = None
+        for island in features:
+            if length(x - island.x, y - island.y) < island.size + boat_radius:
+                kind = island.kind
+                break
+    if kind is None:
+        return "no_collision"
+
+    # Always check speed first when colliding with any island
+    if current_speed > MAX_DOCKING_SPEED:
+        return "crash_speed_dock"  # High-speed collision with any island
+
+    # Only then check island type
+    if kind == TARGET_ISLAND:
+        return "dock_success"
+    elif kind == ROCK:
+        return "collision"
+    else:
+        return "dock_fail"
@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+import random
+import sys
+
+from config.settings import Settings
+from game.physics import MAX_FORCE, BoatState, state_checksum, step_boat
+from game.wave import WaveGenerator
+from net import protocol
+from net.prediction import PredictedBoat
+
+
+def random_inputs(seed, ticks):
+    """Yield (left, right, forward, backward) forces, each held for a random number of ticks"""
+    rng = random.Random(seed)
+    forces = (0, 0, 0, 0)
+    next_change = 0
+    for tick in range(ticks):
+        if tick >= next_change:
+            forces = tuple(rng.choice((0, 0, MAX_FORCE)) for _ in range(4))
+            next_change = tick + rng.randint(1, 120)
+        yield forces
+
+
+def _apply(boat, forces):
+    """Set a boat's input forces"""
+    boat.left_force, boat.right_force, boat.forward_force, boat.backward_force = forces
+
+
+def compare_modes(seed, ticks, current_vector, boat_speed):
+    """Step a float and a fixed-point boat with the same inputs; return the largest (position, velocity) gap"""
+    float_boat = BoatState()
+    fixed_boat = BoatState()
+    max_position = 0.0
+    max_velocity = 0.0
+    for forces in random_inputs(seed, ticks):
+        _apply(float_boat, forces)
+        _apply(fixed_boat, forces)
+        step_boat(float_boat, current_vector, boat_speed)
+        step_boat(fixed_boat, current_vector, boat_speed, fixed_point=True)
+        max_position = max(max_position, abs(float_boat.x - fixed_boat.x), abs(float_boat.y - fixed_boat.y))
+        max_velocity = max(max_velocity, abs(float_boat.velocity[0] - fixed_boat.velocity[0]),
+                           abs(float_boat.velocity[1] - fixed_boat.velocity[1]))
+    return max_position, max_velocity
+
+
+def _round_trip(msg_type, payload):
+    """Frame a message and read it back through protocol.read_message()"""
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(protocol.frame(msg_type, payload))
+        reader.feed_eof()
+        return await protocol.read_message(reader)
+    return asyncio.run(read())
+
+
+def check_protocol(seed, ticks, current_vector, boat_speed):
+    """Return a list of failures of HELLO and OWN_CHECKSUM sent through the protocol"""
+    failures = []
+    for fixed_point in (False, True):
+        hello = (7, seed & 0xFFFFFFFF, 20, fixed_point, 123.25, -45.5)
+        msg_type, payload = _round_trip(protocol.MSG_HELLO, protocol.HELLO.pack(*hello))
+        if msg_type != protocol.MSG_HELLO or protocol.HELLO.unpack(payload) != hello:
+            failures.append(f"HELLO with fixed-point {fixed_point} did not round-trip")
+
+    # Server and client step their own copies; every checksum the server sends has to verify
+    server_boat = BoatState()
+    client_boat = BoatState()
+    prediction = PredictedBoat(boat_speed, buffer_size=ticks, fixed_point=True)
+    for seq, forces in enumerate(random_inputs(seed, ticks), 1):
+        _apply(server_boat, forces)
+        _apply(client_boat, forces)
+        step_boat(server_boat, current_vector, boat_speed, fixed_point=True)
+        step_boat(client_boat, current_vector, boat_speed, fixed_point=True)
+        prediction.record(seq, client_boat)
+        msg_type, payload = _round_trip(protocol.MSG_OWN_CHECKSUM,
+                                        protocol.OWN_CHECKSUM.pack(seq, state_checksum(server_boat)))
+        if msg_type != protocol.MSG_OWN_CHECKSUM or not prediction.verify(*protocol.OWN_CHECKSUM.unpack(payload)):
+            failures.append(f"OWN_CHECKSUM desync at input {seq}")
+            break
+
+    # A client that is off by the smallest fixed-point step has to be caught
+    seq = ticks + 1
+    step_boat(server_boat, current_vector, boat_speed, fixed_point=True)
+    step_boat(client_boat, current_vector, boat_speed, fixed_point=True)
+    client_boat.x += 1 / (1 << 24)
+    prediction.record(seq, client_boat)
+    _, payload = _round_trip(protocol.MSG_OWN_CHECKSUM, protocol.OWN_CHECKSUM.pack(seq, state_checksum(server_boat)))
+    if prediction.verify(*protocol.OWN_CHECKSUM.unpack(payload)):
+        failures.append("OWN_CHECKSUM missed a one-step client error")
+    return failures
+
+
+def main():
+    """Check fixed-point physics against the float path and through the protocol"""
+    parser = argparse.ArgumentParser(description="Island Navigator fixed-point physics check")
+    parser.add_argument("--seeds", type=int, default=3, help="Number of random input sequences")
+    parser.add_argument("--ticks", type=int, default=20000, help="Ticks per input sequence")
+    parser.add_argument("--max-position", type=float, default=0.01, help="Largest allowed position gap (px)")
+    parser.add_argument("--max-velocity", type=float, default=1e-5, help="Largest allowed velocity gap (px/tick)")
+    args = parser.parse_args()
+
+    settings = Settings()
+    current_vector = WaveGenerator(settings).get_current_vector()
+    failures = []
+    for seed in range(args.seeds):
+        position, velocity = compare_modes(seed, args.ticks, current_vector, settings.BOAT_SPEED)
+        print(f"Seed {seed}: max position gap {position:.6f} px, max velocity gap {velocity:.2e} px/tick")
+        if position > args.max_position:
+            failures.append(f"Seed {seed}: position gap {position:.6f} px is over {args.max_position} px")
+        if velocity > args.max_velocity:
+            failures.append(f"Seed {seed}: velocity gap {velocity:.2e} px/tick is over {args.max_velocity} px/tick")
+        failures.extend(f"Seed {seed}: {failure}"
+                        for failure in check_protocol(seed, min(args.ticks, 2000), current_vector, settings.BOAT_SPEED))
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,17 @@
 import pygame
+from config.controls import Controls
 
 class Player:
     """Handles player input and controls"""
     
-    def __init__(self, boat):
+    def __init__(self, boat, controls=None):
         """Initialize the player controller"""
         self.boat = boat
+        self.bind_controls(controls or Controls())
+        
+    def bind_controls(self, controls):
+        """Precompute the keys handled here instead of by the boat"""
+        self._restart_keys = frozenset(controls.keys_for("restart"))
         
     def handle_event(self, event):
         """Handle keyboard/mouse events for player control"""
@@ -16,20 +22,10 @@ class Player:
             
     def _handle_keydown(self, event):
         """Handle key press events"""
-        if event.key == pygame.K_LEFT:  # Left force
-            self.boat.handle_keydown(event.key)
-        elif event.key == pygame.K_RIGHT:  # Right force
-            self.boat.handle_keydown(event.key)
-        elif event.key == pygame.K_UP:  # Forward force
-            self.boat.handle_keydown(event.key)
-        elif event.key == pygame.K_DOWN:  # Backward force
-            self.boat.handle_keydown(event.key)
-        elif event.key == pygame.K_q:  # Rotate left
-            self.boat.handle_keydown(event.key)
-        elif event.key == pygame.K_e:  # Rotate right
-            self.boat.handle_keydown(event.key)
-        elif event.key == pygame.K_r:  # Restart game
+        if event.key in self._restart_keys:  # Restart game
             return "restart"
+        # Steering keys are dispatched by the boat's own binding table
+        self.boat.handle_keydown(event)
             
     def _handle_mouse_click(self, event):
         """Handle mouse/touch input"""
@@ -39,4 +35,4 @@ class Player:
     
     def update(self):
         """Update player state (called each frame)"""
-        pass  # No continuous updates needed
\ No newline at end of file
+        pass  # No continuous updates needed
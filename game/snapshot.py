@@ -0,0 +1,157 @@
+"""
+World snapshots for Island Navigator
+
+Snapshots are stored in a small versioned little-endian binary format:
+
+    header    magic "INAV", format version, feature count
+    state     game state, world/target/checkpoint positions
+    boat      position, heading, velocity, momentum, forces, docked flag
+    current   magnitude and direction
+    world     seed and index of the world in its seed's sequence, so new
+              worlds continue from it after loading (version 1 stored the
+              generator's Mersenne Twister state here instead; it is skipped)
+    features  fixed-size (kind, x, y, size, heading) records
+
+Files are read through mmap so large pre-generated worlds are decoded
+straight from the page cache without an intermediate copy.
+"""
+
+import mmap
+import os
+import struct
+
+from game.features import FeatureStore
+
+MAGIC = b"INAV"
+FORMAT_VERSION = 2
+
+GAME_STATES = ("instructions", "playing", "win", "fail")
+
+_HEADER = struct.Struct("<4sHI")
+_STATE = struct.Struct("<B6d")
+_BOAT = struct.Struct("<8d4dB")
+_CURRENT = struct.Struct("<2d")
+_WORLD = struct.Struct("<?qI")
+_RNG_HEAD = struct.Struct("<BH")  # Version 1 only
+_RNG_TAIL = struct.Struct("<Bd")
+_FEATURE = struct.Struct("<B4d")
+
+
+class WorldSnapshot:
+    """Plain container for everything needed to resume a game"""
+
+    def __init__(self):
+        """Initialize an empty snapshot"""
+        self.game_state = "playing"
+        self.world_pos = [0.0, 0.0]
+        self.target_pos = [0.0, 0.0]
+        self.checkpoint_pos = [0.0, 0.0]
+        self.boat = {}
+        self.current_magnitude = 0.0
+        self.current_direction = 0.0
+        self.world_seed = None  # None when the world isn't part of a seed's sequence
+        self.world_index = 0
+        self.features = FeatureStore()
+
+
+def save_snapshot(path, snapshot):
+    """Write a snapshot to disk atomically"""
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    boat = snapshot.boat
+    parts = [
+        _HEADER.pack(MAGIC, FORMAT_VERSION, len(snapshot.features)),
+        _STATE.pack(GAME_STATES.index(snapshot.game_state),
+                    *snapshot.world_pos, *snapshot.target_pos, *snapshot.checkpoint_pos),
+        _BOAT.pack(boat["x"], boat["y"], boat["heading"],
+                   *boat["velocity"], *boat["momentum"], boat["angular_velocity"],
+                   boat["left_force"], boat["right_force"],
+                   boat["forward_force"], boat["backward_force"],
+                   boat["is_docked"]),
+        _CURRENT.pack(snapshot.current_magnitude, snapshot.current_direction),
+    ]
+
+    has_world = snapshot.world_seed is not None
+    parts.append(_WORLD.pack(has_world, snapshot.world_seed if has_world else 0, snapshot.world_index))
+
+    for feature in snapshot.features:
+        parts.append(_FEATURE.pack(feature.kind, feature.x, feature.y, feature.size, feature.heading))
+
+    # Write to a temporary file first so a crash never leaves a torn snapshot
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(b"".join(parts))
+    os.replace(temp_path, path)
+
+
+def load_snapshot(path):
+    """Read a snapshot from disk, raising ValueError on bad files"""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            try:
+                return _decode(data)
+            except struct.error as e:
+                raise ValueError(f"Corrupt snapshot: {e}")
+
+
+def _decode(data):
+    """Decode a snapshot from a buffer"""
+    if len(data) < _HEADER.size:
+        raise ValueError("Snapshot file is truncated")
+    magic, version, feature_count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not an Island Navigator snapshot")
+    if version not in (1, FORMAT_VERSION):
+        raise ValueError(f"Unsupported snapshot version {version}")
+    offset = _HEADER.size
+
+    snapshot = WorldSnapshot()
+    state = _STATE.unpack_from(data, offset)
+    offset += _STATE.size
+    if state[0] >= len(GAME_STATES):
+        raise ValueError(f"Corrupt snapshot: unknown game state {state[0]}")
+    snapshot.game_state = GAME_STATES[state[0]]
+    snapshot.world_pos = [state[1], state[2]]
+    snapshot.target_pos = [state[3], state[4]]
+    snapshot.checkpoint_pos = [state[5], state[6]]
+
+    boat = _BOAT.unpack_from(data, offset)
+    offset += _BOAT.size
+    snapshot.boat = {
+        "x": boat[0],
+        "y": boat[1],
+        "heading": boat[2],
+        "velocity": [boat[3], boat[4]],
+        "momentum": [boat[5], boat[6]],
+        "angular_velocity": boat[7],
+        "left_force": boat[8],
+        "right_force": boat[9],
+        "forward_force": boat[10],
+        "backward_force": boat[11],
+        "is_docked": bool(boat[12]),
+    }
+
+    snapshot.current_magnitude, snapshot.current_direction = _CURRENT.unpack_from(data, offset)
+    offset += _CURRENT.size
+
+    if version == 1:
+        # Skip the generator state; the loaded world then starts no sequence
+        _, count = _RNG_HEAD.unpack_from(data, offset)
+        offset += _RNG_HEAD.size + 4 * count + _RNG_TAIL.size
+    else:
+        has_world, world_seed, snapshot.world_index = _WORLD.unpack_from(data, offset)
+        offset += _WORLD.size
+        if has_world:
+            snapshot.world_seed = world_seed
+
+    end = offset + feature_count * _FEATURE.size
+    if end > len(data):
+        raise ValueError("Snapshot file is truncated")
+    features = snapshot.features
+    # Release the views explicitly so the mmap can be closed afterwards
+    with memoryview(data) as view, view[offset:end] as records:
+        for kind, x, y, size, heading in _FEATURE.iter_unpack(records):
+            features.add(kind, x, y, size, heading)
+    return snapshot
@@ -0,0 +1,314 @@
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+
+import pygame
+
+from config.settings import Settings, SettingsError, load_profile
+from game.errors import ErrorLimitExceeded
+from game.input import InputReplay
+from game.metrics import read_rss
+
+# Actions the driver steers with; quit, save and load are never pressed
+STEERING_ACTIONS = ("force_left", "force_right", "force_forward", "force_backward",
+                    "rotate_left", "rotate_right")
+
+
+def _percentile(values, fraction):
+    """Return the value below which the given fraction of values fall"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class SoakDriver:
+    """Plays GameEngine headless through complete sessions with synthetic input
+
+    Each session goes instructions -> undock -> steering -> win, fail or
+    timeout -> restart. Steering is random, or replays the steering part of
+    an input recording from the undock tick on.
+    """
+
+    def __init__(self, game, seed=None, script=None, session_ticks=3600, draw_interval=1, window_frames=1000):
+        """Initialize the driver for an already created engine"""
+        self.game = game
+        self.rng = random.Random(seed)
+        self.session_ticks = session_ticks  # Sessions still running after this many ticks are restarted
+        self.draw_interval = draw_interval  # Ticks per drawn frame (0 never draws)
+        self.window_frames = window_frames  # Frames averaged per drift window
+
+        self.script = None
+        if script:
+            self.script = self._load_script(script)
+
+        # Results
+        self.sessions = 0
+        self.outcomes = {}  # "win" / "fail" / "timeout" -> count
+        self.ticks = 0
+        self.frames = 0
+        self.windows = []  # (mean ms, p95 ms) per window of drawn frames
+        self.started = None
+        self.rss_start = None
+        self.aborted = None  # Message of the ErrorLimitExceeded that stopped the run
+
+        self._frame_times = []
+        self._session_tick = 0
+        self._undock_tick = None
+        self._held = set()
+        self._next_steer = 0
+        self._pending_script = None
+
+    def _load_script(self, path):
+        """Return the steering events of a recording as (ticks after undock, pygame event)"""
+        replay = InputReplay(path)
+        steering = set()
+        for action in STEERING_ACTIONS:
+            steering.update(self.game.controls.keys_for(action))
+        events = []
+        start = None
+        for record in replay.records():
+            if record["key"] is not None and record["key"] not in steering:
+                continue  # Lifecycle keys are pressed by the driver
+            if start is None:
+                start = record["tick"]
+            attributes = {name: record[name] for name in ("key", "button") if record[name] is not None}
+            if record["pos"]:
+                attributes["pos"] = tuple(record["pos"])
+            events.append((record["tick"] - start, pygame.event.Event(record["type"], attributes)))
+        print(f"Debug: Soak script {path}: {len(events)} steering events")
+        return events
+
+    def _key_event(self, action, down=True):
+        """Return a key event for the first key bound to action"""
+        keys = self.game.controls.keys_for(action)
+        if not keys:
+            raise ValueError(f"No key is bound to '{action}'")
+        return pygame.event.Event(pygame.KEYDOWN if down else pygame.KEYUP, key=keys[0])
+
+    def _events_for_tick(self):
+        """Return the input the driver applies this tick"""
+        game = self.game
+        state = game.game_state
+        if state == "instructions":
+            return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)]
+        if state != "playing":
+            return []
+        if game.show_current_notification:
+            return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)]
+        if game.is_docked:
+            return [self._key_event("force_forward")]
+
+        if self._undock_tick is None:
+            self._undock_tick = self._session_tick
+            self._pending_script = list(reversed(self.script)) if self.script is not None else None
+        if self._pending_script is not None:
+            return self._scripted_steering()
+        return self._random_steering()
+
+    def _scripted_steering(self):
+        """Return the recorded steering events due this tick"""
+        elapsed = self._session_tick - self._undock_tick
+        pending = self._pending_script
+        events = []
+        while pending and pending[-1][0] <= elapsed:
+            events.append(pending.pop()[1])
+        return events
+
+    def _random_steering(self):
+        """Hold a random set of steering keys for a random number of ticks"""
+        if self._session_tick < self._next_steer:
+            return []
+        events = [self._key_event(action, down=False) for action in self._held]
+        # Mostly forward, with some turning, so sessions actually travel
+        count = self.rng.choice((0, 1, 1, 2, 2))
+        choices = ("force_forward",) * 3 + STEERING_ACTIONS
+        self._held = {self.rng.choice(choices) for _ in range(count)}
+        events.extend(self._key_event(action) for action in self._held)
+        self._next_steer = self._session_tick + self.rng.randint(10, 90)
+        return events
+
+    def _end_session(self, outcome):
+        """Record the outcome and restart through the normal paths"""
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        self.sessions += 1
+        if self.sessions == 1:
+            # Measure memory growth from the end of the first session, once caches are warm
+            self.rss_start = read_rss()
+        self._held = set()
+        self._next_steer = 0
+        self._undock_tick = None
+        self._pending_script = None
+        self._session_tick = 0
+        if outcome == "timeout":
+            self.game.initiate_restart()
+        else:
+            self.game.step([self._key_event("restart")])
+            self.ticks += 1
+
+    def run_tick(self):
+        """Apply one tick of input, advance the game and draw when due"""
+        game = self.game
+        started = time.perf_counter()
+        game.step(self._events_for_tick())
+        self.ticks += 1
+        self._session_tick += 1
+        drawn = self.draw_interval and self.ticks % self.draw_interval == 0
+        if drawn:
+            game.draw()
+        frame_ms = (time.perf_counter() - started) * 1000
+        if drawn:
+            game.end_frame(frame_ms)
+            self.frames += 1
+            if self.sessions:  # Frame times of the first, cold session are left out
+                self._frame_times.append(frame_ms)
+            if len(self._frame_times) >= self.window_frames:
+                self.windows.append((sum(self._frame_times) / len(self._frame_times),
+                                     _percentile(self._frame_times, 0.95)))
+                self._frame_times = []
+
+        if game.game_state in ("win", "fail"):
+            self._end_session(game.game_state)
+        elif self._session_tick >= self.session_ticks:
+            self._end_session("timeout")
+
+    def run(self, sessions=None, seconds=None, progress_interval=30, out=None):
+        """Play until the session count or time limit is reached; return the report"""
+        out = out or sys.stdout
+        self.started = time.perf_counter()
+        next_progress = self.started + progress_interval
+        while True:
+            try:
+                self.run_tick()
+            except ErrorLimitExceeded as e:
+                self.aborted = str(e)
+                break
+            now = time.perf_counter()
+            if sessions is not None and self.sessions >= sessions:
+                break
+            if seconds is not None and now - self.started >= seconds:
+                break
+            if now >= next_progress:
+                next_progress = now + progress_interval
+                print(self.progress_line(), file=out, flush=True)
+        return self.report()
+
+    def frame_drift(self):
+        """Return the change in mean frame time from the first quarter of windows to the last, in percent
+
+        Single windows swing with what was on screen; a quarter of a long
+        run averages that out.
+        """
+        if len(self.windows) < 2:
+            return 0.0
+        count = max(1, len(self.windows) // 4)
+        first = sum(mean for mean, _ in self.windows[:count]) / count
+        last = sum(mean for mean, _ in self.windows[-count:]) / count
+        return (last - first) / first * 100
+
+    def progress_line(self):
+        """Return a one-line status"""
+        elapsed = time.perf_counter() - self.started
+        rss = read_rss()
+        window = f"{self.windows[-1][0]:.2f} ms" if self.windows else "-"
+        return (f"Soak {elapsed:.0f}s: {self.sessions} sessions {self.outcomes}, "
+                f"{self.ticks / elapsed:.0f} ticks/s, frame {window} (drift {self.frame_drift():+.1f}%), "
+                f"RSS {rss / 1048576 if rss else 0:.1f} MiB, "
+                f"{self.game.errors.total} exceptions")
+
+    def report(self):
+        """Return the results as a JSON-ready dict"""
+        elapsed = time.perf_counter() - self.started
+        rss = read_rss()
+        game = self.game
+        report = {
+            "seconds": round(elapsed, 1),
+            "sessions": self.sessions,
+            "sessions_per_hour": round(self.sessions / elapsed * 3600, 1),
+            "outcomes": dict(self.outcomes),
+            "ticks": self.ticks,
+            "ticks_per_second": round(self.ticks / elapsed, 1),
+            "frames": self.frames,
+            "frame_windows": [(round(mean, 3), round(p95, 3)) for mean, p95 in self.windows],
+            "frame_drift_percent": round(self.frame_drift(), 1),
+            "rss_start_bytes": self.rss_start,
+            "rss_end_bytes": rss,
+            "rss_growth_bytes": rss - self.rss_start if rss is not None and self.rss_start is not None else None,
+            "exceptions": {f"{where}: {name}": count
+                           for (where, name), count in sorted(game.errors.counts().items())},
+            "safe_mode": game.errors.safe_mode,
+            "aborted": self.aborted,
+        }
+        if game.memory_profiler is not None:
+            report["suspected_leaks"] = game.memory_profiler.suspected_leaks
+        return report
+
+
+def main():
+    """Run a soak test from the command line"""
+    parser = argparse.ArgumentParser(description="Island Navigator soak test")
+    parser.add_argument("--profile", help="Settings profile (.toml or .json)")
+    parser.add_argument("--sessions", type=int, default=None, help="Stop after this many sessions")
+    parser.add_argument("--hours", type=float, default=None, help="Stop after this many hours")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for worlds and random steering")
+    parser.add_argument("--script", help="Replay the steering in this input recording instead of random steering")
+    parser.add_argument("--session-ticks", type=int, default=3600, help="Restart sessions still running after this")
+    parser.add_argument("--draw-interval", type=int, default=1, help="Ticks per drawn frame (0 never draws)")
+    parser.add_argument("--window-frames", type=int, default=1000, help="Frames per frame time drift window")
+    parser.add_argument("--progress", type=float, default=30, help="Seconds between progress lines")
+    parser.add_argument("--report", help="Write the final report here as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Keep the engine's debug output")
+    args = parser.parse_args()
+    if args.sessions is None and args.hours is None:
+        args.sessions = 100
+
+    try:
+        settings = load_profile(args.profile) if args.profile else Settings()
+        # Keep soak runs out of the player's leaderboard and ghosts
+        settings = settings.replace(LEADERBOARD_FILE=":memory:", GHOST_RECORD=False)
+        if args.seed is not None:
+            settings = settings.replace(WORLD_SEED=args.seed)
+    except (OSError, SettingsError) as e:
+        sys.exit(f"Error: {e}")
+
+    # Headless unless a display driver was chosen explicitly
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.font.init()
+    pygame.time.Clock().tick()  # Starts the SDL timer behind pygame.time.get_ticks()
+
+    from game.engine import GameEngine
+
+    out = sys.stdout
+    with contextlib.ExitStack() as stack:
+        if not args.verbose:
+            # Swallowed exceptions are still counted in the report
+            sink = stack.enter_context(open(os.devnull, "w"))
+            stack.enter_context(contextlib.redirect_stdout(sink))
+            stack.enter_context(contextlib.redirect_stderr(sink))
+        game = GameEngine(settings)
+        game.finish_startup()
+        driver = SoakDriver(game, args.seed, args.script, args.session_ticks, args.draw_interval,
+                            args.window_frames)
+        seconds = args.hours * 3600 if args.hours is not None else None
+        try:
+            report = driver.run(args.sessions, seconds, args.progress, out)
+        finally:
+            game.shutdown()
+
+    for key, value in report.items():
+        if key != "frame_windows":
+            print(f"{key}: {value}", file=out)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+    # Non-zero exit when the run wasn't clean, for use as a rollout gate
+    if report["exceptions"] or report["aborted"] or report.get("suspected_leaks"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
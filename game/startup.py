@@ -0,0 +1,26 @@
+import time
+
+
+class StartupTimer:
+    """Records how long each startup phase took"""
+
+    def __init__(self, started=None):
+        """Start timing, optionally from an earlier perf_counter() reading"""
+        self.started = started if started is not None else time.perf_counter()
+        self._last = self.started
+        self.phases = []  # (name, ms) in order
+
+    def mark(self, name):
+        """End the current phase and record it under name"""
+        now = time.perf_counter()
+        self.phases.append((name, (now - self._last) * 1000))
+        self._last = now
+
+    def total_ms(self):
+        """Return the time from the start to the last mark in ms"""
+        return (self._last - self.started) * 1000
+
+    def report(self):
+        """Return a one-line breakdown of the recorded phases"""
+        parts = ", ".join(f"{name} {ms:.1f} ms" for name, ms in self.phases)
+        return f"Startup: {parts} (total {self.total_ms():.1f} ms)"
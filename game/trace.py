@@ -0,0 +1,160 @@
+"""
+Session traces for Island Navigator
+
+Every run (from the start of a world to its outcome) can be written to a
+trace for offline analysis with game.analytics. Traces use a versioned
+little-endian binary format:
+
+    header    magic "INTR", format version, outcome code, tick count,
+              world seed, world key, FPS, boat radius, target position
+              and radius, rock count
+    rocks     x, y, radius per rock (float32)
+    ticks     boat x, y, velocity, current vector (float32), the four
+              input forces (uint8) and heading (uint16, 1/100 degree)
+
+Ticks are fixed-size records, so a reader can stream them in blocks. The
+outcome and tick count are filled in when the run ends; a trace is
+written under a temporary name and only renamed once it is complete.
+"""
+
+import os
+import struct
+import time
+
+from game.features import ROCK
+
+MAGIC = b"INTR"
+FORMAT_VERSION = 1
+
+# Outcome codes; the collision results of game.physics plus runs ended any other way
+OUTCOMES = ("abandoned", "dock_success", "dock_fail", "collision", "crash_speed_dock", "crash_speed_general")
+
+_HEADER = struct.Struct("<4sHBIqIHffffI")
+_ROCK = struct.Struct("<fff")
+TICK = struct.Struct("<ffffff4BH")
+
+FILE_SUFFIX = ".trace"
+
+# Buffered tick bytes written out at a time
+_FLUSH_BYTES = 64 * 1024
+
+
+class TraceWriter:
+    """Buffers the tick records of one run and writes them to a trace file"""
+
+    def __init__(self, path, seed, world_key, fps, boat_radius, target_pos, target_radius, features):
+        """Initialize a trace for the rocks among features; nothing is written before the first flush"""
+        self.path = path
+        self.ticks = 0
+        rocks = [feature for feature in features if feature.kind == ROCK]
+        self._header = [MAGIC, FORMAT_VERSION, 0, 0, seed, world_key, fps, boat_radius,
+                        target_pos[0], target_pos[1], target_radius, len(rocks)]
+        self._rocks = b"".join(_ROCK.pack(rock.x, rock.y, rock.size) for rock in rocks)
+        self._buffer = bytearray()
+        self._file = None
+
+    def add(self, boat, current_vector):
+        """Record the boat state and input of one tick"""
+        self.ticks += 1
+        velocity = boat.velocity
+        self._buffer += TICK.pack(boat.x, boat.y, velocity[0], velocity[1], current_vector[0], current_vector[1],
+                                  int(boat.left_force), int(boat.right_force),
+                                  int(boat.forward_force), int(boat.backward_force),
+                                  int(boat.heading % 360 * 100))
+        if len(self._buffer) >= _FLUSH_BYTES:
+            self._flush()
+
+    def _flush(self):
+        """Write the buffered ticks, opening the temporary file on first use"""
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            self._file = open(self.path + ".tmp", "wb")
+            self._file.write(_HEADER.pack(*self._header))
+            self._file.write(self._rocks)
+        self._file.write(self._buffer)
+        self._buffer.clear()
+
+    def close(self, outcome):
+        """Finish the trace with the run's outcome; runs without ticks leave no file"""
+        if not self.ticks:
+            return
+        self._flush()
+        self._header[2] = OUTCOMES.index(outcome) if outcome in OUTCOMES else 0
+        self._header[3] = self.ticks
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(*self._header))
+        self._file.close()
+        self._file = None
+        os.replace(self.path + ".tmp", self.path)
+
+    def discard(self):
+        """Drop the trace and its temporary file (after a write failed, for example)"""
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+            os.remove(self.path + ".tmp")
+        except OSError:
+            pass  # Nothing more to do about a failing disk here
+        self._file = None
+
+
+def trace_path(directory, seed):
+    """Return a new trace file path for a run of the given world seed"""
+    return os.path.join(directory, f"{seed}_{time.time_ns()}{FILE_SUFFIX}")
+
+
+class TraceReader:
+    """Reads the header of a trace and streams its ticks"""
+
+    def __init__(self, path):
+        """Open a trace and read its header and rocks, raising ValueError on bad files"""
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            header = self._file.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError("Trace is truncated")
+            (magic, version, outcome, self.ticks, self.seed, self.world_key, self.fps, self.boat_radius,
+             target_x, target_y, self.target_radius, rock_count) = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError("Not an Island Navigator trace")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported trace version {version}")
+            if outcome >= len(OUTCOMES):
+                raise ValueError(f"Unknown outcome code {outcome}")
+            self.outcome = OUTCOMES[outcome]
+            self.target_pos = (target_x, target_y)
+            data = self._file.read(rock_count * _ROCK.size)
+            if len(data) < rock_count * _ROCK.size:
+                raise ValueError("Trace is truncated")
+            self.rocks = list(_ROCK.iter_unpack(data))
+        except ValueError:
+            self._file.close()
+            raise
+
+    def iter_ticks(self, block_ticks=4096):
+        """Yield (x, y, vx, vy, cx, cy, left, right, forward, backward, heading) per tick, read block by block
+
+        heading is in 1/100 degree. Only one block is held in memory at a time.
+        """
+        remaining = self.ticks
+        while remaining:
+            count = min(remaining, block_ticks)
+            data = self._file.read(count * TICK.size)
+            if len(data) < count * TICK.size:
+                raise ValueError("Trace is truncated")
+            remaining -= count
+            yield from TICK.iter_unpack(data)
+
+    def close(self):
+        """Close the file"""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,5 +1,6 @@
 import pygame
-import math
+from game.kernels import sin_deg, cos_deg
+from graphics.text import get_font
 
 class WaveGenerator:
     """Generates wave/current vectors for the game"""
@@ -15,8 +16,14 @@ class WaveGenerator:
     def update_current_vector(self):
         """Update the current vector based on direction and magnitude"""
         # Calculate vector components
-        self.current_vector[0] = math.sin(math.radians(self.current_direction)) * self.current_magnitude
-        self.current_vector[1] = math.cos(math.radians(self.current_direction)) * self.current_magnitude
+        self.current_vector[0] = sin_deg(self.current_direction) * self.current_magnitude
+        self.current_vector[1] = cos_deg(self.current_direction) * self.current_magnitude
+    
+    def reset(self):
+        """Restore the initial current from settings"""
+        self.current_magnitude = self.settings.CURRENT_MAGNITUDE
+        self.current_direction = self.settings.CURRENT_DIRECTION
+        self.update_current_vector()
     
     def update(self):
         """Update the wave generator state"""
@@ -26,6 +33,14 @@ class WaveGenerator:
         """Return the current wave/current vector"""
         return self.current_vector
     
+    def get_magnitude(self):
+        """Return the current's strength"""
+        return self.current_magnitude
+    
+    def get_direction(self):
+        """Return the current's direction in degrees"""
+        return self.current_direction
+    
     def draw_indicator(self, screen, boat_rect):
         """Draw an indicator showing wave direction and magnitude"""
         # Position of the indicator
@@ -37,15 +52,15 @@ class WaveGenerator:
         pygame.draw.circle(screen, self.settings.WHITE, (center_x, center_y), 30, 2)  # Outer circle
         
         # Draw the direction indicator
-        endpoint_x = center_x + math.sin(math.radians(self.current_direction)) * 25
-        endpoint_y = center_y + math.cos(math.radians(self.current_direction)) * 25
+        endpoint_x = center_x + sin_deg(self.current_direction) * 25
+        endpoint_y = center_y + cos_deg(self.current_direction) * 25
         
         # Draw arrow
         pygame.draw.line(screen, self.settings.BLUE, (center_x, center_y), (endpoint_x, endpoint_y), 3)
         pygame.draw.circle(screen, self.settings.BLUE, (int(endpoint_x), int(endpoint_y)), 5)
         
         # Draw magnitude text
-        font = pygame.font.SysFont(None, 24)
+        font = get_font(24)
         mag_text = f"{self.current_magnitude:.1f}"
         text = font.render(mag_text, True, self.settings.WHITE)
         screen.blit(text, (center_x - text.get_width() // 2, center_y + 35))
@@ -0,0 +1,182 @@
+import pygame
+import math
+import random
+import struct
+import zlib
+
+from game.features import FeatureStore, ROCK, ISLAND, TREE, OTHER_BOAT, TARGET_ISLAND
+from graphics.lod import draw_simple
+
+
+class World:
+    """Generated sea features and target island placement"""
+
+    def __init__(self, features, target_pos, island_radius):
+        """Initialize the world from generated features"""
+        self.features = features
+        self.target_pos = target_pos
+
+        # Collision/draw list includes the target island
+        self.all_features = features.copy()
+        self.all_features.add(TARGET_ISLAND, target_pos[0], target_pos[1], island_radius)
+        
+        # Identifies the layout (e.g. to find ghost runs recorded in this world)
+        self.key = self._fingerprint()
+        
+        # Position in its seed's sequence of worlds (set by WorldPregenerator)
+        self.index = None
+        
+        # Static minimap layer, rendered once per world
+        self.minimap = None
+        
+        # Zoomed-out images of the features, keyed by draw scale
+        self._impostors = {}
+    
+    def _fingerprint(self):
+        """Return a CRC32 of every feature's kind, position and size"""
+        key = 0
+        for column in self.all_features.columns()[:4]:
+            key = zlib.crc32(struct.pack(f"<{len(column)}{column.typecode}", *column), key)
+        return key
+    
+    def impostor(self, settings, scale, max_entries=2):
+        """Return (surface, origin) with every feature pre-drawn as a flat shape at scale
+        
+        origin is the pixel of the surface where world (0, 0) lands.
+        """
+        entry = self._impostors.get(scale)
+        if entry is None:
+            if len(self._impostors) >= max_entries:
+                self._impostors.clear()
+            extent = max(max(abs(f.x), abs(f.y)) + f.size for f in self.all_features)
+            half = int(extent * scale) + 2
+            surface = pygame.Surface((half * 2, half * 2), pygame.SRCALPHA)
+            for feature in self.all_features:
+                draw_simple(surface, feature.kind, (half + feature.x * scale, half + feature.y * scale),
+                            feature.size * scale, settings)
+            entry = self._impostors[scale] = (surface, (half, half))
+        return entry
+    
+    def clear_impostors(self):
+        """Drop the cached impostors (e.g. after a settings change)"""
+        self._impostors.clear()
+    
+    def render_minimap(self, settings):
+        """Pre-render the static minimap layer (background, features, border)"""
+        size = settings.MINIMAP_SIZE
+        minimap_surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        minimap_surf.fill((0, 0, 0, settings.MINIMAP_OPACITY))
+        
+        # Calculate scale factor to fit world into minimap
+        scale = settings.MINIMAP_SCALE
+        
+        # Draw world boundary
+        pygame.draw.rect(minimap_surf, (50, 50, 50, 100), (0, 0, size, size), 1)
+        
+        # Draw all features on minimap
+        minimap_center = size // 2
+        for feature in self.all_features:
+            # Convert world coordinates to minimap coordinates
+            mini_x = minimap_center + feature.x * scale
+            mini_y = minimap_center + feature.y * scale
+            
+            # Only draw if within minimap bounds
+            if 0 <= mini_x <= size and 0 <= mini_y <= size:
+                kind = feature.kind
+                if kind == TARGET_ISLAND:
+                    # Draw target island (larger, gold)
+                    pygame.draw.circle(minimap_surf, settings.MINIMAP_TARGET_COLOR,
+                                       (int(mini_x), int(mini_y)), 4)
+                elif kind == ISLAND:
+                    # Draw regular island (green)
+                    pygame.draw.circle(minimap_surf, settings.MINIMAP_ISLAND_COLOR,
+                                       (int(mini_x), int(mini_y)), 2)
+                elif kind == ROCK:
+                    # Draw rocks (gray)
+                    pygame.draw.circle(minimap_surf, (100, 100, 100),
+                                       (int(mini_x), int(mini_y)), 2)
+        
+        # Draw minimap border
+        pygame.draw.rect(minimap_surf, settings.MINIMAP_BORDER_COLOR, (0, 0, size, size), 2)
+        self.minimap = minimap_surf
+        return minimap_surf
+
+
+def world_random(seed, index):
+    """Return the random.Random that generates world number index of a seed
+    
+    Each world gets its own generator, so a world never depends on how
+    many values were drawn for the worlds before it.
+    """
+    return random.Random(f"{seed}:{index}")
+
+
+def generate_world(settings, random):
+    """Generate random world features using the given random.Random"""
+    features = FeatureStore()
+
+    # Generate random rocks (4-6)
+    num_rocks = random.randint(4, 6)
+    for _ in range(num_rocks):
+        distance = random.uniform(settings.ISLAND_DISTANCE_MIN * 0.5,
+                                  settings.ISLAND_DISTANCE_MAX * 0.7)
+        angle = random.uniform(0, 2 * math.pi)
+        features.add(ROCK, distance * math.cos(angle), distance * math.sin(angle),
+                     random.randint(20, 35))  # Rocks are smaller than islands
+
+    # Generate random islands (3-5)
+    num_islands = random.randint(3, 5)
+    for _ in range(num_islands):
+        distance = random.uniform(settings.ISLAND_DISTANCE_MIN * 0.7,
+                                  settings.ISLAND_DISTANCE_MAX * 0.8)
+        angle = random.uniform(0, 2 * math.pi)
+        features.add(ISLAND, distance * math.cos(angle), distance * math.sin(angle),
+                     random.randint(30, 50))
+
+    # Generate trees on islands (2-4 per island)
+    for island in features.of_kind(ISLAND):
+        num_trees = random.randint(2, 4)
+        for _ in range(num_trees):
+            tree_angle = random.uniform(0, 2 * math.pi)
+            tree_distance = island.size * 0.6
+            features.add(TREE,
+                         island.x + tree_distance * math.cos(tree_angle),
+                         island.y + tree_distance * math.sin(tree_angle),
+                         random.randint(10, 15))
+
+    # Generate other boats (2-3)
+    num_boats = random.randint(2, 3)
+    for _ in range(num_boats):
+        distance = random.uniform(settings.ISLAND_DISTANCE_MIN * 0.4,
+                                  settings.ISLAND_DISTANCE_MAX * 0.6)
+        angle = random.uniform(0, 2 * math.pi)
+        features.add(OTHER_BOAT, distance * math.cos(angle), distance * math.sin(angle),
+                     20, random.randint(0, 359))
+
+    # Generate the target island last to ensure it's properly placed
+    target_pos = _place_target_island(settings, random, features)
+    return World(features, target_pos, settings.ISLAND_RADIUS)
+
+
+def _place_target_island(settings, random, features):
+    """Find a random target island position away from other features"""
+    min_distance = 200  # Minimum distance from other features
+
+    # Keep trying until we find a valid position
+    while True:
+        distance = random.uniform(settings.ISLAND_DISTANCE_MIN,
+                                  settings.ISLAND_DISTANCE_MAX)
+        angle = random.uniform(0, 2 * math.pi)
+        x = distance * math.cos(angle)
+        y = distance * math.sin(angle)
+
+        valid = True
+        for feature in features:
+            dx = x - feature.x
+            dy = y - feature.y
+            if dx * dx + dy * dy < min_distance * min_distance:
+                valid = False
+                break
+
+        if valid:
+            return [x, y]
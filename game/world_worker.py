@@ -0,0 +1,137 @@
+import queue
+import threading
+import traceback
+
+from game.world import generate_world, world_random
+
+
+class WorldPregenerator:
+    """Background worker that keeps a small queue of ready-to-use worlds
+
+    World number n of a seed is always generated from world_random(seed, n)
+    and worlds are handed out strictly in index order, so the seed alone
+    decides the sequence of worlds, however the worker's timing falls.
+    """
+    
+    def __init__(self, settings, seed, queue_size=2):
+        """Initialize the worker (call start() to begin generating)"""
+        self.settings = settings
+        self.seed = seed
+        self._ready = queue.Queue(maxsize=max(1, queue_size))  # (seed, index, world) in build order
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()  # Guards the seed and the next index to build
+        self._next_build = 0  # Index the worker builds next
+        self._next_take = 0  # Index handed out next (main thread only)
+        self.generated = 0
+        self.misses = 0  # Times a world was needed before one was ready
+    
+    def start(self):
+        """Start the background generation thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="world-pregen", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the background thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+    
+    def _build(self, seed, index):
+        """Generate world number index of a seed and pre-render its minimap"""
+        world = generate_world(self.settings, world_random(seed, index))
+        world.index = index
+        world.render_minimap(self.settings)
+        return world
+    
+    def _run(self):
+        """Keep the ready queue topped up"""
+        pending = None
+        while not self._stop.is_set():
+            if pending is None:
+                with self._lock:
+                    seed, index = self.seed, self._next_build
+                    self._next_build += 1
+                try:
+                    pending = (seed, index, self._build(seed, index))
+                except Exception as e:
+                    # take() notices the thread is gone and builds on the calling thread
+                    print(f"Debug: World worker stopped, generating world {index} failed: {e}")
+                    traceback.print_exc()
+                    return
+                self.generated += 1
+            try:
+                # Wake up periodically so stop() is honored
+                self._ready.put(pending, timeout=0.25)
+                pending = None
+            except queue.Full:
+                pass
+    
+    def ready_count(self):
+        """Return the number of worlds waiting in the queue"""
+        return self._ready.qsize()
+    
+    def _accept(self, item):
+        """Return the world of a queued item if it is the next one, None if it was built before a seek()"""
+        seed, index, world = item
+        if seed != self.seed or index != self._next_take:
+            return None
+        self._next_take += 1
+        return world
+    
+    def poll(self):
+        """Return the next world if it is ready, otherwise None without waiting"""
+        while True:
+            try:
+                item = self._ready.get_nowait()
+            except queue.Empty:
+                return None
+            world = self._accept(item)
+            if world is not None:
+                return world
+    
+    def take(self):
+        """Return the next world, waiting for the worker if it isn't ready yet"""
+        world = self.poll()
+        if world is not None:
+            return world
+        self.misses += 1
+        if self._thread is None or not self._thread.is_alive():
+            return self._build_here()
+        print("Debug: No pre-generated world ready, waiting for the worker")
+        while True:
+            try:
+                item = self._ready.get(timeout=0.25)
+            except queue.Empty:
+                if self._thread.is_alive():
+                    continue
+                return self._build_here()  # The worker died; never wait on it forever
+            world = self._accept(item)
+            if world is not None:
+                return world
+    
+    def _build_here(self):
+        """Build the next world on the calling thread when there is no worker to wait for"""
+        # The index decides the world either way
+        index = self._next_take
+        world = self._build(self.seed, index)
+        with self._lock:
+            self._next_build = max(self._next_build, index + 1)
+        self._next_take += 1
+        return world
+    
+    def seek(self, seed, index):
+        """Continue with world number index of a seed (after loading a snapshot); queued worlds are dropped"""
+        with self._lock:
+            self.seed = seed
+            self._next_build = index
+            self._next_take = index
+            while True:
+                try:
+                    self._ready.get_nowait()
+                except queue.Empty:
+                    break
@@ -0,0 +1,115 @@
+import random
+
+import pygame
+
+try:
+    import numpy
+except ImportError:  # Pure Python transforms are used instead
+    numpy = None
+
+
+class Camera:
+    """View onto the world: position, zoom, follow smoothing and shake
+
+    Transforms whole coordinate columns at once so the draw pass can cull
+    and place every feature without per-feature arithmetic in Python.
+    """
+
+    def __init__(self, viewport_size, pixel_scale=1.0, zoom=1.0, smoothing=0.0,
+                 snap_distance=400, rng=None):
+        """Initialize the camera looking at the world origin"""
+        self.x = 0.0  # World point at the viewport center
+        self.y = 0.0
+        self.target_x = 0.0
+        self.target_y = 0.0
+        self.zoom = zoom
+        self.smoothing = smoothing  # 0 locks onto the target; closer to 1 trails further behind
+        self.snap_distance = snap_distance  # Jumps further than this (respawns, loads) are not smoothed
+        self.shake_x = 0.0  # Current shake offset in pixels
+        self.shake_y = 0.0
+        self._shake_magnitude = 0.0
+        self._shake_duration = 0.0
+        self._shake_remaining = 0.0
+        self._rng = rng or random.Random()
+        self.pixel_scale = None
+        self.set_viewport(viewport_size, pixel_scale)
+
+    def set_viewport(self, size, pixel_scale=1.0):
+        """Set the size of the surface drawn to and its pixels per world unit at zoom 1"""
+        self.viewport = pygame.Rect((0, 0), size)
+        self.center_x, self.center_y = self.viewport.center
+        self.pixel_scale = pixel_scale
+
+    @property
+    def scale(self):
+        """Pixels per world unit on the viewport surface"""
+        return self.pixel_scale * self.zoom
+
+    def follow(self, x, y):
+        """Set the point the camera moves towards"""
+        self.target_x = x
+        self.target_y = y
+        dx = x - self.x
+        dy = y - self.y
+        if not self.smoothing or dx * dx + dy * dy > self.snap_distance * self.snap_distance:
+            self.x = x
+            self.y = y
+
+    def shake(self, magnitude, duration_ms):
+        """Start a shake that fades out over duration_ms"""
+        if magnitude >= self._shake_magnitude * self._shake_remaining / max(1.0, self._shake_duration):
+            self._shake_magnitude = magnitude
+            self._shake_duration = self._shake_remaining = float(duration_ms)
+
+    def update(self, dt_ms):
+        """Advance follow smoothing and shake by dt_ms"""
+        if self.smoothing:
+            # Same trailing at any frame rate: smoothing is the share kept per 60 FPS frame
+            blend = 1.0 - self.smoothing ** (dt_ms / 16.667)
+            self.x += (self.target_x - self.x) * blend
+            self.y += (self.target_y - self.y) * blend
+
+        if self._shake_remaining > 0:
+            self._shake_remaining = max(0.0, self._shake_remaining - dt_ms)
+            amount = self._shake_magnitude * self._shake_remaining / self._shake_duration
+            self.shake_x = self._rng.uniform(-amount, amount)
+            self.shake_y = self._rng.uniform(-amount, amount)
+        else:
+            self.shake_x = self.shake_y = 0.0
+
+    def world_to_screen(self, x, y):
+        """Return the viewport position of one world point"""
+        scale = self.scale
+        return (self.center_x + (x - self.x) * scale + self.shake_x,
+                self.center_y + (y - self.y) * scale + self.shake_y)
+
+    def cull(self, xs, ys, radii, pad=0.0):
+        """Transform world columns and keep the points whose circle touches the viewport
+
+        radii and pad are in world units. Returns (indices, screen_xs,
+        screen_ys) as plain lists holding only the visible points.
+        """
+        scale = self.scale
+        offset_x = self.center_x - self.x * scale + self.shake_x
+        offset_y = self.center_y - self.y * scale + self.shake_y
+        width = self.viewport.width
+        height = self.viewport.height
+
+        if numpy is not None:
+            screen_xs = numpy.frombuffer(xs, dtype=numpy.float64) * scale + offset_x
+            screen_ys = numpy.frombuffer(ys, dtype=numpy.float64) * scale + offset_y
+            reach = (numpy.frombuffer(radii, dtype=numpy.float64) + pad) * scale
+            visible = numpy.flatnonzero((screen_xs + reach >= 0) & (screen_xs - reach <= width) &
+                                        (screen_ys + reach >= 0) & (screen_ys - reach <= height))
+            return visible.tolist(), screen_xs[visible].tolist(), screen_ys[visible].tolist()
+
+        indices, screen_xs, screen_ys = [], [], []
+        for index, (x, y, radius) in enumerate(zip(xs, ys, radii)):
+            screen_x = x * scale + offset_x
+            screen_y = y * scale + offset_y
+            reach = (radius + pad) * scale
+            if -reach <= screen_x <= width + reach and -reach <= screen_y <= height + reach:
+                indices.append(index)
+                screen_xs.append(screen_x)
+                screen_ys.append(screen_y)
+        return indices, screen_xs, screen_ys
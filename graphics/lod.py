@@ -0,0 +1,35 @@
+import pygame
+
+from game.features import STARTING_ISLAND, ROCK, ISLAND, TARGET_ISLAND, OTHER_BOAT
+
+# Detail tiers, picked from the effective draw scale (render scale x zoom)
+LOD_FULL = 0  # All details and labels
+LOD_SIMPLE = 1  # One flat shape per feature; trees and labels are skipped
+LOD_IMPOSTOR = 2  # Static features come from one pre-rendered image of the world
+
+
+def lod_for_scale(scale, full_scale, impostor_scale):
+    """Return the detail tier for features drawn at the given scale"""
+    if scale >= full_scale:
+        return LOD_FULL
+    if scale >= impostor_scale:
+        return LOD_SIMPLE
+    return LOD_IMPOSTOR
+
+
+def draw_simple(surface, kind, pos, size, settings):
+    """Draw a feature as a single flat circle; trees are too small to matter and are skipped"""
+    if kind == ISLAND:
+        color = settings.GREEN
+    elif kind == ROCK:
+        color = (100, 100, 100)
+    elif kind == TARGET_ISLAND:
+        color = settings.GOLD
+    elif kind == STARTING_ISLAND:
+        color = settings.BLUE
+    elif kind == OTHER_BOAT:
+        color = (200, 200, 200)
+        size *= 0.7  # The boat triangle covers less than its bounding circle
+    else:
+        return
+    pygame.draw.circle(surface, color, pos, max(1, size))
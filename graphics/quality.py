@@ -0,0 +1,61 @@
+from collections import deque
+
+# Effects the governor can turn down, in the default order they are degraded
+EFFECTS = ("wake_particles", "island_glow", "arrow_glow", "minimap_refresh", "text_antialias")
+
+
+class QualityGovernor:
+    """Degrades costly effects one at a time while frames run long, restoring them with headroom
+
+    Effects are degraded in the given order and restored in reverse. Each
+    change is judged on a fresh window of samples so a single slow frame
+    never flips anything.
+    """
+
+    def __init__(self, degrade_ms, restore_ms, order=EFFECTS, sample_frames=30):
+        """Initialize the governor with every effect at full quality"""
+        self.degrade_ms = degrade_ms  # Average frame time above which the next effect is degraded
+        self.restore_ms = restore_ms  # Average frame time below which the last one is restored
+        self.order = []
+        for effect in order:
+            if effect in EFFECTS and effect not in self.order:
+                self.order.append(effect)
+            else:
+                print(f"Debug: Unknown or repeated quality effect '{effect}' ignored")
+        self.level = 0  # Number of effects in order that are degraded
+        self.degraded = frozenset()
+        self.average_ms = 0.0
+        self.frame = 0
+        self._samples = deque(maxlen=sample_frames)
+
+    def update(self, frame_ms):
+        """Record a frame's work time; return a decision dict when quality changes, else None"""
+        self.frame += 1
+        samples = self._samples
+        samples.append(frame_ms)
+        if len(samples) < samples.maxlen:
+            return None
+        self.average_ms = sum(samples) / len(samples)
+
+        if self.average_ms > self.degrade_ms and self.level < len(self.order):
+            effect = self.order[self.level]
+            self.level += 1
+            action = "degrade"
+        elif self.average_ms < self.restore_ms and self.level > 0:
+            self.level -= 1
+            effect = self.order[self.level]
+            action = "restore"
+        else:
+            return None
+
+        samples.clear()
+        self.degraded = frozenset(self.order[:self.level])
+        decision = {"frame": self.frame, "action": action, "effect": effect,
+                    "average_ms": round(self.average_ms, 2), "level": self.level}
+        return decision
+
+    def status(self):
+        """Return the current state for telemetry"""
+        return {"level": self.level, "degraded": [e for e in self.order if e in self.degraded],
+                "average_ms": round(self.average_ms, 2), "degrade_ms": self.degrade_ms,
+                "restore_ms": self.restore_ms}
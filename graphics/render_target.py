@@ -0,0 +1,94 @@
+import pygame
+from collections import deque
+
+
+class RenderTarget:
+    """Offscreen surface drawn at a fraction of the window size and scaled up once per frame
+
+    At scale 1.0 the window itself is the target and present() does nothing,
+    so full-resolution rendering costs no extra copy.
+    """
+
+    def __init__(self, window, scale=1.0, smooth=True):
+        """Initialize the target for the given display surface"""
+        self.window = window
+        self.smooth = smooth  # smoothscale looks better, scale is ~10x cheaper
+        self.scale = None
+        self.surface = None
+        self._scaled_cache = {}  # id(source) -> (source, factor, scaled copy)
+        self.set_scale(scale)
+
+    def set_scale(self, scale):
+        """Resize the internal surface to scale * window size"""
+        if scale == self.scale:
+            return
+        self.scale = scale
+        self._scaled_cache.clear()
+        if scale == 1.0:
+            self.surface = self.window
+        else:
+            width, height = self.window.get_size()
+            size = (max(1, int(width * scale)), max(1, int(height * scale)))
+            # Same pixel format as the window so scaling can write straight into it
+            self.surface = pygame.Surface(size, 0, self.window)
+        print(f"Debug: Render scale {scale:.3f} ({self.surface.get_width()}x{self.surface.get_height()})")
+
+    def scaled(self, source, factor=None):
+        """Return source resized by factor (default: the render scale)
+
+        Only the latest size of each source is cached, so changing the
+        factor every frame would rescale every frame.
+        """
+        if factor is None:
+            factor = self.scale
+        if factor == 1.0:
+            return source
+        entry = self._scaled_cache.get(id(source))
+        if entry is None or entry[0] is not source or entry[1] != factor:
+            width, height = source.get_size()
+            size = (max(1, int(width * factor)), max(1, int(height * factor)))
+            entry = self._scaled_cache[id(source)] = (source, factor, pygame.transform.scale(source, size))
+        return entry[2]
+
+    def present(self):
+        """Scale the internal surface onto the window"""
+        if self.surface is self.window:
+            return
+        if self.smooth:
+            pygame.transform.smoothscale(self.surface, self.window.get_size(), self.window)
+        else:
+            pygame.transform.scale(self.surface, self.window.get_size(), self.window)
+
+
+class DynamicResolution:
+    """Lowers the render scale when frames run over budget and raises it with headroom"""
+
+    def __init__(self, budget_ms, min_scale=0.5, max_scale=1.0, step=0.125, sample_frames=30, headroom=0.7):
+        """Initialize the controller"""
+        self.budget_ms = budget_ms
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.step = step
+        self.headroom = headroom  # Scale back up only below budget * headroom
+        self.scale = max_scale
+        self._samples = deque(maxlen=sample_frames)
+
+    def update(self, frame_ms):
+        """Record a frame's work time; return the new scale when it changes, else None"""
+        samples = self._samples
+        samples.append(frame_ms)
+        if len(samples) < samples.maxlen:
+            return None
+        average = sum(samples) / len(samples)
+
+        scale = self.scale
+        if average > self.budget_ms:
+            scale = max(self.min_scale, scale - self.step)
+        elif average < self.budget_ms * self.headroom:
+            scale = min(self.max_scale, scale + self.step)
+        if scale == self.scale:
+            return None
+        # Judge the new scale on fresh samples only
+        samples.clear()
+        self.scale = scale
+        return scale
@@ -0,0 +1,46 @@
+import pygame
+
+
+class RotatedSprites:
+    """Pre-rotated copies of one image, built once per angle step and zoom
+
+    Drawing many rotated copies then costs one blit each instead of a
+    rotate per copy per frame.
+    """
+
+    def __init__(self, image, steps=72, tint=None, alpha=255):
+        """Initialize the cache; tint and alpha are multiplied into the pixels"""
+        self.steps = steps
+        self.step_angle = 360 / steps
+        self.base = image.copy()
+        if tint is not None or alpha != 255:
+            r, g, b = tint if tint is not None else (255, 255, 255)
+            self.base.fill((r, g, b, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+        self._zoom = None
+        self._scaled = None  # base at the current zoom
+        self._frames = None
+
+    def get(self, heading, zoom=1.0):
+        """Return the copy closest to heading (degrees, as in pygame.transform.rotate)"""
+        if zoom != self._zoom:
+            # Only one zoom is kept; the rotations are rebuilt lazily after a change
+            self._zoom = zoom
+            self._scaled = self.base
+            if zoom != 1.0:
+                width, height = self.base.get_size()
+                self._scaled = pygame.transform.smoothscale(
+                    self.base, (max(1, int(width * zoom)), max(1, int(height * zoom))))
+            self._frames = [None] * self.steps
+        index = int(round(heading / self.step_angle)) % self.steps
+        frame = self._frames[index]
+        if frame is None:
+            frame = self._frames[index] = pygame.transform.rotate(self._scaled, index * self.step_angle)
+        return frame
+
+    def draw(self, surface, placements, zoom=1.0):
+        """Blit one copy per (x, y, heading) centered on (x, y), in a single batched call"""
+        batch = []
+        for x, y, heading in placements:
+            frame = self.get(heading, zoom)
+            batch.append((frame, frame.get_rect(center=(x, y))))
+        surface.blits(batch, doreturn=False)
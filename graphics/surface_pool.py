@@ -0,0 +1,81 @@
+import pygame
+from collections import OrderedDict
+
+
+class SurfacePool:
+    """Reuses transient per-frame surfaces instead of allocating new ones
+
+    Surfaces handed out by acquire() are only valid until end_frame(),
+    which is called once the frame has been drawn.
+    """
+
+    def __init__(self, debug=False, max_keys=64, max_per_key=8):
+        """Initialize the pool"""
+        self.debug = debug
+        self.max_keys = max_keys  # Distinct (size, flags) buckets kept
+        self.max_per_key = max_per_key  # Free surfaces kept per bucket
+        self._free = OrderedDict()  # (size, flags) -> [surfaces], least recently used first
+        self._in_use = []
+
+        # Counters
+        self.frame = 0
+        self.frame_requests = 0
+        self.frame_allocations = 0
+        self.last_frame_requests = 0
+        self.last_frame_allocations = 0
+        self.total_allocations = 0
+
+    def acquire(self, size, flags=0, fill=None):
+        """Return a surface of the given size and flags, cleared to fill"""
+        key = (size[0], size[1], flags)
+        free = self._free.get(key)
+        if free:
+            surface = free.pop()
+            self._free.move_to_end(key)
+        else:
+            surface = pygame.Surface(key[:2], flags)
+            self.frame_allocations += 1
+            self.total_allocations += 1
+
+        # Clear the surface (transparent for alpha surfaces)
+        if fill is None:
+            fill = (0, 0, 0, 0) if flags & pygame.SRCALPHA else (0, 0, 0)
+        surface.fill(fill)
+
+        self._in_use.append((key, surface))
+        self.frame_requests += 1
+        return surface
+
+    def end_frame(self):
+        """Reclaim every surface handed out this frame"""
+        for key, surface in self._in_use:
+            free = self._free.get(key)
+            if free is None:
+                free = self._free[key] = []
+            if len(free) < self.max_per_key:
+                free.append(surface)
+        self._in_use.clear()
+
+        # Drop the least recently used buckets
+        while len(self._free) > self.max_keys:
+            self._free.popitem(last=False)
+
+        self.last_frame_requests = self.frame_requests
+        self.last_frame_allocations = self.frame_allocations
+        self.frame_requests = 0
+        self.frame_allocations = 0
+        self.frame += 1
+
+        if self.debug and self.frame % 60 == 0:
+            print(f"Debug: Surface pool - requests/frame: {self.last_frame_requests}, "
+                  f"allocations/frame: {self.last_frame_allocations}, "
+                  f"total allocations: {self.total_allocations}, pooled: {self.pooled_count()}")
+
+    def pooled_count(self):
+        """Return the number of free surfaces held by the pool"""
+        return sum(len(free) for free in self._free.values())
+
+    def clear(self):
+        """Release all pooled surfaces"""
+        self._free.clear()
+        self._in_use.clear()
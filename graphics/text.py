@@ -0,0 +1,56 @@
+import pygame
+
+_fonts = {}
+
+
+def get_font(size):
+    """Return the default font at the given size, loading it only once"""
+    font = _fonts.get(size)
+    if font is None:
+        font = _fonts[size] = pygame.font.SysFont(None, size)
+    return font
+
+
+class GlowTextCache:
+    """Renders glowing text once per (message, color, size) and reuses it"""
+
+    def __init__(self, glow_radius=6, glow_strength=0.6, max_entries=32):
+        """Initialize the cache"""
+        self.glow_radius = glow_radius
+        self.glow_strength = glow_strength  # Glow opacity relative to the text
+        self.max_entries = max_entries
+        self._cache = {}
+
+    def get(self, message, color, size, alpha=255):
+        """Return the cached glow text surface with the given overall alpha"""
+        key = (message, tuple(color), size)
+        surface = self._cache.get(key)
+        if surface is None:
+            if len(self._cache) >= self.max_entries:
+                self._cache.clear()
+            surface = self._cache[key] = self._render(message, color, size)
+        # Fade is applied to the cached surface instead of re-rendering
+        surface.set_alpha(alpha)
+        return surface
+
+    def _render(self, message, color, size):
+        """Render text over a blurred copy of itself"""
+        font = get_font(size)
+        text = font.render(message, True, color)
+        pad = self.glow_radius * 2
+        width = text.get_width() + pad * 2
+        height = text.get_height() + pad * 2
+
+        glow = pygame.Surface((width, height), pygame.SRCALPHA)
+        glow.blit(text, (pad, pad))
+
+        # Cheap blur: downsample then smoothly upsample (twice for a softer falloff)
+        factor = max(1, self.glow_radius // 2)
+        for _ in range(2):
+            small = pygame.transform.smoothscale(glow, (max(1, width // factor), max(1, height // factor)))
+            glow = pygame.transform.smoothscale(small, (width, height))
+
+        # Weaken the glow and put the crisp text on top
+        glow.fill((255, 255, 255, int(255 * self.glow_strength)), special_flags=pygame.BLEND_RGBA_MULT)
+        glow.blit(text, (pad, pad))
+        return glow
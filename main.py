@@ -1,40 +1,117 @@
+import time
+_STARTED = time.perf_counter()  # Taken before the heavy imports for the startup report
+
+import argparse
 import pygame
 import sys
 from game.engine import GameEngine
-from config.settings import Settings
+from game.input import InputQueue, InputReplay
+from config.settings import Settings, SettingsError, load_profile
+from game.startup import StartupTimer
+from game.errors import ErrorLimitExceeded
 
 def main():
-    # Initialize pygame
-    pygame.init()
+    startup_timer = StartupTimer(_STARTED)
+    startup_timer.mark("imports")
     
-    # Load settings
-    settings = Settings()
+    parser = argparse.ArgumentParser(description="Island Navigator")
+    parser.add_argument("snapshot", nargs="?", help="Resume from this snapshot file")
+    parser.add_argument("--profile", help="Settings profile (.toml or .json), reloaded when edited")
+    parser.add_argument("--replay", help="Play back this input recording (INPUT_RECORD_FILE) instead of the keyboard")
+    args = parser.parse_args()
     
-    # Create the game engine
-    game = GameEngine(settings)
+    # Load settings (a replay runs on the seed it was recorded with)
+    replay = None
+    try:
+        settings = load_profile(args.profile) if args.profile else Settings()
+        if args.replay:
+            replay = InputReplay(args.replay)
+            settings = settings.replace(WORLD_SEED=replay.seed)
+    except (OSError, ValueError, SettingsError) as e:
+        sys.exit(f"Error: {e}")
+    startup_timer.mark("settings")
     
-    # Main game loop
+    # Initialize only the pygame subsystems the game uses (no audio or joystick)
+    pygame.display.init()
+    pygame.font.init()
     clock = pygame.time.Clock()
-    while True:
-        # Check for quit event
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            game.handle_event(event)
-        
-        # Update game state
-        game.update()
-        
-        # Draw the game
-        game.draw()
-        
-        # Update the display
-        pygame.display.flip()
-        
-        # Cap the frame rate
-        clock.tick(settings.FPS)
+    clock.tick()  # Also starts the SDL timer behind pygame.time.get_ticks()
+    startup_timer.mark("pygame init")
+    
+    # Create the game engine (background and world load after the first frame)
+    game = GameEngine(settings, startup_timer)
+    
+    # Resume from a snapshot if one was given on the command line
+    if args.snapshot:
+        game.load_snapshot(args.snapshot)
+    
+    # Only input events are queued; motion events would just be dropped
+    pygame.event.set_blocked([pygame.MOUSEMOTION, pygame.MOUSEWHEEL])
+    input_queue = InputQueue(settings.MAX_EVENTS_PER_TICK, record=bool(settings.INPUT_RECORD_FILE) and replay is None)
+    
+    # Fixed simulation step, independent of the render frame rate
+    sim_time = pygame.time.get_ticks()
+    
+    # Main game loop
+    first_frame = True
+    try:
+        while True:
+            # Timestamp and queue input events (only quitting is taken from the keyboard during a replay)
+            now = pygame.time.get_ticks()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if replay is None:
+                    input_queue.push(event, now)
+            
+            # Run the simulation ticks that are due, applying input at its tick
+            # (settings are re-read every frame since a profile reload may swap them).
+            # Ticks start once the first world is ready, so tick numbers match on replay;
+            # input given while it loads waits in the queue.
+            settings = game.settings
+            tick_ms = 1000 / settings.FPS
+            ticks = 0
+            game.poll_first_world()
+            if not game.world_ready:
+                sim_time = now
+            while sim_time + tick_ms <= now and ticks < settings.MAX_TICKS_PER_FRAME:
+                sim_time += tick_ms
+                if replay is not None:
+                    game.step(replay.pop_due(sim_time, game.tick))
+                    if not replay:
+                        print("Debug: Replay finished, back to the keyboard")
+                        replay = None
+                else:
+                    # Up to the end of the tick in progress, so input stamped this frame isn't held a frame
+                    game.step(input_queue.pop_due(sim_time + tick_ms, game.tick))
+                ticks += 1
+            if ticks == settings.MAX_TICKS_PER_FRAME:
+                sim_time = now  # Too far behind; skip ahead instead of spiralling
+            
+            # Draw the game
+            game.draw()
+            
+            # Update the display
+            pygame.display.flip()
+            
+            # Finish loading once something is on screen
+            if first_frame:
+                first_frame = False
+                startup_timer.mark("first frame")
+                game.finish_startup()
+                print(f"Debug: {startup_timer.report()}")
+                sim_time = pygame.time.get_ticks()  # Don't replay the loading time as catch-up ticks
+            
+            # Cap the frame rate
+            clock.tick(settings.FPS)
+            game.end_frame(clock.get_rawtime())
+    except ErrorLimitExceeded as e:
+        sys.exit(f"Error: {e}")
+    finally:
+        game.shutdown()
+        if input_queue.recording is not None:
+            input_queue.save_recording(settings.INPUT_RECORD_FILE, game.world_seed)
 
 if __name__ == "__main__":
     main()
-    
\ No newline at end of file
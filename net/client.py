@@ -0,0 +1,276 @@
+"""
+Client side of networked play
+
+NetworkClient runs the connection on a background asyncio thread so the
+pygame loop never blocks on the network, and interpolates remote boats
+between received snapshots. run_bot() is a headless stand-in client for
+load testing a server:
+
+    python -m net.client --bots 200 --seconds 10
+"""
+
+import argparse
+import asyncio
+import bisect
+import concurrent.futures
+import random
+import threading
+import time
+
+from config.settings import Settings
+from game.features import FeatureStore, OTHER_BOAT
+from net import protocol
+from net.prediction import PredictedBoat
+
+
+class SnapshotBuffer:
+    """Timestamped full snapshots rebuilt from state deltas"""
+
+    def __init__(self, max_snapshots=32):
+        """Initialize an empty buffer"""
+        self.max_snapshots = max_snapshots
+        self.times = []
+        self.snapshots = []
+        self.players = {}  # player_id -> (x, y, heading), latest known state
+
+    def apply(self, receive_time, entries):
+        """Apply a state delta received at receive_time"""
+        players = self.players
+        for player_id, flags, qx, qy, qheading in entries:
+            players[player_id] = (protocol.dequantize_position(qx),
+                                  protocol.dequantize_position(qy),
+                                  protocol.dequantize_heading(qheading))
+        self.times.append(receive_time)
+        self.snapshots.append(dict(players))
+        if len(self.times) > self.max_snapshots:
+            del self.times[0]
+            del self.snapshots[0]
+
+    def remove(self, player_id):
+        """Forget a player that left"""
+        self.players.pop(player_id, None)
+        for snapshot in self.snapshots:
+            snapshot.pop(player_id, None)
+
+    def interpolate(self, render_time):
+        """Return {player_id: (x, y, heading)} interpolated at render_time"""
+        times = self.times
+        if not times:
+            return {}
+        index = bisect.bisect_right(times, render_time)
+        if index == 0:
+            return dict(self.snapshots[0])
+        if index >= len(times):
+            return dict(self.snapshots[-1])
+
+        t0, t1 = times[index - 1], times[index]
+        before, after = self.snapshots[index - 1], self.snapshots[index]
+        alpha = (render_time - t0) / (t1 - t0) if t1 > t0 else 1.0
+        result = {}
+        for player_id, (x1, y1, h1) in after.items():
+            previous = before.get(player_id)
+            if previous is None:
+                result[player_id] = (x1, y1, h1)
+                continue
+            x0, y0, h0 = previous
+            # Interpolate heading along the shortest arc
+            turn = (h1 - h0 + 180) % 360 - 180
+            result[player_id] = (x0 + (x1 - x0) * alpha,
+                                 y0 + (y1 - y0) * alpha,
+                                 (h0 + turn * alpha) % 360)
+        return result
+
+
+class NetworkClient:
+    """Connection to a game server, driven from a background thread"""
+
+    def __init__(self, settings):
+        """Initialize the client"""
+        self.settings = settings
+        self.player_id = None
+        self.seed = None
+        self.spawn = (0.0, 0.0)
+        self.tick_rate = settings.NET_TICK_RATE
+        self.snapshots = SnapshotBuffer()
+        self.last_ack_seq = 0
+        self.connected = False
+        self.fixed_point = settings.FIXED_POINT_PHYSICS  # The server's physics mode, from the handshake
+        self.prediction = PredictedBoat(settings.BOAT_SPEED, settings.NET_INPUT_BUFFER,
+                                        fixed_point=self.fixed_point)
+        self._authoritative = None  # Latest (ack_seq, state) not yet reconciled
+        self._checksum = None  # Latest (ack_seq, state checksum) not yet verified
+        self._resync_requested = False
+
+        self._input_seq = 0
+        self._lock = threading.Lock()
+        self._hello = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._writer = None
+        self._thread = None
+        self._task = None  # Future of _run() on the network thread
+
+    def connect(self, host, port, timeout=5.0):
+        """Connect to a server, blocking until the handshake completes"""
+        self._thread = threading.Thread(target=self._loop.run_forever, name="net-client", daemon=True)
+        self._thread.start()
+        self._task = asyncio.run_coroutine_threadsafe(self._run(host, port), self._loop)
+        if not self._hello.wait(timeout):
+            raise ConnectionError(f"No response from {host}:{port}")
+        print(f"Debug: Connected as player {self.player_id} (seed {self.seed})")
+
+    async def _run(self, host, port):
+        """Receive messages until the connection closes"""
+        try:
+            reader, self._writer = await asyncio.open_connection(host, port)
+            while True:
+                msg_type, payload = await protocol.read_message(reader)
+                if msg_type == protocol.MSG_STATE:
+                    tick, ack_seq, entries = protocol.decode_state(payload)
+                    with self._lock:
+                        self.last_ack_seq = ack_seq
+                        self.snapshots.apply(time.perf_counter(), entries)
+                elif msg_type == protocol.MSG_OWN_STATE:
+                    ack_seq, *state = protocol.OWN_STATE.unpack(payload)
+                    with self._lock:
+                        self._authoritative = (ack_seq, state)
+                elif msg_type == protocol.MSG_OWN_CHECKSUM:
+                    with self._lock:
+                        self._checksum = protocol.OWN_CHECKSUM.unpack(payload)
+                elif msg_type == protocol.MSG_LEAVE:
+                    player_id, = protocol.LEAVE.unpack(payload)
+                    with self._lock:
+                        self.snapshots.remove(player_id)
+                elif msg_type == protocol.MSG_HELLO:
+                    (self.player_id, self.seed, self.tick_rate, self.fixed_point,
+                     spawn_x, spawn_y) = protocol.HELLO.unpack(payload)
+                    self.spawn = (spawn_x, spawn_y)
+                    self.prediction.fixed_point = self.fixed_point
+                    self.connected = True
+                    self._hello.set()
+        except (OSError, asyncio.IncompleteReadError) as e:
+            print(f"Debug: Network connection closed: {e}")
+        finally:
+            self.connected = False
+
+    def send_input(self, boat):
+        """Send the input of a locally simulated step; returns its sequence number"""
+        if not self.connected:
+            return None
+        self._input_seq += 1
+        self.prediction.record(self._input_seq, boat)
+        payload = protocol.INPUT.pack(self._input_seq,
+                                      int(boat.left_force), int(boat.right_force),
+                                      int(boat.forward_force), int(boat.backward_force),
+                                      protocol.quantize_heading(boat.heading))
+        message = protocol.frame(protocol.MSG_INPUT, payload)
+        self._loop.call_soon_threadsafe(self._writer.write, message)
+        return self._input_seq
+
+    def reconcile(self, boat, current_vector):
+        """Correct the locally predicted boat if a new server state arrived
+
+        In fixed-point mode the server mostly sends state checksums; a
+        mismatch asks it for the full state, which is reconciled on arrival.
+        """
+        with self._lock:
+            authoritative, self._authoritative = self._authoritative, None
+            checksum, self._checksum = self._checksum, None
+        if authoritative is None:
+            if checksum is not None and not self._resync_requested and not self.prediction.verify(*checksum):
+                print(f"Debug: Own boat desynced at input {checksum[0]}, requesting full state")
+                self._resync_requested = True
+                self._loop.call_soon_threadsafe(self._writer.write, protocol.frame(protocol.MSG_RESYNC, b""))
+            return None
+        self._resync_requested = False
+        ack_seq, state = authoritative
+        return self.prediction.reconcile(boat, ack_seq, state, current_vector)
+    
+    def remote_players(self, now=None):
+        """Return interpolated {player_id: (x, y, heading)} for everyone else"""
+        if now is None:
+            now = time.perf_counter()
+        render_time = now - self.settings.NET_INTERP_DELAY / 1000
+        with self._lock:
+            players = self.snapshots.interpolate(render_time)
+        players.pop(self.player_id, None)
+        return players
+
+    def remote_features(self, now=None):
+        """Return other players as other_boat features for drawing"""
+        features = FeatureStore()
+        for x, y, heading in self.remote_players(now).values():
+            features.add(OTHER_BOAT, x, y, self.settings.OTHER_BOAT_SIZE, heading)
+        return features
+
+    def close(self):
+        """Disconnect and stop the network thread"""
+        if self._writer is not None:
+            self._loop.call_soon_threadsafe(self._writer.close)
+        if self._task is not None:
+            # Let the receive task finish before the loop stops, so it isn't left pending
+            self._task.cancel()
+            try:
+                self._task.result(timeout=1.0)
+            except (concurrent.futures.CancelledError, concurrent.futures.TimeoutError):
+                pass
+            self._task = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.connected = False
+
+
+async def run_bot(host, port, seconds, rng=None):
+    """Headless stand-in client sending random steering; returns message stats"""
+    rng = rng or random.Random()
+    reader, writer = await asyncio.open_connection(host, port)
+    stats = {"messages": 0, "bytes": 0, "entries": 0}
+
+    async def receive():
+        while True:
+            msg_type, payload = await protocol.read_message(reader)
+            stats["messages"] += 1
+            stats["bytes"] += protocol.HEADER.size + len(payload)
+            if msg_type == protocol.MSG_STATE:
+                stats["entries"] += protocol.STATE_HEADER.unpack_from(payload, 0)[2]
+
+    receiver = asyncio.ensure_future(receive())
+    seq = 0
+    forces = [0, 0, 20, 0]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + seconds
+    try:
+        while loop.time() < deadline:
+            seq += 1
+            # Wander: nudge one force at a time
+            index = rng.randrange(4)
+            forces[index] = max(0, min(100, forces[index] + rng.choice((-5, 5))))
+            writer.write(protocol.frame(protocol.MSG_INPUT, protocol.INPUT.pack(seq, *forces, 0)))
+            await asyncio.sleep(0.05)
+    finally:
+        receiver.cancel()
+        writer.close()
+    return stats
+
+
+def main():
+    """Run stand-in bot clients from the command line"""
+    parser = argparse.ArgumentParser(description="Island Navigator stand-in clients")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=Settings().NET_PORT)
+    parser.add_argument("--bots", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    async def run_all():
+        return await asyncio.gather(*(run_bot(args.host, args.port, args.seconds) for _ in range(args.bots)))
+
+    results = asyncio.run(run_all())
+    messages = sum(r["messages"] for r in results)
+    total_bytes = sum(r["bytes"] for r in results)
+    print(f"{args.bots} bots: {messages} messages, {total_bytes / 1024:.1f} KiB received")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import math
+from collections import deque
+
+from game.physics import BoatState, step_boat, state_checksum
+
+
+class PredictedBoat:
+    """Client-side prediction of the local boat with server reconciliation
+
+    Every locally simulated step is recorded with its input sequence
+    number. When the server acknowledges an input together with its
+    authoritative boat state, the still unacknowledged inputs are
+    replayed on top of that state. Only the boat is re-simulated.
+    """
+
+    def __init__(self, boat_speed, buffer_size=128, tolerance=0.05, fixed_point=False):
+        """Initialize the input history"""
+        self.boat_speed = boat_speed
+        self.tolerance = tolerance  # Prediction error (px) that is ignored
+        self.fixed_point = fixed_point  # Fixed-point physics, verified by checksum
+        self.pending = deque(maxlen=buffer_size)  # Unacknowledged (seq, forces..., checksum)
+        self.verified_seq = 0
+
+        # Stats
+        self.corrections = 0
+        self.desyncs = 0
+        self.last_error = 0.0
+
+    def record(self, seq, boat):
+        """Remember the input used for a locally simulated step and the state it produced"""
+        checksum = state_checksum(boat) if self.fixed_point else None
+        self.pending.append((seq, boat.left_force, boat.right_force,
+                             boat.forward_force, boat.backward_force, checksum))
+
+    def verify(self, ack_seq, checksum):
+        """Compare the server's state checksum after ack_seq with the predicted one
+
+        Returns False on a desync; the caller then asks the server for its
+        full state and reconciles with that. In fixed-point mode both sides
+        compute bit-identical steps, so matching checksums need no replay.
+        """
+        if ack_seq <= self.verified_seq:
+            return True
+        self.verified_seq = ack_seq
+        pending = self.pending
+        predicted = None
+        while pending and pending[0][0] <= ack_seq:
+            entry = pending.popleft()
+            if entry[0] == ack_seq:
+                predicted = entry[-1]
+        if predicted == checksum:
+            return True
+        self.desyncs += 1
+        return False
+
+    def clear(self):
+        """Forget all pending inputs (after a restart or respawn)"""
+        self.pending.clear()
+
+    def reconcile(self, boat, ack_seq, authoritative, current_vector):
+        """Rebase the boat on the authoritative state and replay pending inputs"""
+        pending = self.pending
+        while pending and pending[0][0] <= ack_seq:
+            pending.popleft()
+
+        x, y, vx, vy, mx, my = authoritative
+        state = BoatState(x, y)
+        state.velocity = [vx, vy]
+        state.momentum = [mx, my]
+        replayed = []
+        for seq, left, right, forward, backward, checksum in pending:
+            state.left_force = left
+            state.right_force = right
+            state.forward_force = forward
+            state.backward_force = backward
+            step_boat(state, current_vector, self.boat_speed, self.fixed_point)
+            if self.fixed_point:
+                # Later checksums from the server are compared with the corrected steps
+                checksum = state_checksum(state)
+            replayed.append((seq, left, right, forward, backward, checksum))
+        pending.clear()
+        pending.extend(replayed)
+
+        error = math.hypot(state.x - boat.x, state.y - boat.y)
+        self.last_error = error
+        # Fixed-point state has to match exactly or the next checksum fails again
+        if error > self.tolerance or (self.fixed_point and state_checksum(state) != state_checksum(boat)):
+            # Prediction was wrong: adopt the corrected state
+            boat.x = state.x
+            boat.y = state.y
+            boat.velocity = state.velocity
+            boat.momentum = state.momentum
+            self.corrections += 1
+        return error
@@ -0,0 +1,81 @@
+"""
+Wire protocol for networked play
+
+Every message is a 3-byte header (payload length, message type) followed
+by a little-endian payload. Positions are quantized to 1/16 px and
+headings to 1/65536 of a turn, and state messages only carry players
+whose quantized state changed since the previous tick. With fixed-point
+physics a client's own boat is checked with a 4-byte state checksum per
+tick, and its full state is only sent when the client reports a desync.
+"""
+
+import struct
+
+MSG_HELLO = 1   # server -> client: player id, world seed, spawn position
+MSG_INPUT = 2   # client -> server: input sequence number, forces, heading
+MSG_STATE = 3   # server -> client: tick, acknowledged input, changed players
+MSG_LEAVE = 4   # server -> client: player left
+MSG_OWN_STATE = 5  # server -> client: full-precision state of the client's own boat
+MSG_OWN_CHECKSUM = 6  # server -> client: state checksum of the client's own boat (fixed-point physics)
+MSG_RESYNC = 7  # client -> server: own boat checksum mismatch, send the full state
+
+# Player flags carried in state entries
+FLAG_RESPAWNED = 1
+FLAG_DOCKED = 2
+
+HEADER = struct.Struct("<HB")
+HELLO = struct.Struct("<HIB?dd")  # player id, seed, tick rate, fixed-point physics, spawn
+INPUT = struct.Struct("<I4BH")
+STATE_HEADER = struct.Struct("<IIH")
+STATE_ENTRY = struct.Struct("<HBiiH")
+LEAVE = struct.Struct("<H")
+OWN_STATE = struct.Struct("<I6d")  # ack seq, x, y, velocity, momentum
+OWN_CHECKSUM = struct.Struct("<II")  # ack seq, physics.state_checksum()
+
+POSITION_SCALE = 16
+HEADING_SCALE = 65536 / 360
+
+
+def frame(msg_type, payload):
+    """Prefix a payload with the message header"""
+    return HEADER.pack(len(payload), msg_type) + payload
+
+
+async def read_message(reader):
+    """Read one message from an asyncio stream, returning (type, payload)"""
+    header = await reader.readexactly(HEADER.size)
+    length, msg_type = HEADER.unpack(header)
+    payload = await reader.readexactly(length) if length else b""
+    return msg_type, payload
+
+
+def quantize_position(value):
+    """Quantize a world coordinate for the wire"""
+    return int(round(value * POSITION_SCALE))
+
+
+def dequantize_position(value):
+    """Restore a world coordinate from the wire"""
+    return value / POSITION_SCALE
+
+
+def quantize_heading(heading):
+    """Quantize a heading in degrees for the wire"""
+    return int(round((heading % 360) * HEADING_SCALE)) & 0xFFFF
+
+
+def dequantize_heading(value):
+    """Restore a heading in degrees from the wire"""
+    return value / HEADING_SCALE
+
+
+def encode_entries(entries):
+    """Encode (player_id, flags, qx, qy, qheading) state entries"""
+    return b"".join(STATE_ENTRY.pack(*entry) for entry in entries)
+
+
+def decode_state(payload):
+    """Decode a state message into (tick, ack_seq, entries)"""
+    tick, ack_seq, count = STATE_HEADER.unpack_from(payload, 0)
+    entries = list(STATE_ENTRY.iter_unpack(payload[STATE_HEADER.size:STATE_HEADER.size + count * STATE_ENTRY.size]))
+    return tick, ack_seq, entries
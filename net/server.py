@@ -0,0 +1,276 @@
+"""
+Headless authoritative game server
+
+Runs the boat simulation (forces, currents, collisions) for every
+connected client and broadcasts per-tick state deltas over TCP.
+
+    python -m net.server --port 5555 --seed 1234
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import deque
+
+from config.settings import Settings
+from game.physics import BoatState, step_boat, check_collision, state_checksum
+from game import kernels
+from game.wave import WaveGenerator
+from game.world import generate_world, world_random
+from net import protocol
+
+BOAT_RADIUS = 20  # Half the boat sprite width, as used by Boat.check_collision
+
+
+class PlayerSession:
+    """Server-side state of one connected player"""
+
+    def __init__(self, player_id, writer, spawn):
+        """Initialize the session with a boat at the spawn point"""
+        self.player_id = player_id
+        self.writer = writer
+        self.spawn = spawn
+        self.boat = BoatState(spawn[0], spawn[1])
+        self.docked = True  # Stays put until the client sends its first input
+        self.pending_inputs = deque()
+        self.last_input_seq = 0
+        self.flags = 0
+        self.needs_full_state = True
+        self.needs_own_state = True  # Full own boat state instead of its checksum (fixed-point physics)
+
+
+class GameServer:
+    """Authoritative simulation shared by all connected clients"""
+
+    def __init__(self, settings, seed=None, host="127.0.0.1", port=None):
+        """Initialize the server and generate its world"""
+        self.settings = settings
+        self.host = host
+        self.port = port if port is not None else settings.NET_PORT
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        kernels.use_backend(settings.KERNEL_BACKEND)
+        self.world = generate_world(settings, world_random(self.seed, 0))  # The first world of the seed, as in single player
+        self.current_vector = list(WaveGenerator(settings).get_current_vector())
+        self.spawn = (0.0, 0.0)
+
+        self.players = {}
+        self.tick_count = 0
+        self._next_player_id = 1
+        self._last_broadcast = {}  # player_id -> quantized (x, y, heading)
+        self._server = None
+
+        # Stats
+        self.bytes_sent = 0
+        self.tick_time = 0.0
+
+    async def start(self):
+        """Start listening for clients"""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"Debug: Server listening on {self.host}:{self.port} (seed {self.seed})")
+
+    async def serve_forever(self, duration=None):
+        """Run the tick loop until cancelled or for the given number of seconds"""
+        if self._server is None:
+            await self.start()
+        interval = 1.0 / self.settings.NET_TICK_RATE
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        next_tick = started
+        try:
+            while duration is None or loop.time() - started < duration:
+                self.tick()
+                next_tick += interval
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Stop accepting clients and disconnect everyone"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for session in list(self.players.values()):
+            session.writer.close()
+        self.players.clear()
+
+    async def _handle_client(self, reader, writer):
+        """Serve one client connection"""
+        if len(self.players) >= self.settings.NET_MAX_CLIENTS:
+            writer.close()
+            return
+
+        player_id = self._next_player_id
+        self._next_player_id = (self._next_player_id % 0xFFFF) + 1
+        session = PlayerSession(player_id, writer, self.spawn)
+        self.players[player_id] = session
+        writer.write(protocol.frame(protocol.MSG_HELLO, protocol.HELLO.pack(
+            player_id, self.seed, self.settings.NET_TICK_RATE, self.settings.FIXED_POINT_PHYSICS, *self.spawn)))
+
+        try:
+            while True:
+                msg_type, payload = await protocol.read_message(reader)
+                if msg_type == protocol.MSG_INPUT:
+                    self._apply_input(session, payload)
+                elif msg_type == protocol.MSG_RESYNC:
+                    session.needs_own_state = True
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._drop(player_id)
+
+    def _apply_input(self, session, payload):
+        """Queue an input; each input advances that player's boat by one step"""
+        inputs = session.pending_inputs
+        if len(inputs) >= self.settings.NET_MAX_PENDING_INPUTS:
+            inputs.popleft()  # Client is flooding, keep the newest inputs
+        inputs.append(protocol.INPUT.unpack(payload))
+
+    def _drop(self, player_id):
+        """Remove a player and tell everyone else"""
+        session = self.players.pop(player_id, None)
+        if session is None:
+            return
+        session.writer.close()
+        self._last_broadcast.pop(player_id, None)
+        message = protocol.frame(protocol.MSG_LEAVE, protocol.LEAVE.pack(player_id))
+        for other in self.players.values():
+            other.writer.write(message)
+
+    def _respawn(self, session, flags):
+        """Return a player to the spawn point"""
+        session.boat = BoatState(*session.spawn)
+        session.docked = True
+        session.pending_inputs.clear()  # Inputs sent before the crash are void
+        session.flags |= flags | protocol.FLAG_RESPAWNED
+        session.needs_own_state = True
+
+    def simulate(self):
+        """Advance every player's boat by one tick"""
+        settings = self.settings
+        boundary = settings.WORLD_BOUNDARY
+        features = self.world.all_features
+        max_steps = settings.NET_MAX_INPUTS_PER_TICK
+        fixed_point = settings.FIXED_POINT_PHYSICS
+        for session in self.players.values():
+            inputs = session.pending_inputs
+            steps = 0
+            while inputs and steps < max_steps:
+                seq, left, right, forward, backward, heading = inputs.popleft()
+                if seq <= session.last_input_seq:
+                    continue  # Stale input
+                session.last_input_seq = seq
+                steps += 1
+                
+                # Clients only send input once they have undocked
+                session.docked = False
+                boat = session.boat
+                boat.left_force = left
+                boat.right_force = right
+                boat.forward_force = forward
+                boat.backward_force = backward
+                boat.heading = protocol.dequantize_heading(heading)
+                step_boat(boat, self.current_vector, settings.BOAT_SPEED, fixed_point)
+
+                if abs(boat.x) > boundary or abs(boat.y) > boundary:
+                    self._respawn(session, 0)
+                    continue
+
+                result = check_collision(boat.x, boat.y, boat.velocity, BOAT_RADIUS, features)
+                if result == "dock_success":
+                    self._respawn(session, protocol.FLAG_DOCKED)
+                elif result != "no_collision":
+                    self._respawn(session, 0)
+
+    def tick(self):
+        """Simulate one tick and broadcast the changes"""
+        started = time.perf_counter()
+        self.tick_count += 1
+        self.simulate()
+
+        # Quantize once and find who changed since the last broadcast
+        full_entries = []
+        changed_entries = []
+        last_broadcast = self._last_broadcast
+        for player_id, session in self.players.items():
+            boat = session.boat
+            quantized = (protocol.quantize_position(boat.x),
+                         protocol.quantize_position(boat.y),
+                         protocol.quantize_heading(boat.heading))
+            entry = (player_id, session.flags, *quantized)
+            full_entries.append(entry)
+            if session.flags or last_broadcast.get(player_id) != quantized:
+                changed_entries.append(entry)
+                last_broadcast[player_id] = quantized
+            session.flags = 0
+
+        # Periodic keyframes resynchronize everyone
+        keyframe = self.tick_count % self.settings.NET_KEYFRAME_INTERVAL == 0
+        delta_body = protocol.encode_entries(full_entries if keyframe else changed_entries)
+        delta_count = len(full_entries if keyframe else changed_entries)
+        full_body = None
+
+        slow_clients = []
+        fixed_point = self.settings.FIXED_POINT_PHYSICS
+        for session in self.players.values():
+            if session.writer.is_closing():
+                slow_clients.append(session.player_id)
+                continue
+            if session.needs_full_state:
+                if full_body is None:
+                    full_body = protocol.encode_entries(full_entries)
+                body, count = full_body, len(full_entries)
+                session.needs_full_state = False
+            elif delta_count:
+                body, count = delta_body, delta_count
+            else:
+                body, count = b"", 0
+
+            header = protocol.STATE_HEADER.pack(self.tick_count, session.last_input_seq, count)
+            boat = session.boat
+            if fixed_point and not session.needs_own_state:
+                # Clients predict bit-identically; a checksum is enough to catch a desync
+                own_state = protocol.frame(protocol.MSG_OWN_CHECKSUM, protocol.OWN_CHECKSUM.pack(
+                    session.last_input_seq, state_checksum(boat)))
+            else:
+                own_state = protocol.frame(protocol.MSG_OWN_STATE, protocol.OWN_STATE.pack(
+                    session.last_input_seq, boat.x, boat.y, *boat.velocity, *boat.momentum))
+                session.needs_own_state = False
+            message = protocol.frame(protocol.MSG_STATE, header + body) + own_state
+            session.writer.write(message)
+            self.bytes_sent += len(message)
+
+            # Drop clients that stopped reading instead of buffering forever
+            transport = session.writer.transport
+            if transport is not None and transport.get_write_buffer_size() > self.settings.NET_MAX_BUFFER:
+                print(f"Debug: Dropping slow client {session.player_id}")
+                slow_clients.append(session.player_id)
+
+        for player_id in slow_clients:
+            self._drop(player_id)
+
+        self.tick_time = time.perf_counter() - started
+
+
+def main():
+    """Run the server from the command line"""
+    parser = argparse.ArgumentParser(description="Island Navigator game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--seconds", type=float, default=None, help="Stop after this many seconds")
+    args = parser.parse_args()
+    if args.seed is not None and not 0 <= args.seed < 2 ** 32:
+        parser.error("--seed must be in [0, 2**32) to fit the HELLO message")
+
+    server = GameServer(Settings(), seed=args.seed, host=args.host, port=args.port)
+    try:
+        asyncio.run(server.serve_forever(args.seconds))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()